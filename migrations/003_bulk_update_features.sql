@@ -0,0 +1,35 @@
+-- Migration 003: Bulk feature updates in one round-trip
+-- Run in Supabase Dashboard > SQL Editor > New Query
+--
+-- PostgREST upsert can't patch features in bulk: features.id is
+-- GENERATED ALWAYS (explicit ids are rejected on INSERT ... ON CONFLICT)
+-- and issue_id is NOT NULL. This RPC takes a JSON array of partial rows
+-- ({"id": 123, "aesthetic_profile": ...}) and applies them in one UPDATE.
+-- Keys omitted from a row keep their current value.
+--
+-- Usage: sb.rpc("bulk_update_features", {"updates": rows}).execute()
+
+-- ============================================================
+-- 1. bulk_update_features(updates jsonb) -> number of rows updated
+-- ============================================================
+
+CREATE OR REPLACE FUNCTION bulk_update_features(updates jsonb)
+RETURNS integer
+LANGUAGE sql
+AS $$
+  WITH patched AS (
+    SELECT (jsonb_populate_record(f, to_jsonb(f) || (u - 'id'))).*
+    FROM jsonb_array_elements(updates) AS u
+    JOIN features f ON f.id = (u->>'id')::bigint
+  ), upd AS (
+    UPDATE features f
+       SET aesthetic_profile = p.aesthetic_profile,
+           detective_verdict = p.detective_verdict,
+           detective_checked_at = p.detective_checked_at,
+           subject_category = p.subject_category
+      FROM patched p
+     WHERE f.id = p.id
+    RETURNING 1
+  )
+  SELECT count(*)::integer FROM upd;
+$$;
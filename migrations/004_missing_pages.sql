@@ -0,0 +1,25 @@
+-- Migration 004: Server-side missing-page lookup for feature image backfills
+-- Run in Supabase Dashboard > SQL Editor > New Query
+--
+-- Returns the subset of candidate page numbers that have no feature_images
+-- row for the feature, so backfill scripts download only what's missing
+-- (authoritative even if another process inserted pages meanwhile).
+--
+-- Usage: sb.rpc("missing_pages", {"fid": 123, "cand": [10, 11, 12]}).execute()
+
+-- ============================================================
+-- 1. missing_pages(fid bigint, cand int[]) -> int[]
+-- ============================================================
+
+CREATE OR REPLACE FUNCTION missing_pages(fid bigint, cand int[])
+RETURNS int[]
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT COALESCE(array_agg(p ORDER BY p), '{}')
+  FROM unnest(cand) AS p
+  WHERE NOT EXISTS (
+    SELECT 1 FROM feature_images fi
+    WHERE fi.feature_id = fid AND fi.page_number = p
+  );
+$$;
@@ -0,0 +1,26 @@
+-- Migration 005: First-page image lookup for many features at once
+-- Run in Supabase Dashboard > SQL Editor > New Query
+--
+-- Returns the lowest-numbered page of each requested feature in a single
+-- query (DISTINCT ON over the (feature_id, page_number) index), instead of
+-- one .eq().order().limit(1) round-trip per feature.
+--
+-- Usage: sb.rpc("first_page_images", {"feature_ids": [1, 2, 3]}).execute()
+
+CREATE INDEX IF NOT EXISTS idx_feature_images_feature_page
+  ON feature_images(feature_id, page_number);
+
+-- ============================================================
+-- 1. first_page_images(feature_ids bigint[]) -> (feature_id, storage_path)
+-- ============================================================
+
+CREATE OR REPLACE FUNCTION first_page_images(feature_ids bigint[])
+RETURNS TABLE (feature_id bigint, storage_path text)
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT DISTINCT ON (fi.feature_id) fi.feature_id, fi.storage_path
+  FROM feature_images fi
+  WHERE fi.feature_id = ANY(feature_ids)
+  ORDER BY fi.feature_id, fi.page_number;
+$$;
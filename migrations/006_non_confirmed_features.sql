@@ -0,0 +1,44 @@
+-- Migration 006: Server-side baseline sampling for wealth-origin classification
+-- Run in Supabase Dashboard > SQL Editor > New Query
+--
+-- non_confirmed_features is every named feature without a CONFIRMED dossier,
+-- so classify_wealth_origin.py no longer downloads the confirmed feature ids
+-- (an unpaged select that PostgREST silently capped at max-rows) just to
+-- filter them back out client-side. sample_non_confirmed_features draws its
+-- baseline sample from the view in a pseudo-random order that is stable for
+-- a given seed.
+--
+-- Usage: sb.table("non_confirmed_features").select("*").gt("id", last).order("id").limit(1000)
+--        sb.rpc("sample_non_confirmed_features", {"n": 1000, "seed": "42"}).execute()
+
+-- ============================================================
+-- 1. non_confirmed_features view
+-- ============================================================
+
+CREATE OR REPLACE VIEW non_confirmed_features AS
+SELECT f.*
+FROM features f
+WHERE f.homeowner_name IS NOT NULL
+  AND NOT EXISTS (
+    SELECT 1 FROM dossiers d
+    WHERE d.feature_id = f.id AND d.editor_verdict = 'CONFIRMED'
+  );
+
+-- ============================================================
+-- 2. sample_non_confirmed_features(n, seed) -> SETOF non_confirmed_features
+-- ============================================================
+
+CREATE OR REPLACE FUNCTION sample_non_confirmed_features(
+  n int,
+  seed text DEFAULT '42'
+)
+RETURNS SETOF non_confirmed_features
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT v.*
+  FROM non_confirmed_features v
+  WHERE lower(btrim(v.homeowner_name)) NOT IN ('anonymous', 'unknown', '')
+  ORDER BY md5(v.id::text || seed)
+  LIMIT n;
+$$;
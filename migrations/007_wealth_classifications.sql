@@ -0,0 +1,31 @@
+-- Migration 007: Wealth-origin classification results
+-- Run in Supabase Dashboard > SQL Editor > New Query
+--
+-- One row per classified feature, written by classify_wealth_origin.py as
+-- each answer arrives (the local jsonl is kept as well). Confirmed and
+-- baseline samples never share a feature, so feature_id is the key and a
+-- re-run simply overwrites the earlier answer.
+--
+-- Usage: sb.table("wealth_classifications").upsert(rows, on_conflict="feature_id").execute()
+
+-- ============================================================
+-- 1. wealth_classifications table
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS wealth_classifications (
+  feature_id BIGINT PRIMARY KEY REFERENCES features(id) ON DELETE CASCADE,
+  dossier_id BIGINT REFERENCES dossiers(id) ON DELETE SET NULL,
+  sample_group TEXT NOT NULL CHECK (sample_group IN ('epstein', 'baseline')),
+  name TEXT NOT NULL,
+  classification TEXT NOT NULL,
+  confidence TEXT,
+  rationale TEXT,
+  wealth_source TEXT,
+  notable_facts TEXT,
+  model TEXT,
+  cost NUMERIC,
+  created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_wealth_classifications_group
+  ON wealth_classifications(sample_group, classification);
@@ -0,0 +1,21 @@
+-- Migration 008: Features still awaiting a cross-reference
+-- Run in Supabase Dashboard > SQL Editor > New Query
+--
+-- Anti-joins features against cross_references server-side, so
+-- cross_reference.py downloads only the named features it still has to
+-- check (id + name) instead of every feature row and column.
+--
+-- Usage: sb.table("features_unchecked").select("id, homeowner_name").gt("id", last).order("id").limit(1000)
+
+-- ============================================================
+-- 1. features_unchecked view
+-- ============================================================
+
+CREATE OR REPLACE VIEW features_unchecked AS
+SELECT f.id, f.homeowner_name, f.issue_id
+FROM features f
+WHERE f.homeowner_name IS NOT NULL
+  AND btrim(f.homeowner_name) <> ''
+  AND NOT EXISTS (
+    SELECT 1 FROM cross_references x WHERE x.feature_id = f.id
+  );
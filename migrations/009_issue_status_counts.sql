@@ -0,0 +1,22 @@
+-- Migration 009: Issue counts per status, aggregated server-side
+-- Run in Supabase Dashboard > SQL Editor > New Query
+--
+-- count_issues_by_status() used to download id/status/year/month for every
+-- issue and count them in Python. This RPC returns one row per status
+-- (about 8) instead. A NULL status counts as 'discovered', the column default.
+--
+-- Usage: sb.rpc("issue_status_counts", {}).execute()
+
+-- ============================================================
+-- 1. issue_status_counts() -> (status, n) per status
+-- ============================================================
+
+CREATE OR REPLACE FUNCTION issue_status_counts()
+RETURNS TABLE (status text, n bigint)
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT COALESCE(i.status, 'discovered'), count(*)
+  FROM issues i
+  GROUP BY 1;
+$$;
@@ -219,14 +219,37 @@ Respond with ONLY a JSON object:
 }}"""
 
 
-def build_text_prompt(title, homeowner, designer, location, existing_style):
-    """Build prompt for text-only Haiku batch tagging (no images).
+def text_prompt_instructions():
+    """Static half of the text-only tagging prompt (taxonomy + output format).
 
-    Uses existing feature metadata to infer aesthetic classification.
+    Identical for every feature, so batch callers can mark it as a cacheable
+    prompt prefix and send only the per-feature metadata alongside it.
     """
     taxonomy = _taxonomy_block()
 
-    # Build context from available fields
+    return f"""Classify an Architectural Digest featured home across 6 aesthetic dimensions.
+
+TAXONOMY — use ONLY these values:
+{taxonomy}
+
+You will be given the feature's metadata. Use the design style, designer name,
+location, and era as signals. If the metadata is insufficient for a confident classification,
+use the most likely value based on the designer's known style or the location's typical architecture.
+
+Respond with ONLY a JSON object:
+{{
+  "envelope": "one value from dimension A",
+  "atmosphere": "one value from dimension B",
+  "materiality": "one value from dimension C",
+  "power_status": "one value from dimension D",
+  "cultural_orientation": "one value from dimension E",
+  "art_collection": ["values from dimension F"],
+  "named_artists": []
+}}"""
+
+
+def text_prompt_metadata(title, homeowner, designer, location, existing_style):
+    """Per-feature half of the text-only tagging prompt."""
     context_parts = []
     if title:
         context_parts.append(f"Article Title: {title}")
@@ -241,28 +264,19 @@ def build_text_prompt(title, homeowner, designer, location, existing_style):
 
     context = "\n".join(context_parts) if context_parts else "No metadata available"
 
-    return f"""Classify this Architectural Digest featured home across 6 aesthetic dimensions.
-
-FEATURE METADATA:
+    return f"""FEATURE METADATA:
 {context}
 
-TAXONOMY — use ONLY these values:
-{taxonomy}
+Classify this home."""
 
-Based on the metadata above, classify this home. Use the design style, designer name,
-location, and era as signals. If the metadata is insufficient for a confident classification,
-use the most likely value based on the designer's known style or the location's typical architecture.
 
-Respond with ONLY a JSON object:
-{{
-  "envelope": "one value from dimension A",
-  "atmosphere": "one value from dimension B",
-  "materiality": "one value from dimension C",
-  "power_status": "one value from dimension D",
-  "cultural_orientation": "one value from dimension E",
-  "art_collection": ["values from dimension F"],
-  "named_artists": []
-}}"""
+def build_text_prompt(title, homeowner, designer, location, existing_style):
+    """Build prompt for text-only Haiku batch tagging (no images).
+
+    Uses existing feature metadata to infer aesthetic classification.
+    """
+    return (text_prompt_instructions() + "\n\n"
+            + text_prompt_metadata(title, homeowner, designer, location, existing_style))
 
 
 # ═══════════════════════════════════════════════════════════
@@ -248,15 +248,12 @@ def read_xref():
                 return _build_xref_summary_from_rows(xrefs)
         except Exception:
             pass
-        results_path = os.path.join(XREF_DIR, "results.json")
-        if not os.path.exists(results_path):
-            return empty
         try:
-            with open(results_path) as f:
-                results = json.load(f)
-            return _build_xref_summary_from_rows(results)
+            from cross_reference import load_results
+            results = load_results()
         except Exception:
             return empty
+        return _build_xref_summary_from_rows(results) if results else empty
     return _cached("xref", 30, _compute)
 
 
@@ -433,7 +430,8 @@ def read_editor_briefing():
 
 
 EDITOR_MESSAGES_PATH = os.path.join(DATA_DIR, "editor_messages.json")
-HUMAN_MESSAGES_PATH = os.path.join(DATA_DIR, "human_messages.json")
+HUMAN_MESSAGES_PATH = os.path.join(DATA_DIR, "human_messages.jsonl")
+HUMAN_MESSAGES_CAP = 100
 
 
 def read_combined_inbox(max_messages=40):
@@ -458,10 +456,16 @@ def read_combined_inbox(max_messages=40):
 
     if os.path.exists(HUMAN_MESSAGES_PATH):
         try:
+            # JSON Lines, appended by the dashboard; only the newest CAP count
             with open(HUMAN_MESSAGES_PATH) as f:
-                human_msgs = json.load(f)
-            for m in human_msgs:
+                lines = f.readlines()[-HUMAN_MESSAGES_CAP:]
+            for line in lines:
+                try:
+                    m = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
                 m["sender"] = "human"
+                human_msgs.append(m)
         except Exception:
             pass
 
@@ -9,13 +9,14 @@ Provides:
 - Activity logging (pipe-delimited file)
 - Skills file loading (markdown instructions)
 - Dashboard status reporting
-- JSON file locking utilities (fcntl-based file locking)
+- JSON file locking utilities (fcntl-based file locking), incl. JSON Lines logs
 """
 
 import asyncio
 import fcntl
 import json
 import os
+import threading
 import traceback
 import time as _time
 from abc import ABC, abstractmethod
@@ -39,7 +40,39 @@ MODEL_PRICING = {
 
 # ── JSON File Locking Utilities ──────────────────────────────
 
-def update_json_locked(json_path, update_fn, default=None):
+# fdatasync skips flushing metadata the data doesn't need (mtime etc.); where
+# it's unavailable (macOS) fall back to a full fsync
+_datasync = getattr(os, "fdatasync", os.fsync)
+
+
+def atomic_write_bytes(path, data, durable=False):
+    """Replace a file's contents all at once: write a temp file, then rename.
+
+    os.replace is atomic on one filesystem, so readers see the old file or
+    the new one, never a torn write, even if the writer dies midway. The
+    whole payload goes down in a single write() where the OS allows it.
+    durable=True also syncs the temp file before the rename, so the new
+    contents survive a power loss; it costs a disk flush per write.
+    """
+    tmp_path = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            if durable:
+                _datasync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def update_json_locked(json_path, update_fn, default=None, durable=False):
     """Atomically read-modify-write a JSON file with file locking.
 
     Same pattern as update_manifest_locked but for arbitrary JSON files.
@@ -50,6 +83,7 @@ def update_json_locked(json_path, update_fn, default=None):
         json_path: Path to the JSON file.
         update_fn: Receives current data, modifies in place (or returns new data).
         default: Default value if file doesn't exist (default: empty list).
+        durable: Sync the write to disk (see atomic_write_bytes).
     """
     if default is None:
         default = []
@@ -80,8 +114,7 @@ def update_json_locked(json_path, update_fn, default=None):
             data = result
 
         # Write back
-        with open(json_path, "w") as f:
-            json.dump(data, f, indent=2)
+        atomic_write_bytes(json_path, json.dumps(data, indent=2).encode(), durable)
     finally:
         fcntl.flock(lock_fd, fcntl.LOCK_UN)
         lock_fd.close()
@@ -116,6 +149,92 @@ def read_json_locked(json_path, default=None):
         lock_fd.close()
 
 
+def read_jsonl(jsonl_path, tail=None):
+    """Records of a JSON Lines file (last `tail` only, if given).
+
+    A line that doesn't parse (e.g. one still being appended) is skipped.
+    """
+    records = []
+    try:
+        with open(jsonl_path) as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        return records
+    return records[-tail:] if tail else records
+
+
+def append_jsonl_locked(jsonl_path, records):
+    """Append records to a JSON Lines file under its exclusive file lock.
+
+    Appending never reads or rewrites what is already in the file.
+    """
+    lock_path = jsonl_path + ".lock"
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    payload = "".join(json.dumps(r) + "\n" for r in records).encode()
+
+    lock_fd = open(lock_path, "w")
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX)
+        # one unbuffered O_APPEND write for the whole batch
+        fd = os.open(jsonl_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+    finally:
+        fcntl.flock(lock_fd, fcntl.LOCK_UN)
+        lock_fd.close()
+
+
+def update_jsonl_locked(jsonl_path, update_fn, durable=False):
+    """Rewrite a JSON Lines file with update_fn(records) under its file lock.
+
+    Takes the same lock as append_jsonl_locked, so no append is lost, and
+    swaps the new file in with atomic_write_bytes so readers never see half of it.
+    update_fn can modify the list in place or return a new one; durable is
+    passed through to atomic_write_bytes.
+    """
+    lock_path = jsonl_path + ".lock"
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+
+    lock_fd = open(lock_path, "w")
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX)
+        records = read_jsonl(jsonl_path)
+        result = update_fn(records)
+        if result is not None:
+            records = result
+        atomic_write_bytes(jsonl_path, "".join(json.dumps(r) + "\n" for r in records).encode(), durable)
+    finally:
+        fcntl.flock(lock_fd, fcntl.LOCK_UN)
+        lock_fd.close()
+
+
+def migrate_json_to_jsonl(json_path, jsonl_path, keep=None):
+    """One-time move of a legacy JSON array file to JSON Lines.
+
+    Does nothing once jsonl_path exists. The last `keep` records are carried
+    over (all if None) and the legacy file is removed.
+    """
+    if os.path.exists(jsonl_path) or not os.path.exists(json_path):
+        return
+    try:
+        with open(json_path) as f:
+            records = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return
+    if not isinstance(records, list):
+        return
+    update_jsonl_locked(jsonl_path, lambda _: records[-keep:] if keep else records)
+    os.remove(json_path)
+
+
 class Agent(ABC):
     """Base class for all pipeline agents.
 
@@ -230,11 +230,13 @@ class DesignerAgent(Agent):
                 summary["sample_values"][field] = values
 
         # Verdict distribution from cross-references
-        xref_results_path = os.path.join(DATA_DIR, "cross_references", "results.json")
-        if os.path.exists(xref_results_path):
+        try:
+            from cross_reference import load_results
+            results = load_results()
+        except Exception:
+            results = []
+        if results:
             try:
-                with open(xref_results_path) as f:
-                    results = json.load(f)
                 verdicts = {}
                 for r in results:
                     v = r.get("combined_verdict", "no_match")
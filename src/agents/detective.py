@@ -28,8 +28,6 @@ from agents.base import Agent, DATA_DIR, update_json_locked, read_json_locked
 from agents.tasks import TaskResult
 
 XREF_DIR = os.path.join(DATA_DIR, "cross_references")
-RESULTS_PATH = os.path.join(XREF_DIR, "results.json")
-CHECKED_PATH = os.path.join(XREF_DIR, "checked_features.json")
 DETECTIVE_LOG_PATH = os.path.join(DATA_DIR, "detective_log.json")
 DETECTIVE_ESCALATION_PATH = os.path.join(DATA_DIR, "detective_escalations.json")
 DETECTIVE_VERDICTS_PATH = os.path.join(DATA_DIR, "detective_verdicts.json")
@@ -632,30 +630,12 @@ Respond with JSON only. Format:
     # ── Results I/O ──────────────────────────────────────────────
 
     def _load_results(self):
-        """Load cross-reference results (with shared lock)."""
-        os.makedirs(XREF_DIR, exist_ok=True)
-        return read_json_locked(RESULTS_PATH, default=[])
-
-    def _save_results(self, results):
-        """Save cross-reference results (with exclusive lock)."""
-        os.makedirs(XREF_DIR, exist_ok=True)
-        update_json_locked(RESULTS_PATH, lambda _: results, default=[])
-
-    def _load_checked_ids(self):
-        """Load set of already-checked feature IDs."""
-        if os.path.exists(CHECKED_PATH):
-            try:
-                with open(CHECKED_PATH) as f:
-                    return set(json.load(f))
-            except Exception:
-                pass
-        return set()
-
-    def _save_checked_ids(self, checked_ids):
-        """Save checked feature IDs."""
-        os.makedirs(XREF_DIR, exist_ok=True)
-        with open(CHECKED_PATH, "w") as f:
-            json.dump(sorted(checked_ids), f)
+        """Load local cross-reference results (legacy results.json + results.jsonl)."""
+        try:
+            from cross_reference import load_results
+            return load_results()
+        except Exception:
+            return []
 
     # ── Main Work Loop ───────────────────────────────────────────
 
@@ -672,7 +652,7 @@ Respond with JSON only. Format:
         """Pass 1: Check unchecked features against Black Book (fast, local)."""
         from cross_reference import get_unchecked_features, search_black_book, load_black_book, SKIP_NAMES
 
-        unchecked, checked_ids = await asyncio.to_thread(get_unchecked_features)
+        unchecked, _ = await asyncio.to_thread(get_unchecked_features)
 
         if not unchecked:
             return False
@@ -682,6 +662,7 @@ Respond with JSON only. Format:
 
         book_text = await asyncio.to_thread(load_black_book)
         new_results = 0
+        checked_ids = set()
 
         for feature in unchecked:
             name = feature.get("homeowner_name")
@@ -886,15 +867,15 @@ Respond with JSON only. Format:
         except Exception:
             pass
 
-        # Fallback: local results.json
+        # Fallback: local results
         results = self._load_results()
         total = len(results)
         doj_done = sum(1 for r in results if r.get("doj_status") == "searched")
 
         try:
             from cross_reference import get_unchecked_features
-            unchecked, checked_ids = get_unchecked_features()
-            total = len(unchecked) + len(checked_ids)
+            unchecked, checked = get_unchecked_features()
+            total = len(unchecked) + checked
         except Exception:
             pass
 
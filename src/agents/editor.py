@@ -49,7 +49,10 @@ from typing import Any
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from agents.base import Agent, DATA_DIR, LOG_PATH, update_json_locked, read_json_locked
+from agents.base import (
+    Agent, DATA_DIR, LOG_PATH, update_json_locked, read_json_locked,
+    read_jsonl, update_jsonl_locked, migrate_json_to_jsonl,
+)
 from agents.tasks import Task, TaskResult, EditorLedger, ExecutionPlan
 from db import (
     get_supabase, update_issue, delete_features_for_issue, list_issues,
@@ -79,7 +82,9 @@ class EditorEvent:
 BRIEFING_PATH = os.path.join(DATA_DIR, "editor_briefing.md")
 INBOX_PATH = os.path.join(DATA_DIR, "editor_inbox.md")
 MESSAGES_PATH = os.path.join(DATA_DIR, "editor_messages.json")
-HUMAN_MESSAGES_PATH = os.path.join(DATA_DIR, "human_messages.json")
+HUMAN_MESSAGES_PATH = os.path.join(DATA_DIR, "human_messages.jsonl")
+LEGACY_HUMAN_MESSAGES_PATH = os.path.join(DATA_DIR, "human_messages.json")
+HUMAN_MESSAGES_CAP = 100  # only the newest messages count; older lines await compaction
 COST_PATH = os.path.join(DATA_DIR, "editor_cost.json")
 MEMORY_PATH = os.path.join(DATA_DIR, "editor_memory.json")
 EXTRACTIONS_DIR = os.path.join(DATA_DIR, "extractions")
@@ -332,11 +337,8 @@ class EditorAgent(Agent):
     # ── Human Messages ──────────────────────────────────────────
 
     def _read_human_messages(self):
-        if not os.path.exists(HUMAN_MESSAGES_PATH):
-            return []
         try:
-            with open(HUMAN_MESSAGES_PATH) as f:
-                messages = json.load(f)
+            messages = read_jsonl(HUMAN_MESSAGES_PATH, tail=HUMAN_MESSAGES_CAP)
             return [m for m in messages if not m.get("read")]
         except Exception:
             return []
@@ -344,13 +346,15 @@ class EditorAgent(Agent):
     def _mark_messages_read(self):
         if not os.path.exists(HUMAN_MESSAGES_PATH):
             return
-        try:
-            with open(HUMAN_MESSAGES_PATH) as f:
-                messages = json.load(f)
+
+        def mark_read(messages):
             for m in messages:
                 m["read"] = True
-            with open(HUMAN_MESSAGES_PATH, "w") as f:
-                json.dump(messages, f)
+
+        try:
+            # Same lock as the dashboard's appends, so a message posted
+            # mid-rewrite isn't lost
+            update_jsonl_locked(HUMAN_MESSAGES_PATH, mark_read)
         except Exception:
             pass
 
@@ -368,6 +372,9 @@ class EditorAgent(Agent):
         self._stop_requested = False
         self.log("Editor agent started (event-driven)")
 
+        # Carry over messages from the pre-JSONL human_messages.json
+        migrate_json_to_jsonl(LEGACY_HUMAN_MESSAGES_PATH, HUMAN_MESSAGES_PATH, keep=HUMAN_MESSAGES_CAP)
+
         # Initialize human_messages mtime
         if os.path.exists(HUMAN_MESSAGES_PATH):
             try:
@@ -470,7 +477,7 @@ class EditorAgent(Agent):
             await asyncio.sleep(0.5)
 
     async def _human_message_watcher(self):
-        """Watch human_messages.json mtime every 1s. Fires event on change.
+        """Watch human_messages.jsonl mtime every 1s. Fires event on change.
 
         Uses a single os.path.getmtime() stat() syscall per check — lightweight.
         Only fires an event when new messages arrive (mtime changes).
@@ -2072,16 +2079,13 @@ Respond with JSON only:
                 if rname:
                     xref_by_name[rname] = r
         except Exception:
-            # Fallback to local file
-            results_path = os.path.join(XREF_DIR, "results.json")
+            # Fallback to local results (legacy results.json + results.jsonl)
             try:
-                if os.path.exists(results_path):
-                    with open(results_path) as f:
-                        xref_results = json.load(f)
-                    for r in xref_results:
-                        rname = (r.get("homeowner_name") or "").strip().lower()
-                        if rname:
-                            xref_by_name[rname] = r
+                from cross_reference import load_results
+                for r in load_results():
+                    rname = (r.get("homeowner_name") or "").strip().lower()
+                    if rname:
+                        xref_by_name[rname] = r
             except Exception:
                 pass
 
@@ -2441,21 +2445,17 @@ Respond with JSON only:
         except Exception:
             pass
 
-        # Fallback to local files
-        checked_path = os.path.join(XREF_DIR, "checked_features.json")
-        results_path = os.path.join(XREF_DIR, "results.json")
-
+        # Fallback to local stores (xref.db checked ids, results.jsonl)
         try:
-            if os.path.exists(checked_path):
-                with open(checked_path) as f:
-                    summary["total_checked"] = len(json.load(f))
+            from cross_reference import count_checked_ids
+            summary["total_checked"] = count_checked_ids()
         except Exception:
             pass
 
         try:
-            if os.path.exists(results_path):
-                with open(results_path) as f:
-                    results = json.load(f)
+            from cross_reference import load_results
+            results = load_results()
+            if results:
                 matches = [r for r in results if r.get("black_book_status") == "match"]
                 summary["total_matches"] = len(matches)
                 for m in matches[-5:]:
@@ -2795,28 +2795,13 @@ Analyze and provide your assessment."""
         except Exception as e:
             self.log(f"Failed to delete xrefs from Supabase: {e}", level="ERROR")
 
-        # Also clean up local files (backward compat)
-        results_path = os.path.join(XREF_DIR, "results.json")
-        if os.path.exists(results_path):
-            try:
-                with open(results_path) as f:
-                    results = json.load(f)
-                results = [r for r in results if r.get("feature_id") not in feature_ids]
-                with open(results_path, "w") as f:
-                    json.dump(results, f, indent=2)
-            except Exception:
-                pass
-
-        checked_path = os.path.join(XREF_DIR, "checked_features.json")
-        if os.path.exists(checked_path):
-            try:
-                with open(checked_path) as f:
-                    checked = set(json.load(f))
-                checked -= feature_ids
-                with open(checked_path, "w") as f:
-                    json.dump(sorted(checked), f)
-            except Exception:
-                pass
+        # Also clean up the local stores so these features get re-checked
+        try:
+            from cross_reference import remove_checked_ids, update_results
+            update_results(lambda results: [r for r in results if r.get("feature_id") not in feature_ids])
+            remove_checked_ids(feature_ids)
+        except Exception as e:
+            self.log(f"Failed to clean local xref stores: {e}", level="ERROR")
 
     def _override_detective_verdict(self, action):
         name = action.get("name")
@@ -2873,9 +2858,10 @@ Analyze and provide your assessment."""
         except Exception as e:
             self.log(f"retry_doj_search Supabase reset failed: {e}", level="ERROR")
 
-        # Also reset in local file (backward compat)
-        results_path = os.path.join(XREF_DIR, "results.json")
+        # Also reset in the local results (backward compat)
         try:
+            from cross_reference import update_results
+
             def reset_doj(results):
                 for r in results:
                     if r.get("homeowner_name", "").lower() == name_lower:
@@ -2884,7 +2870,7 @@ Analyze and provide your assessment."""
                         r["combined_verdict"] = None
                         r["last_updated"] = datetime.now().isoformat()
                         break
-            update_json_locked(results_path, reset_doj, default=[])
+            update_results(reset_doj)
         except Exception as e:
             self.log(f"retry_doj_search local reset failed: {e}", level="ERROR")
         self.log(f"Queued DOJ retry: {name}")
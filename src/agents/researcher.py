@@ -38,7 +38,6 @@ from agents.tasks import TaskResult
 
 XREF_DIR = os.path.join(DATA_DIR, "cross_references")
 DOSSIERS_DIR = os.path.join(DATA_DIR, "dossiers")
-RESULTS_PATH = os.path.join(XREF_DIR, "results.json")
 ESCALATION_PATH = os.path.join(DATA_DIR, "researcher_escalations.json")
 LOG_PATH = os.path.join(DATA_DIR, "researcher_log.json")
 EXTRACTIONS_DIR = os.path.join(DATA_DIR, "extractions")
@@ -372,20 +371,18 @@ class ResearcherAgent(Agent):
     # ── Lead Discovery ──────────────────────────────────────────
 
     def _load_results(self):
-        """Load cross-reference results from disk."""
-        if not os.path.exists(RESULTS_PATH):
-            return []
+        """Load local cross-reference results (legacy results.json + results.jsonl)."""
         try:
-            with open(RESULTS_PATH) as f:
-                return json.load(f)
+            from cross_reference import load_results
+            return load_results()
         except Exception:
             return []
 
     def _find_uninvestigated_leads(self):
-        """Find leads to investigate. Primary: Supabase YES verdicts. Fallback: results.json.
+        """Find leads to investigate. Primary: Supabase YES verdicts. Fallback: local results.
 
         Checks Supabase features with detective_verdict='YES' that don't have a dossier yet.
-        Falls back to legacy results.json for pre-refactor data.
+        Falls back to the local cross-reference results for pre-refactor data.
         """
         investigated_ids = self._load_investigated_ids()
         run_log = self._load_run_log()
@@ -450,7 +447,7 @@ class ResearcherAgent(Agent):
             self.log(f"Lead search failed: {e}", level="ERROR")
             # Fall through to legacy path
 
-        # Fallback: legacy results.json for pre-refactor data
+        # Fallback: local cross-reference results for pre-refactor data
         if not leads:
             results = self._load_results()
             for r in results:
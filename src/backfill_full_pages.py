@@ -14,7 +14,6 @@ Usage:
 """
 
 import base64
-import json
 import os
 import re
 import sys
@@ -24,23 +23,55 @@ import requests
 from dotenv import load_dotenv
 from supabase import create_client
 
+sys.path.insert(0, os.path.dirname(__file__))
+from rate_limit import AdaptiveLimiter, parse_retry_after
+from db import pooled_client_options
+from fast_json import loads
+
 load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
 
 HEADERS = {"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"}
 AD_ARCHIVE_BLOB = "https://architecturaldigest.blob.core.windows.net/architecturaldigest{date}thumbnails/Pages/0x600/{page}.jpg"
 BUCKET = "feature-images"
+_TOC_RE = re.compile(r"tocConfig\s*=\s*'([^']+)'")
+
+# Be nice to AD archive: adaptive rate instead of a fixed sleep per issue
+AD_ARCHIVE_RPS = 4.0
+archive_limiter = AdaptiveLimiter(AD_ARCHIVE_RPS)
+
+
+def archive_get(url, timeout):
+    """GET from the AD archive through the shared adaptive limiter."""
+    archive_limiter.acquire()
+    resp = requests.get(url, headers=HEADERS, timeout=timeout)
+    if resp.status_code in (429, 503):
+        archive_limiter.on_throttle(parse_retry_after(resp.headers))
+    else:
+        archive_limiter.on_success()
+    return resp
+
+
+_sb = None
 
 
 def get_sb():
-    url = os.environ["SUPABASE_URL"]
-    key = os.environ.get("SUPABASE_SERVICE_KEY") or os.environ["SUPABASE_ANON_KEY"]
-    return create_client(url, key)
+    """Singleton service-key client on the shared keep-alive pool."""
+    global _sb
+    if _sb is None:
+        url = os.environ["SUPABASE_URL"]
+        key = os.environ.get("SUPABASE_SERVICE_KEY") or os.environ["SUPABASE_ANON_KEY"]
+        _sb = create_client(url, key, options=pooled_client_options())
+    return _sb
 
 
 def decode_jwt_featured(source_url):
     """Decode JWT tocConfig from AD archive."""
-    resp = requests.get(source_url, headers=HEADERS, timeout=30)
-    match = re.search(r"tocConfig\s*=\s*'([^']+)'", resp.text)
+    resp = archive_get(source_url, timeout=30)
+    text = resp.text
+    start = text.find("tocConfig")
+    if start < 0:
+        return None
+    match = _TOC_RE.search(text, start)
     if not match:
         return None
     jwt_token = match.group(1)
@@ -48,11 +79,12 @@ def decode_jwt_featured(source_url):
     if len(parts) < 2:
         return None
     payload = parts[1]
-    payload += "=" * (4 - len(payload) % 4)
-    decoded = base64.urlsafe_b64decode(payload).decode("utf-8")
-    data = json.loads(decoded)
+    payload += "=" * (-len(payload) % 4)
+    raw = base64.urlsafe_b64decode(payload)
+    data = loads(raw)
+    # Some issues wrap the payload as a JSON-encoded string
     if isinstance(data, str):
-        data = json.loads(data)
+        data = loads(data)
     return data.get("featured", [])
 
 
@@ -88,31 +120,32 @@ def find_full_page_range(featured, article_title, page_number):
     return None
 
 
-def download_missing_pages(sb, feature_id, all_pages, existing_pages, year, month):
-    """Download pages we don't already have."""
+def download_missing_pages(sb, feature_id, all_pages, year, month):
+    """Download pages we don't already have.
+
+    The missing set comes from the missing_pages RPC (migrations/004), so
+    pages inserted by another run since the initial scan are skipped.
+    """
     date_str = f"{year}{month:02d}01"
     uploaded = 0
-    existing_set = set(existing_pages)
 
-    for page_num in all_pages:
-        if page_num in existing_set:
-            continue
+    missing = sb.rpc("missing_pages", {"fid": feature_id, "cand": all_pages}).execute().data or []
 
+    for page_num in missing:
         url = AD_ARCHIVE_BLOB.format(date=date_str, page=page_num)
         try:
-            resp = requests.get(url, headers=HEADERS, timeout=15)
+            resp = archive_get(url, timeout=15)
             if resp.status_code != 200 or len(resp.content) < 1000:
                 continue
 
             storage_path = f"{feature_id}/page_{page_num:03d}.jpg"
             try:
                 sb.storage.from_(BUCKET).upload(
-                    storage_path, resp.content, {"content-type": "image/jpeg"})
+                    storage_path, resp.content,
+                    {"content-type": "image/jpeg", "upsert": "true"})
             except Exception as e:
-                if "Duplicate" in str(e) or "already exists" in str(e):
-                    pass
-                else:
-                    continue
+                print(f"      Storage error page {page_num}: {e}")
+                continue
 
             base_url = os.environ["SUPABASE_URL"]
             public_url = f"{base_url}/storage/v1/object/public/{BUCKET}/{storage_path}"
@@ -126,10 +159,7 @@ def download_missing_pages(sb, feature_id, all_pages, existing_pages, year, mont
                 }).execute()
                 uploaded += 1
             except Exception as e:
-                if "duplicate" in str(e).lower() or "unique" in str(e).lower():
-                    pass
-                else:
-                    print(f"      DB error page {page_num}: {e}")
+                print(f"      DB error page {page_num}: {e}")
 
         except requests.RequestException:
             pass
@@ -247,17 +277,13 @@ def main():
                 total_pages_added += len(missing)
             else:
                 added = download_missing_pages(
-                    sb, f["id"], full_pages, list(existing),
-                    iss["year"], iss["month"])
+                    sb, f["id"], full_pages, iss["year"], iss["month"])
                 if added > 0:
                     total_expanded += 1
                     total_pages_added += added
                     if total_expanded % 50 == 0:
                         print(f"  Progress: {total_expanded} features expanded, {total_pages_added} pages added ({issue_count}/{len(by_issue)} issues)")
 
-        # Be nice to AD archive
-        time.sleep(0.3)
-
         if issue_count % 50 == 0:
             print(f"[{issue_count}/{len(by_issue)} issues processed]")
             sys.stdout.flush()
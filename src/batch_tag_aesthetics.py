@@ -12,6 +12,7 @@ Usage:
     python3 src/batch_tag_aesthetics.py --dry-run      # Show what would be done
     python3 src/batch_tag_aesthetics.py --confirmed-only  # Only tag confirmed names
     python3 src/batch_tag_aesthetics.py --skip-done    # Skip features that already have profiles
+    python3 src/batch_tag_aesthetics.py --workers 4 --rps 4  # Lower concurrency / rate budget
 """
 
 import argparse
@@ -19,7 +20,9 @@ import json
 import os
 import re
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 sys.path.insert(0, os.path.dirname(__file__))
 
@@ -27,18 +30,43 @@ from dotenv import load_dotenv
 
 load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
 
-from aesthetic_taxonomy import build_text_prompt, parse_aesthetic_response
+from rate_limit import AdaptiveLimiter, parse_retry_after
+from aesthetic_taxonomy import (
+    parse_aesthetic_response, text_prompt_instructions, text_prompt_metadata,
+)
 
 MODEL = "claude-haiku-4-5-20251001"
 
+# Concurrency: overlap Haiku latency (~500ms) across in-flight requests,
+# while the adaptive limiter keeps us under the account's requests/sec budget.
+MAX_WORKERS = 8
+REQUESTS_PER_SECOND = 8.0
+MAX_RETRIES = 4
+
+# Profiles are buffered and written with one bulk_update_features RPC
+# (migrations/003) per FLUSH_SIZE rows instead of one UPDATE per feature.
+FLUSH_SIZE = 500
+
+# Haiku 4.5 pricing per million tokens. The taxonomy instructions are sent
+# as a cache_control prefix, so after the first request they bill as cache
+# reads. (Prompts below the model's minimum cacheable length are simply
+# not cached — check cache_read tokens in the summary.)
+PRICE_INPUT = 1.0
+PRICE_OUTPUT = 5.0
+PRICE_CACHE_WRITE = 1.25
+PRICE_CACHE_READ = 0.10
+
+INSTRUCTIONS = text_prompt_instructions()
+
+cache_stats = {"requests": 0, "hits": 0}
+_cache_lock = threading.Lock()
+
 
 def get_features(confirmed_only=False, skip_done=True):
     """Fetch features from Supabase that need aesthetic tagging."""
-    from supabase import create_client
+    from db import get_supabase
 
-    url = os.environ["SUPABASE_URL"]
-    key = os.environ["SUPABASE_ANON_KEY"]
-    sb = create_client(url, key)
+    sb = get_supabase()
 
     # Fetch all features (paginated)
     features = []
@@ -76,9 +104,12 @@ def build_location_string(feature):
     return ", ".join(parts) if parts else None
 
 
-def tag_feature(client, feature):
+def tag_feature(client, feature, limiter=None):
     """Tag a single feature with aesthetic taxonomy using text-only Haiku.
 
+    If an AdaptiveLimiter is given, each request waits for a token and 429s
+    are retried after the limiter backs off (honouring Retry-After).
+
     Returns (profile_dict, cost) or (None, 0).
     """
     title = feature.get("article_title")
@@ -87,26 +118,83 @@ def tag_feature(client, feature):
     location = build_location_string(feature)
     style = feature.get("design_style")
 
-    prompt = build_text_prompt(title, homeowner, designer, location, style)
-
+    metadata = text_prompt_metadata(title, homeowner, designer, location, style)
+
+    for attempt in range(MAX_RETRIES + 1):
+        if limiter:
+            limiter.acquire()
+        try:
+            message = client.messages.create(
+                model=MODEL,
+                max_tokens=512,
+                messages=[{"role": "user", "content": [
+                    {"type": "text", "text": INSTRUCTIONS, "cache_control": {"type": "ephemeral"}},
+                    {"type": "text", "text": metadata},
+                ]}],
+            )
+        except Exception as e:
+            status = getattr(e, "status_code", None)
+            if status in (429, 500, 502, 503, 529) and attempt < MAX_RETRIES:
+                if limiter:
+                    response = getattr(e, "response", None)
+                    limiter.on_throttle(parse_retry_after(getattr(response, "headers", None)))
+                else:
+                    time.sleep(2 ** attempt)
+                continue
+            print(f"    API error: {e}")
+            return None, 0
+
+        if limiter:
+            limiter.on_success()
+
+        try:
+            result_text = message.content[0].text
+
+            usage = message.usage
+            cache_write = getattr(usage, "cache_creation_input_tokens", 0) or 0
+            cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+            cost = (usage.input_tokens * PRICE_INPUT
+                    + usage.output_tokens * PRICE_OUTPUT
+                    + cache_write * PRICE_CACHE_WRITE
+                    + cache_read * PRICE_CACHE_READ) / 1_000_000
+
+            profile = parse_aesthetic_response(result_text, source="batch_tag")
+            with _cache_lock:
+                cache_stats["requests"] += 1
+                cache_stats["hits"] += 1 if cache_read else 0
+            return profile, cost
+
+        except Exception as e:
+            print(f"    Parse error: {e}")
+            return None, 0
+
+    return None, 0
+
+
+def flush_updates(sb, rows):
+    """Write buffered {"id", "aesthetic_profile"} rows in one round-trip.
+
+    Falls back to per-row updates if the bulk call fails, so one bad row
+    doesn't lose the whole chunk. Returns the number of rows that failed.
+    """
+    if not rows:
+        return 0
     try:
-        message = client.messages.create(
-            model=MODEL,
-            max_tokens=512,
-            messages=[{"role": "user", "content": [{"type": "text", "text": prompt}]}],
-        )
-        result_text = message.content[0].text
-
-        inp = message.usage.input_tokens
-        out = message.usage.output_tokens
-        cost = (inp / 1_000_000) * 1.0 + (out / 1_000_000) * 5.0
-
-        profile = parse_aesthetic_response(result_text, source="batch_tag")
-        return profile, cost
-
+        sb.rpc("bulk_update_features", {"updates": rows}).execute()
+        return 0
     except Exception as e:
-        print(f"    API error: {e}")
-        return None, 0
+        print(f"  Bulk write failed ({e}) — retrying {len(rows)} rows individually")
+
+    failed = 0
+    for row in rows:
+        try:
+            sb.table("features").update({
+                "aesthetic_profile": row["aesthetic_profile"],
+            }).eq("id", row["id"]).execute()
+        except Exception as e:
+            print(f"    DB error for feature {row['id']}: {e}")
+            failed += 1
+    return failed
 
 
 def main():
@@ -115,6 +203,8 @@ def main():
     parser.add_argument("--limit", type=int, default=0, help="Max features to process (0=all)")
     parser.add_argument("--skip-done", action="store_true", default=True, help="Skip already-tagged features")
     parser.add_argument("--confirmed-only", action="store_true", help="Only tag confirmed names")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="Concurrent API requests")
+    parser.add_argument("--rps", type=float, default=REQUESTS_PER_SECOND, help="Max API requests per second")
     args = parser.parse_args()
 
     print("=" * 60)
@@ -142,43 +232,52 @@ def main():
     import anthropic
     client = anthropic.Anthropic()
 
+    limiter = AdaptiveLimiter(args.rps)
+
     tagged = 0
     failed = 0
     total_cost = 0.0
+    pending_updates = []
+
+    # API calls run in the pool; buffering, DB flushes and logging stay on the main thread
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {executor.submit(tag_feature, client, f, limiter): f for f in features}
 
-    for i, feature in enumerate(features):
-        fid = feature["id"]
-        name = feature.get("homeowner_name") or "?"
-        style = feature.get("design_style") or "?"
+        for i, future in enumerate(as_completed(futures)):
+            feature = futures[future]
+            fid = feature["id"]
+            name = feature.get("homeowner_name") or "?"
 
-        profile, cost = tag_feature(client, feature)
-        total_cost += cost
+            profile, cost = future.result()
+            total_cost += cost
 
-        if profile:
-            # Write to Supabase
-            try:
-                sb.table("features").update({
-                    "aesthetic_profile": json.dumps(profile),
-                }).eq("id", fid).execute()
+            if profile:
+                pending_updates.append({"id": fid, "aesthetic_profile": json.dumps(profile)})
                 tagged += 1
                 env = profile.get("envelope", "?")
                 atm = profile.get("atmosphere", "?")
                 print(f"  [{i+1}/{len(features)}] {name[:30]:30s} → {env} / {atm}  (${cost:.4f})")
-            except Exception as e:
-                print(f"  [{i+1}/{len(features)}] {name[:30]:30s} → DB error: {e}")
+                if len(pending_updates) >= FLUSH_SIZE:
+                    db_failed = flush_updates(sb, pending_updates)
+                    tagged -= db_failed
+                    failed += db_failed
+                    pending_updates = []
+            else:
+                print(f"  [{i+1}/{len(features)}] {name[:30]:30s} → FAILED (${cost:.4f})")
                 failed += 1
-        else:
-            print(f"  [{i+1}/{len(features)}] {name[:30]:30s} → FAILED (${cost:.4f})")
-            failed += 1
 
-        # Rate limit: ~2 req/sec for Haiku
-        if (i + 1) % 50 == 0:
-            print(f"\n  Progress: {i+1}/{len(features)} | Tagged: {tagged} | Failed: {failed} | Cost: ${total_cost:.4f}\n")
-            time.sleep(1)
+            if (i + 1) % 50 == 0:
+                print(f"\n  Progress: {i+1}/{len(features)} | Tagged: {tagged} | Failed: {failed} | "
+                      f"Cost: ${total_cost:.4f} | Rate: {limiter.rate:.1f} req/s\n")
+
+    db_failed = flush_updates(sb, pending_updates)
+    tagged -= db_failed
+    failed += db_failed
 
     print(f"\n{'=' * 60}")
     print(f"DONE: {tagged} tagged, {failed} failed out of {len(features)} features")
     print(f"Total API cost: ${total_cost:.4f}")
+    print(f"Prompt cache hits: {cache_stats['hits']}/{cache_stats['requests']} requests")
 
 
 if __name__ == "__main__":
@@ -5,7 +5,7 @@ Standalone script that bypasses the pipeline scheduling and processes
 all remaining names directly. Uses the same BB + DOJ search logic as
 the Detective agent, writes to the same Supabase tables.
 
-Safe to run alongside the orchestrator (upsert_cross_reference is idempotent).
+Safe to run alongside the orchestrator (upsert_cross_references is idempotent).
 
 Usage:
     python3 src/bulk_crossref.py                  # Process all unchecked
@@ -13,12 +13,14 @@ Usage:
     python3 src/bulk_crossref.py --limit 20        # First 20 unchecked
     python3 src/bulk_crossref.py --dry-run          # Show what would be checked
     python3 src/bulk_crossref.py --name "John Doe"  # Check a single name
+    python3 src/bulk_crossref.py --doj-tabs 1      # One DOJ search at a time
+    python3 src/bulk_crossref.py --refresh-doj     # Bypass the 7-day DOJ result cache
 """
 
 import argparse
 import asyncio
-import json
 import os
+import sqlite3
 import sys
 import time
 from datetime import datetime, timezone
@@ -30,17 +32,112 @@ load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
 
 from cross_reference import (
     search_black_book, load_black_book, assess_combined_verdict,
-    contextual_glance, verdict_to_binary, split_names, SKIP_NAMES,
+    contextual_glance_batch, verdict_to_binary, split_names, SKIP_NAMES,
+    GLANCE_BATCH_SIZE, MATCH_TYPE_RANK,
 )
+from rate_limit import AdaptiveLimiter
+from fast_json import dumps, loads
 from db import (
     get_features_needing_detective, get_features_missing_crossref,
-    upsert_cross_reference, get_supabase,
+    upsert_cross_references, update_detective_verdicts,
 )
 
 
 # Per-name DOJ search timeout (seconds) — prevents one hung search from blocking everything
 DOJ_NAME_TIMEOUT = 60
 
+# Browser tabs for concurrent DOJ searches (also caps names in flight)
+DOJ_TABS = 3
+
+# Pipeline queue bounds, and writer batching (rows or seconds, whichever first)
+QUEUE_SIZE = 200
+WRITE_BATCH_SIZE = 100
+WRITE_FLUSH_SECONDS = 1.0
+
+# Ambiguous names wait up to this long to share one Haiku glance request
+GLANCE_FLUSH_SECONDS = 1.0
+
+# xref JSON payload caps — inputs are trimmed first so the capped output
+# is almost always still valid JSON
+JSON_CAP = 2000
+MAX_BB_MATCHES = 3
+MAX_BB_CONTEXT_CHARS = 300
+MAX_SNIPPETS = 5
+MAX_SNIPPET_CHARS = 200
+
+# On-disk DOJ result cache (successful searches only), keyed by normalised name
+DOJ_CACHE_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "doj_cache.db")
+DOJ_CACHE_TTL = 7 * 86400
+
+# Ceiling for DOJ searches/sec — halved on timeouts/errors, restored on success
+DOJ_REQUESTS_PER_SECOND = 2.0
+
+
+def _capped_json(value, cap=JSON_CAP):
+    """Serialize and hard-cap at `cap` chars (safety net after trimming)."""
+    return dumps(value)[:cap]
+
+
+def _trim_bb_matches(bb_matches):
+    """Keep the strongest few BB matches with their context shortened."""
+    top = sorted(bb_matches, key=lambda m: MATCH_TYPE_RANK.get(m.get("match_type"), 0), reverse=True)
+    return [
+        {**m, "context": (m.get("context") or "")[:MAX_BB_CONTEXT_CHARS]}
+        for m in top[:MAX_BB_MATCHES]
+    ]
+
+
+def _trim_doj_result(doj_result):
+    """The DOJ fields cross_references stores, with snippets capped."""
+    snippets = (doj_result.get("snippets") or [])[:MAX_SNIPPETS]
+    return {
+        "total_results": doj_result.get("total_results", 0),
+        "confidence": doj_result.get("confidence", "none"),
+        "snippets": [s[:MAX_SNIPPET_CHARS] for s in snippets],
+    }
+
+
+class DOJCache:
+    """sqlite-backed cache of DOJ search_name_variations results.
+
+    The DOJ library changes rarely, so reruns and incremental passes reuse
+    results younger than DOJ_CACHE_TTL instead of driving the browser.
+    """
+
+    def __init__(self, path=DOJ_CACHE_PATH, ttl=DOJ_CACHE_TTL):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.ttl = ttl
+        self.hits = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS doj_results ("
+            "name_norm TEXT PRIMARY KEY, result_json TEXT NOT NULL, ts INTEGER NOT NULL)"
+        )
+        self.conn.commit()
+
+    @staticmethod
+    def _norm(name):
+        return " ".join(name.lower().split())
+
+    def get(self, name):
+        row = self.conn.execute(
+            "SELECT result_json, ts FROM doj_results WHERE name_norm = ?", (self._norm(name),)
+        ).fetchone()
+        if not row or time.time() - row[1] >= self.ttl:
+            return None
+        self.hits += 1
+        return loads(row[0])
+
+    def put(self, name, result):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO doj_results (name_norm, result_json, ts) VALUES (?, ?, ?)",
+            (self._norm(name), dumps(result), int(time.time())),
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
 
 async def bulk_crossref(args):
     """Main cross-reference loop."""
@@ -70,11 +167,11 @@ async def bulk_crossref(args):
         print("Nothing to check — all features have detective verdicts!")
         return
 
-    # Deduplicate by name (group feature IDs)
+    # Deduplicate by name (group feature IDs), dropping skippable names up front
     name_to_features = {}
     for feat in unchecked:
         name = (feat.get("homeowner_name") or "").strip()
-        if not name or name.lower() in SKIP_NAMES or name == "Anonymous":
+        if len(name) < 3 or name.lower() in SKIP_NAMES:
             continue
         name_to_features.setdefault(name, []).append(feat["id"])
 
@@ -82,6 +179,15 @@ async def bulk_crossref(args):
     if args.limit:
         names = names[:args.limit]
 
+    # Split each name once; keep only individuals long enough to search
+    names_to_individuals = {}
+    for name in names:
+        individuals = split_names(name) or [name]
+        names_to_individuals[name] = (
+            individuals,
+            [ind for ind in individuals if ind and len(ind.strip()) >= 3],
+        )
+
     print(f"Unique names to check: {len(names)}")
     print()
 
@@ -92,13 +198,17 @@ async def bulk_crossref(args):
         print(f"\nDry run — {len(names)} names would be checked")
         return
 
+    # The BB stage below fills bb_hits_by_name ahead of the DOJ workers;
+    # their lookups are O(1).
+    bb_hits_by_name = {}
+
     # Start DOJ browser (unless --bb-only)
     doj_client = None
     if not args.bb_only:
-        print("Launching DOJ browser...")
+        print(f"Launching DOJ browser ({args.doj_tabs} tabs)...")
         try:
             from doj_search import DOJSearchClient
-            doj_client = DOJSearchClient()
+            doj_client = DOJSearchClient(tabs=args.doj_tabs)
             await doj_client.start()
             print("DOJ browser ready")
         except Exception as e:
@@ -110,161 +220,271 @@ async def bulk_crossref(args):
     stats = {"checked": 0, "yes": 0, "no": 0, "errors": 0, "skipped": 0}
     start_time = time.time()
 
-    try:
-        for i, name in enumerate(names):
-            feature_ids = name_to_features[name]
-            individuals = split_names(name) or [name]
-
-            # Search each individual, keep the strongest result
-            best_bb_matches = None
-            best_doj_result = None
-            best_verdict_info = None
-            best_bb_verdict = "no_match"
-            best_doj_verdict = "skipped" if args.bb_only else "pending"
-
-            for individual in individuals:
-                if not individual or len(individual.strip()) < 3:
-                    continue
-
-                # BB search (instant)
-                bb_matches = search_black_book(individual, book_text)
-                if bb_matches:
-                    best_bb_matches = bb_matches
-                    best_bb_verdict = "match"
-
-                # DOJ search (with per-name timeout)
-                doj_result = None
-                doj_verdict = "skipped" if args.bb_only else "pending"
-
-                if doj_client and not args.bb_only:
-                    try:
-                        doj_result = await asyncio.wait_for(
-                            doj_client.search_name_variations(individual),
-                            timeout=DOJ_NAME_TIMEOUT,
-                        )
-                        if doj_result.get("search_successful"):
-                            doj_verdict = "searched"
-                        else:
-                            doj_verdict = "error"
-                    except asyncio.TimeoutError:
-                        print(f"  TIMEOUT: DOJ search for '{individual}' exceeded {DOJ_NAME_TIMEOUT}s — skipping")
-                        doj_verdict = "timeout"
-                        # Try to recover browser for next name
-                        try:
-                            await doj_client.ensure_ready()
-                        except Exception:
-                            pass
-                    except Exception as e:
-                        print(f"  ERROR: DOJ search for '{individual}': {e}")
-                        doj_verdict = "error"
-                        # Try to recover browser
-                        try:
-                            await doj_client.stop()
-                            await asyncio.sleep(2)
-                            await doj_client.start()
-                        except Exception:
-                            doj_client = None  # Give up on DOJ
-
-                # Compute verdict
-                if doj_verdict == "searched":
-                    verdict_info = assess_combined_verdict(individual, bb_matches, doj_result)
+    doj_limiter = AdaptiveLimiter(DOJ_REQUESTS_PER_SECOND)
+    doj_cache = DOJCache() if not args.bb_only else None
+
+    async def score_individual(individual):
+        """BB + DOJ for one individual. Returns (bb_matches, doj_result, doj_verdict, verdict_info)."""
+        nonlocal doj_client
+
+        # BB result from the pre-pass
+        bb_matches = bb_hits_by_name.get(individual)
+
+        # DOJ search (with per-name timeout)
+        doj_result = None
+        doj_verdict = "skipped" if args.bb_only else "pending"
+
+        cached = None
+        if doj_cache and not args.refresh_doj:
+            cached = doj_cache.get(individual)
+        if cached:
+            doj_result = cached
+            doj_verdict = "searched"
+        elif doj_client and not args.bb_only:
+            await doj_limiter.acquire_async()
+            try:
+                doj_result = await asyncio.wait_for(
+                    doj_client.search_name_variations(individual),
+                    timeout=DOJ_NAME_TIMEOUT,
+                )
+                if doj_result.get("search_successful"):
+                    doj_verdict = "searched"
+                    doj_limiter.on_success()
+                    doj_cache.put(individual, doj_result)
                 else:
-                    # BB-only or DOJ failed
-                    if best_bb_verdict == "match":
-                        fallback = "needs_review"
-                        verdict_info = {
-                            "verdict": fallback,
-                            "confidence_score": 0.5,
-                            "rationale": f"BB match, DOJ {doj_verdict}",
-                            "false_positive_indicators": [],
-                        }
-                    else:
-                        verdict_info = {
-                            "verdict": "no_match",
-                            "confidence_score": 0.0,
-                            "rationale": f"No BB match, DOJ {doj_verdict}",
-                            "false_positive_indicators": [],
-                        }
-
-                # Keep strongest
-                if best_verdict_info is None or verdict_info.get("confidence_score", 0) > best_verdict_info.get("confidence_score", 0):
-                    best_verdict_info = verdict_info
-                    best_doj_result = doj_result
-                    best_doj_verdict = doj_verdict
-
-                await asyncio.sleep(0.3)  # Brief rate limit
-
-            if best_verdict_info is None:
-                best_verdict_info = {"verdict": "no_match", "confidence_score": 0, "rationale": "No results", "false_positive_indicators": []}
-
-            # Contextual glance for ambiguous cases
-            combined = best_verdict_info["verdict"]
-            glance_result = None
-            if combined in ("possible_match", "needs_review"):
+                    doj_verdict = "error"
+                    doj_limiter.on_throttle()
+            except asyncio.TimeoutError:
+                doj_limiter.on_throttle()
+                print(f"  TIMEOUT: DOJ search for '{individual}' exceeded {DOJ_NAME_TIMEOUT}s — skipping")
+                doj_verdict = "timeout"
+                # Try to recover browser for next name
                 try:
-                    glance_result = contextual_glance(name, best_bb_matches, best_doj_result)
+                    await doj_client.ensure_ready()
                 except Exception:
                     pass
+            except Exception as e:
+                print(f"  ERROR: DOJ search for '{individual}': {e}")
+                doj_verdict = "error"
+                doj_limiter.on_throttle()
+                # Try to recover browser (shared by concurrent searches, so no hard stop)
+                try:
+                    if doj_client and not await doj_client.ensure_ready():
+                        doj_client = None  # Give up on DOJ
+                except Exception:
+                    doj_client = None
+
+        # Compute verdict
+        if doj_verdict == "searched":
+            verdict_info = assess_combined_verdict(individual, bb_matches, doj_result)
+        elif bb_matches:
+            # BB-only or DOJ failed
+            verdict_info = {
+                "verdict": "needs_review",
+                "confidence_score": 0.5,
+                "rationale": f"BB match, DOJ {doj_verdict}",
+                "false_positive_indicators": [],
+            }
+        else:
+            verdict_info = {
+                "verdict": "no_match",
+                "confidence_score": 0.0,
+                "rationale": f"No BB match, DOJ {doj_verdict}",
+                "false_positive_indicators": [],
+            }
+
+        return bb_matches, doj_result, doj_verdict, verdict_info
+
+    async def check_name(name):
+        """Score every individual in a name concurrently, then queue the strongest result."""
+        feature_ids = name_to_features[name]
+        individuals, searchable = names_to_individuals[name]
+
+        results = await asyncio.gather(
+            *(score_individual(ind) for ind in searchable),
+            return_exceptions=True,
+        )
+
+        # Keep the strongest result across individuals
+        best_bb_matches = None
+        best_doj_result = None
+        best_verdict_info = None
+        best_doj_verdict = "skipped" if args.bb_only else "pending"
+
+        for individual, res in zip(searchable, results):
+            if isinstance(res, BaseException):
+                print(f"  ERROR: '{individual}': {res}")
+                continue
+            bb_matches, doj_result, doj_verdict, verdict_info = res
+            if bb_matches:
+                best_bb_matches = bb_matches
+            if best_verdict_info is None or verdict_info.get("confidence_score", 0) > best_verdict_info.get("confidence_score", 0):
+                best_verdict_info = verdict_info
+                best_doj_result = doj_result
+                best_doj_verdict = doj_verdict
+
+        if best_verdict_info is None:
+            best_verdict_info = {"verdict": "no_match", "confidence_score": 0, "rationale": "No results", "false_positive_indicators": []}
+
+        # Contextual glance for ambiguous cases
+        combined = best_verdict_info["verdict"]
+        glance_result = None
+        if combined in ("possible_match", "needs_review"):
+            glance_result = await glance(name, best_bb_matches, best_doj_result)
+
+        # Binary verdict
+        binary_verdict = verdict_to_binary(
+            combined,
+            best_verdict_info.get("confidence_score", 0),
+            glance_override=glance_result,
+        )
+
+        # Hand the rows to the writer stage, which batches across names
+        if not args.name:  # Skip DB write for --name mode
+            xref_data = {
+                "homeowner_name": name,
+                "black_book_status": "match" if best_bb_matches else "no_match",
+                "black_book_matches": _capped_json(_trim_bb_matches(best_bb_matches)) if best_bb_matches else None,
+                "doj_status": best_doj_verdict,
+                "doj_results": _capped_json(_trim_doj_result(best_doj_result)) if best_doj_result else None,
+                "combined_verdict": combined,
+                "confidence_score": best_verdict_info.get("confidence_score", 0),
+                "verdict_rationale": best_verdict_info.get("rationale", "")[:500],
+                "binary_verdict": binary_verdict,
+                "false_positive_indicators": dumps(best_verdict_info.get("false_positive_indicators", [])),
+                "individuals_searched": dumps(individuals),
+                "checked_at": datetime.now(timezone.utc).isoformat(),
+            }
+            await write_q.put([{**xref_data, "feature_id": fid} for fid in feature_ids])
+
+        stats["checked"] += 1
+        if binary_verdict == "YES":
+            stats["yes"] += 1
+        else:
+            stats["no"] += 1
+
+        # Progress
+        elapsed = time.time() - start_time
+        rate = stats["checked"] / elapsed if elapsed > 0 else 0
+        remaining = (len(names) - stats["checked"]) / rate if rate > 0 else 0
+        bb_tag = "BB:match" if best_bb_matches else "BB:none"
+        doj_tag = f"DOJ:{best_doj_verdict}"
+
+        print(
+            f"[{stats['checked']}/{len(names)}] {binary_verdict:3} "
+            f"{bb_tag:10} {doj_tag:14} "
+            f"{name[:40]:40} "
+            f"({elapsed:.0f}s elapsed, ~{remaining:.0f}s remaining)"
+        )
+
+    # Pipeline: BB stage → name_q → DOJ workers → write_q → writer.
+    # One name per DOJ tab in flight; individuals within a name share the tabs.
+    name_q = asyncio.Queue(maxsize=QUEUE_SIZE)
+    write_q = asyncio.Queue(maxsize=QUEUE_SIZE)
+    workers = max(1, args.doj_tabs)
+
+    async def bb_stage():
+        for name in names:
+            for individual in names_to_individuals[name][1]:
+                if individual not in bb_hits_by_name:
+                    bb_hits_by_name[individual] = await asyncio.to_thread(
+                        search_black_book, individual, book_text)
+            await name_q.put(name)
+        for _ in range(workers):
+            await name_q.put(None)
+
+    async def doj_worker():
+        while (name := await name_q.get()) is not None:
+            try:
+                await check_name(name)
+            except Exception as e:
+                print(f"  ERROR: '{name}': {e}")
+                stats["errors"] += 1
 
-            # Binary verdict
-            binary_verdict = verdict_to_binary(
-                combined,
-                best_verdict_info.get("confidence_score", 0),
-                glance_override=glance_result,
-            )
-
-            # Write to Supabase
-            if not args.name:  # Skip DB write for --name mode
-                for fid in feature_ids:
-                    try:
-                        xref_data = {
-                            "homeowner_name": name,
-                            "black_book_status": "match" if best_bb_matches else "no_match",
-                            "black_book_matches": json.dumps(best_bb_matches)[:2000] if best_bb_matches else None,
-                            "doj_status": best_doj_verdict,
-                            "doj_results": json.dumps({
-                                "total_results": best_doj_result.get("total_results", 0) if best_doj_result else 0,
-                                "confidence": best_doj_result.get("confidence", "none") if best_doj_result else "none",
-                                "snippets": best_doj_result.get("snippets", []) if best_doj_result else [],
-                            })[:2000] if best_doj_result else None,
-                            "combined_verdict": combined,
-                            "confidence_score": best_verdict_info.get("confidence_score", 0),
-                            "verdict_rationale": best_verdict_info.get("rationale", "")[:500],
-                            "binary_verdict": binary_verdict,
-                            "false_positive_indicators": json.dumps(best_verdict_info.get("false_positive_indicators", [])),
-                            "individuals_searched": json.dumps(individuals),
-                            "checked_at": datetime.now(timezone.utc).isoformat(),
-                        }
-                        upsert_cross_reference(fid, xref_data)
-
-                        # Update features.detective_verdict
-                        sb = get_supabase()
-                        sb.table("features").update({"detective_verdict": binary_verdict}).eq("id", fid).execute()
-                    except Exception as e:
-                        print(f"  DB ERROR for feature {fid}: {e}")
-                        stats["errors"] += 1
-
-            stats["checked"] += 1
-            if binary_verdict == "YES":
-                stats["yes"] += 1
-            else:
-                stats["no"] += 1
-
-            # Progress
-            elapsed = time.time() - start_time
-            rate = stats["checked"] / elapsed if elapsed > 0 else 0
-            remaining = (len(names) - (i + 1)) / rate if rate > 0 else 0
-            bb_tag = "BB:match" if best_bb_matches else "BB:none"
-            doj_tag = f"DOJ:{best_doj_verdict}"
-
-            print(
-                f"[{i+1}/{len(names)}] {binary_verdict:3} "
-                f"{bb_tag:10} {doj_tag:14} "
-                f"{name[:40]:40} "
-                f"({elapsed:.0f}s elapsed, ~{remaining:.0f}s remaining)"
-            )
+    def flush(rows):
+        """One xref upsert + one features UPDATE per verdict for a batch of rows."""
+        try:
+            overridden = upsert_cross_references(rows)
+            by_verdict = {}
+            for row in rows:
+                if row["feature_id"] not in overridden:
+                    by_verdict.setdefault(row["binary_verdict"], []).append(row["feature_id"])
+            # Editor overrides are final — their features keep their verdict
+            for verdict, fids in by_verdict.items():
+                update_detective_verdicts(fids, verdict)
+        except Exception as e:
+            print(f"  DB ERROR for {len(rows)} features: {e}")
+            stats["errors"] += len(rows)
+
+    async def writer():
+        buffer = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                rows = await asyncio.wait_for(write_q.get(), timeout)
+            except asyncio.TimeoutError:
+                rows = []
+            if rows is None:
+                break
+            if rows and not buffer:
+                deadline = time.monotonic() + WRITE_FLUSH_SECONDS
+            buffer.extend(rows)
+            if buffer and (len(buffer) >= WRITE_BATCH_SIZE or time.monotonic() >= deadline):
+                await asyncio.to_thread(flush, buffer)
+                buffer, deadline = [], None
+        if buffer:
+            await asyncio.to_thread(flush, buffer)
+
+    # Glance stage: ambiguous names from all workers share batched Haiku calls
+    glance_q = asyncio.Queue()
+
+    async def glance(name, bb_matches, doj_result):
+        future = asyncio.get_running_loop().create_future()
+        await glance_q.put(((name, bb_matches, doj_result), future))
+        return await future
+
+    async def glancer():
+        done = False
+        while not done:
+            item = await glance_q.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + GLANCE_FLUSH_SECONDS
+            while len(batch) < GLANCE_BATCH_SIZE:
+                try:
+                    item = await asyncio.wait_for(
+                        glance_q.get(), max(0, deadline - time.monotonic()))
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    done = True
+                    break
+                batch.append(item)
+            try:
+                answers = await asyncio.to_thread(
+                    contextual_glance_batch, [case for case, _ in batch])
+            except Exception:
+                answers = [None] * len(batch)
+            for (_, future), answer in zip(batch, answers):
+                future.set_result(answer)
+
+    writer_task = asyncio.create_task(writer())
+    glancer_task = asyncio.create_task(glancer())
+    try:
+        await asyncio.gather(bb_stage(), *(doj_worker() for _ in range(workers)))
+        await glance_q.put(None)
+        await glancer_task
+        await write_q.put(None)
+        await writer_task
 
     finally:
+        for task in (glancer_task, writer_task):
+            if not task.done():
+                task.cancel()
+        if doj_cache:
+            doj_cache.close()
         # Cleanup DOJ browser
         if doj_client:
             try:
@@ -278,27 +498,13 @@ async def bulk_crossref(args):
     print("=" * 60)
     print(f"DONE: {stats['checked']} checked, {stats['yes']} YES, {stats['no']} NO, {stats['errors']} errors")
     print(f"Time: {elapsed:.0f}s ({elapsed/60:.1f} min)")
+    if doj_cache:
+        print(f"DOJ cache hits: {doj_cache.hits}")
     if stats["checked"] > 0:
         print(f"Rate: {stats['checked']/elapsed:.1f} names/sec")
     print("=" * 60)
 
 
-def _bb_match_type(bb_matches):
-    """Extract best match type from BB matches."""
-    if not bb_matches:
-        return None
-    rank = {"last_first": 4, "full_name": 3, "last_name_only": 2}
-    best = None
-    best_rank = 0
-    for m in bb_matches:
-        mt = m.get("match_type", "")
-        r = rank.get(mt, 0)
-        if r > best_rank:
-            best_rank = r
-            best = mt
-    return best
-
-
 def main():
     parser = argparse.ArgumentParser(description="Bulk cross-reference unchecked features")
     parser.add_argument("--bb-only", action="store_true", help="Black Book only (no DOJ browser)")
@@ -306,6 +512,8 @@ def main():
     parser.add_argument("--limit", type=int, help="Limit number of names to check")
     parser.add_argument("--dry-run", action="store_true", help="Show what would be checked")
     parser.add_argument("--name", type=str, help="Check a single name")
+    parser.add_argument("--refresh-doj", action="store_true", help="Ignore cached DOJ results and search again")
+    parser.add_argument("--doj-tabs", type=int, default=DOJ_TABS, help="Concurrent DOJ browser tabs")
     args = parser.parse_args()
 
     asyncio.run(bulk_crossref(args))
@@ -11,17 +11,24 @@ Usage:
     python3 src/classify_dossier_subjects.py --all         # reclassify everything
     python3 src/classify_dossier_subjects.py --reclassify-other  # split Other into Private/Other
     python3 src/classify_dossier_subjects.py --dry-run     # preview without saving
+    python3 src/classify_dossier_subjects.py --all --no-cache  # ignore cached answers
 """
 
 import argparse
-import json
+import asyncio
+import hashlib
 import os
+import sqlite3
 import sys
+from collections import defaultdict
 
 import anthropic
 from dotenv import load_dotenv
 from supabase import create_client
 
+sys.path.insert(0, os.path.dirname(__file__))
+from rate_limit import AnthropicLimiter
+
 load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
 
 VALID_CATEGORIES = [
@@ -37,7 +44,14 @@ VALID_CATEGORIES = [
     "Other",
 ]
 
-PROMPT = """You are classifying people who appeared in Architectural Digest magazine into profession categories based on what they are primarily known for.
+MODEL = "claude-haiku-4-5-20251001"
+BATCH_SIZE = 80
+MAX_TOKENS = 8192
+CONCURRENCY = 5  # parallel Haiku requests, under the account's connection cap
+CACHE_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "classify_cache.db")
+WRITE_CHUNK = 500  # ids per UPDATE ... WHERE id IN (...) call
+
+SYSTEM_PROMPT = """You are classifying people who appeared in Architectural Digest magazine into profession categories based on what they are primarily known for.
 
 Categories:
 - **Associate**: Inner circle of Jeffrey Epstein (e.g., Ghislaine Maxwell, Jean-Luc Brunel, Sarah Kellen)
@@ -61,14 +75,12 @@ Rules:
 - Couples like "John and Jane Smith" — classify based on the more prominent person
 - "Other" is ONLY for famous/recognizable people who don't fit the main categories
 
-For each person below, respond with a JSON object mapping the name exactly as given to their category.
-
-People to classify:
-{names}
+For each person below, record their category with the classify_people tool, keyed by the name exactly as given."""
 
-Respond with ONLY valid JSON. Example: {{"John Smith": "Private", "Jane Doe": "Celebrity"}}"""
+USER_TEMPLATE = """People to classify:
+{names}"""
 
-RECLASSIFY_PROMPT = """You previously classified these people as "Other" when they appeared in Architectural Digest magazine. Now we need to split "Other" into two categories:
+RECLASSIFY_SYSTEM_PROMPT = """You previously classified these people as "Other" when they appeared in Architectural Digest magazine. Now we need to split "Other" into two categories:
 
 - **Private**: NOT a public figure — you do not recognize this person. They are a private wealthy homeowner. If you're unsure who someone is, they're Private.
 - **Other**: A recognizable public figure who doesn't fit standard categories (Celebrity, Business, Designer, Politician, Legal, Royalty, Socialite). Examples: a famous doctor, famous writer, famous chef, famous scientist, famous art collector.
@@ -82,33 +94,107 @@ Rules:
 - If it's a famous person who doesn't fit other categories → "Other"
 - If you realize the person actually IS a celebrity, business figure, designer, etc. → use that category instead
 
-People to reclassify:
-{names}
-
-Respond with ONLY valid JSON. Example: {{"John Smith": "Private", "Edgar Kaufmann, Jr.": "Other"}}"""
-
-
-def classify_batch(client, names: list[str], reclassify=False) -> dict[str, str]:
-    """Classify a batch of names using Haiku."""
+Record each person's category with the classify_people tool, keyed by the name exactly as given."""
+
+RECLASSIFY_USER_TEMPLATE = """People to reclassify:
+{names}"""
+
+# Structured output: the model must call this tool, so the answer arrives as
+# a parsed {name: category} object instead of free text.
+CLASSIFY_TOOL = {
+    "name": "classify_people",
+    "description": "Record the profession category for each person.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "classifications": {
+                "type": "object",
+                "description": "Map of each name exactly as given to its category",
+                "additionalProperties": {"type": "string", "enum": VALID_CATEGORIES},
+            },
+        },
+        "required": ["classifications"],
+    },
+}
+
+
+class ClassificationCache:
+    """sqlite-backed cache of Haiku categories keyed by sha256(normalized name).
+
+    Entries are scoped by prompt mode ("classify" / "reclassify") because
+    the reclassify prompt is asked a different question. Reruns and --all
+    passes only send cache misses to the API.
+    """
+
+    def __init__(self, path=CACHE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS classifications ("
+            "mode TEXT NOT NULL, name_hash TEXT NOT NULL, category TEXT NOT NULL, "
+            "PRIMARY KEY (mode, name_hash))"
+        )
+        self.conn.commit()
+
+    @staticmethod
+    def _hash(name):
+        return hashlib.sha256(name.strip().lower().encode("utf-8")).hexdigest()
+
+    def get_many(self, mode, names):
+        """Return {name: category} for the names that are cached."""
+        found = {}
+        for name in names:
+            row = self.conn.execute(
+                "SELECT category FROM classifications WHERE mode = ? AND name_hash = ?",
+                (mode, self._hash(name)),
+            ).fetchone()
+            if row:
+                found[name] = row[0]
+        return found
+
+    def put_many(self, mode, classifications):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO classifications (mode, name_hash, category) VALUES (?, ?, ?)",
+            [(mode, self._hash(n), cat) for n, cat in classifications.items()],
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+async def classify_batch(client, names: list[str], reclassify=False, limiter=None) -> dict[str, str]:
+    """Classify a batch of names using Haiku.
+
+    If a limiter (AnthropicLimiter) is given, the call waits for RPM/TPM
+    budget before dispatch and settles the real usage afterwards.
+    """
     names_text = "\n".join(f"- {n}" for n in names)
-    prompt = RECLASSIFY_PROMPT if reclassify else PROMPT
-
-    response = client.messages.create(
-        model="claude-haiku-4-5-20251001",
-        max_tokens=8192,
+    if reclassify:
+        system, template = RECLASSIFY_SYSTEM_PROMPT, RECLASSIFY_USER_TEMPLATE
+    else:
+        system, template = SYSTEM_PROMPT, USER_TEMPLATE
+    prompt = template.format(names=names_text)
+
+    est = AnthropicLimiter.estimate(system + prompt, MAX_TOKENS)
+    if limiter:
+        await limiter.acquire_async(est)
+    response = await client.messages.create(
+        model=MODEL,
+        max_tokens=MAX_TOKENS,
+        # Static categories + rules go first; too short for a prompt-cache prefix
+        system=system,
+        tools=[CLASSIFY_TOOL],
+        tool_choice={"type": "tool", "name": CLASSIFY_TOOL["name"]},
         messages=[
-            {"role": "user", "content": prompt.format(names=names_text)},
+            {"role": "user", "content": prompt},
         ],
     )
+    if limiter:
+        limiter.record(est, response.usage.input_tokens + response.usage.output_tokens)
 
-    text = response.content[0].text.strip()
-    # Strip markdown code fences if present
-    if text.startswith("```"):
-        text = text.split("\n", 1)[1]
-        if text.endswith("```"):
-            text = text.rsplit("```", 1)[0]
-
-    result = json.loads(text)
+    tool_use = next(b for b in response.content if b.type == "tool_use")
+    result = dict(tool_use.input["classifications"])
 
     # Validate categories
     for name, cat in result.items():
@@ -119,6 +205,68 @@ def classify_batch(client, names: list[str], reclassify=False) -> dict[str, str]
     return result
 
 
+async def classify_all(names: list[str], reclassify=False, on_result=None) -> dict[str, str]:
+    """Classify names in BATCH_SIZE chunks through a bounded worker pipeline.
+
+    producer -> work queue -> CONCURRENCY workers (Haiku) -> out queue -> writer.
+    The queues are bounded, so only a few batches are in flight at a time.
+    The writer passes successful results to on_result({name: category}) in
+    chunks of about WRITE_CHUNK names, e.g. to persist them to the cache.
+    Names in a failed batch fall back to "Other".
+    """
+    client = anthropic.AsyncAnthropic()
+    limiter = AnthropicLimiter.from_env()
+    chunks = [names[i : i + BATCH_SIZE] for i in range(0, len(names), BATCH_SIZE)]
+    total_batches = len(chunks)
+    work_q = asyncio.Queue(maxsize=2 * CONCURRENCY)
+    out_q = asyncio.Queue(maxsize=2 * CONCURRENCY)
+    all_classifications = {}
+
+    async def producer():
+        for item in enumerate(chunks, 1):
+            await work_q.put(item)
+        for _ in range(CONCURRENCY):
+            await work_q.put(None)  # one stop signal per worker
+
+    async def worker():
+        while (item := await work_q.get()) is not None:
+            batch_num, batch = item
+            try:
+                result = await classify_batch(client, batch, reclassify=reclassify, limiter=limiter)
+            except Exception as e:
+                print(f"  Batch {batch_num}/{total_batches} ERROR: {e}")
+                await out_q.put((batch, None))
+                continue
+            print(f"  Batch {batch_num}/{total_batches}: classified {len(result)} names")
+            await out_q.put((batch, result))
+
+    async def writer():
+        pending = {}
+        for _ in range(total_batches):
+            batch, result = await out_q.get()
+            if result is None:
+                # Mark failed names as Other
+                for name in batch:
+                    all_classifications.setdefault(name, "Other")
+                continue
+            all_classifications.update(result)
+            pending.update(result)
+            if on_result and len(pending) >= WRITE_CHUNK:
+                on_result(pending)
+                pending = {}
+        if on_result and pending:
+            on_result(pending)
+
+    print(f"\nClassifying {len(names)} names in {total_batches} batches "
+          f"({CONCURRENCY} concurrent)...")
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(producer())
+        for _ in range(CONCURRENCY):
+            tg.create_task(worker())
+        tg.create_task(writer())
+    return all_classifications
+
+
 def paginated_select(sb, table, columns):
     """Fetch all rows from a table, paginating past the 1000-row limit."""
     all_rows = []
@@ -132,21 +280,44 @@ def paginated_select(sb, table, columns):
     return all_rows
 
 
+def update_by_category(sb, table, ids_by_cat):
+    """Set subject_category with one UPDATE ... WHERE id IN (...) per category.
+
+    Args:
+        ids_by_cat: {category: [row ids]}
+
+    At most len(VALID_CATEGORIES) queries per table (more only when a
+    category's id list spans several WRITE_CHUNK slices). Returns the
+    number of rows written.
+    """
+    written = 0
+    total = sum(len(ids) for ids in ids_by_cat.values())
+    for cat, ids in ids_by_cat.items():
+        for i in range(0, len(ids), WRITE_CHUNK):
+            chunk = ids[i : i + WRITE_CHUNK]
+            sb.table(table).update({"subject_category": cat}).in_("id", chunk).execute()
+            written += len(chunk)
+        print(f"  {cat}: {len(ids)} rows ({written}/{total})")
+    return written
+
+
 def main():
     parser = argparse.ArgumentParser(description="Classify AD homeowner names by profession")
     parser.add_argument("--all", action="store_true", help="Reclassify everything")
     parser.add_argument("--reclassify-other", action="store_true", help="Split Other into Private/Other")
     parser.add_argument("--dry-run", action="store_true", help="Preview without saving")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore cached classifications")
     args = parser.parse_args()
 
     sb = create_client(os.environ["SUPABASE_URL"], os.environ["SUPABASE_SERVICE_KEY"])
-    client = anthropic.Anthropic()
 
-    # ── Step 1: Fetch all features with homeowner names ──────────────────
-    print("Fetching features...")
+    # ── Step 1: Fetch features and dossiers (each read once) ─────────────
+    print("Fetching features and dossiers...")
     all_features = paginated_select(sb, "features", "id, homeowner_name, subject_category")
+    dossiers = paginated_select(sb, "dossiers", "id, feature_id, subject_name, subject_category")
     named_features = [f for f in all_features if f.get("homeowner_name")]
-    print(f"Total features: {len(all_features)}, Named: {len(named_features)}")
+    print(f"Total features: {len(all_features)}, Named: {len(named_features)}, "
+          f"Dossiers: {len(dossiers)}")
 
     if args.reclassify_other:
         named_features = [f for f in named_features if f.get("subject_category") == "Other"]
@@ -155,43 +326,55 @@ def main():
         named_features = [f for f in named_features if not f.get("subject_category")]
         print(f"Untagged: {len(named_features)}")
 
-    if not named_features:
+    # Dossiers whose feature has no homeowner_name can't inherit a category
+    # in Step 7, so their subject names join the same classification pass
+    named_ids = {f["id"] for f in all_features if (f.get("homeowner_name") or "").strip()}
+    orphan_dossiers = []
+    if not args.reclassify_other:
+        orphan_dossiers = [
+            d for d in dossiers
+            if (d.get("subject_name") or "").strip()
+            and d.get("feature_id") not in named_ids
+            and (args.all or not d.get("subject_category"))
+        ]
+        print(f"Dossiers without a named feature: {len(orphan_dossiers)}")
+
+    if not named_features and not orphan_dossiers:
         print("Nothing to classify.")
         return
 
-    # ── Step 2: Deduplicate names ────────────────────────────────────────
+    # ── Step 2: Deduplicate names across features + dossiers ─────────────
+    # Each row's normalized key is computed once here and reused in Steps 6/7
     name_to_feature_ids = {}
-    for f in named_features:
-        name = f["homeowner_name"].strip()
+    for row, name, fid in [(f, f["homeowner_name"], f["id"]) for f in named_features] + [
+        (d, d["subject_name"], d.get("feature_id")) for d in orphan_dossiers
+    ]:
+        name = name.strip()
+        key = row["_key"] = name.lower()
         if not name:
             continue
-        key = name.lower()
         if key not in name_to_feature_ids:
             name_to_feature_ids[key] = {"display_name": name, "feature_ids": []}
-        name_to_feature_ids[key]["feature_ids"].append(f["id"])
+        name_to_feature_ids[key]["feature_ids"].append(fid)
 
     unique_names = [v["display_name"] for v in name_to_feature_ids.values()]
     print(f"Unique names to classify: {len(unique_names)}")
 
-    # ── Step 3: Classify in batches ──────────────────────────────────────
-    BATCH_SIZE = 80
-    all_classifications = {}
-
-    for i in range(0, len(unique_names), BATCH_SIZE):
-        batch = unique_names[i : i + BATCH_SIZE]
-        batch_num = i // BATCH_SIZE + 1
-        total_batches = (len(unique_names) + BATCH_SIZE - 1) // BATCH_SIZE
-        print(f"\nBatch {batch_num}/{total_batches} ({len(batch)} names)...")
-        try:
-            result = classify_batch(client, batch, reclassify=args.reclassify_other)
-            all_classifications.update(result)
-            print(f"  Classified {len(result)} names")
-        except Exception as e:
-            print(f"  ERROR: {e}")
-            # Mark failed names as Other
-            for name in batch:
-                if name not in all_classifications:
-                    all_classifications[name] = "Other"
+    # ── Step 3: Classify cache misses in concurrent batches ──────────────
+    mode = "reclassify" if args.reclassify_other else "classify"
+    cache = ClassificationCache()
+    try:
+        all_classifications = {} if args.no_cache else cache.get_many(mode, unique_names)
+        to_classify = [n for n in unique_names if n not in all_classifications]
+        print(f"Cached: {len(all_classifications)}, to classify: {len(to_classify)}")
+        if to_classify:
+            all_classifications.update(asyncio.run(classify_all(
+                to_classify,
+                reclassify=args.reclassify_other,
+                on_result=lambda result: cache.put_many(mode, result),
+            )))
+    finally:
+        cache.close()
 
     # ── Step 4: Build lookup (case-insensitive) ──────────────────────────
     classification_lookup = {}
@@ -219,36 +402,35 @@ def main():
 
     # ── Step 6: Update features table ────────────────────────────────────
     print(f"\nUpdating {len(named_features)} feature rows...")
-    updated_features = 0
+    ids_by_cat = defaultdict(list)
     for f in named_features:
-        name = f["homeowner_name"].strip()
-        cat = classification_lookup.get(name.lower(), "Other")
-        sb.table("features").update({"subject_category": cat}).eq("id", f["id"]).execute()
-        updated_features += 1
-        if updated_features % 100 == 0:
-            print(f"  {updated_features}/{len(named_features)} features updated...")
-
+        cat = classification_lookup.get(f["_key"], "Other")
+        ids_by_cat[cat].append(f["id"])
+    updated_features = update_by_category(sb, "features", ids_by_cat)
     print(f"  Done: {updated_features} features updated")
 
     # ── Step 7: Copy to dossiers table from features ─────────────────────
-    # Build full lookup from ALL features (not just classified batch)
+    # Full lookup from ALL features, with this run's categories applied
+    # in memory (no second features read)
     print("\nUpdating dossiers from features...")
-    all_feats = paginated_select(sb, "features", "id, homeowner_name, subject_category")
+    new_cats = {fid: cat for cat, ids in ids_by_cat.items() for fid in ids}
+    feat_by_id = {f["id"]: new_cats.get(f["id"]) or f.get("subject_category") for f in all_features}
     feat_lookup = {}
-    for f in all_feats:
-        name = (f.get("homeowner_name") or "").strip().lower()
-        if name and f.get("subject_category"):
-            feat_lookup[name] = f["subject_category"]
-    feat_by_id = {f["id"]: f.get("subject_category") for f in all_feats}
-
-    dossiers = paginated_select(sb, "dossiers", "id, feature_id, subject_name")
-    updated_dossiers = 0
+    for f in all_features:
+        name = f.get("_key") or (f.get("homeowner_name") or "").strip().lower()
+        if name and feat_by_id[f["id"]]:
+            feat_lookup[name] = feat_by_id[f["id"]]
+
+    ids_by_cat = defaultdict(list)
     for d in dossiers:
         fid = d.get("feature_id")
-        name = (d.get("subject_name") or "").strip().lower()
-        cat = feat_by_id.get(fid) or feat_lookup.get(name) or "Private"
-        sb.table("dossiers").update({"subject_category": cat}).eq("id", d["id"]).execute()
-        updated_dossiers += 1
+        name = d.get("_key")
+        if name is None:
+            name = (d.get("subject_name") or "").strip().lower()
+        cat = (feat_by_id.get(fid) or classification_lookup.get(name)
+               or feat_lookup.get(name) or "Private")
+        ids_by_cat[cat].append(d["id"])
+    updated_dossiers = update_by_category(sb, "dossiers", ids_by_cat)
 
     print(f"  Done: {updated_dossiers} dossiers updated")
 
@@ -3,22 +3,54 @@
 Classify uncertain features as HOME_TOUR or NOT_HOME_TOUR using Haiku Vision.
 
 Downloads the first page image and asks Haiku to classify the article type.
+All images are submitted as one Message Batches job (server-side parallelism,
+half the token price), then results are collected by custom_id.
+
+Images are cached under data/.image_cache/ so re-runs skip Storage.
+
+Usage:
+    python3 src/classify_uncertain.py
+    python3 src/classify_uncertain.py --clear-image-cache   # re-download images
 """
 
 import os
+import ssl
 import sys
-import json
 import base64
+import io
+import shutil
 import time
+import asyncio
+
+import aiohttp
 import anthropic
+import certifi
 from dotenv import load_dotenv
 from supabase import create_client
 
+sys.path.insert(0, os.path.dirname(__file__))
+from fast_json import dumps, loads
+
 load_dotenv()
 
-sb = create_client(os.environ["SUPABASE_URL"], os.environ["SUPABASE_SERVICE_KEY"])
+SUPABASE_URL = os.environ["SUPABASE_URL"]
+SUPABASE_SERVICE_KEY = os.environ["SUPABASE_SERVICE_KEY"]
+
+sb = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
 client = anthropic.Anthropic(api_key=os.environ["ANTHROPIC_API_KEY"])
 
+MODEL = "claude-haiku-4-5-20251001"
+MAX_TOKENS = 200
+BATCH_POLL_INTERVAL = 15  # seconds between batch status polls
+IMAGE_BUCKETS = ["feature-images", "dossier-images"]
+DOWNLOAD_CONCURRENCY = 20
+MAX_IMAGE_EDGE = 1024  # px — plenty for a HOME_TOUR / NOT call, far fewer vision tokens
+JPEG_QUALITY = 80
+IMAGE_CACHE_DIR = "data/.image_cache"  # {feature_id}.jpg — raw first-page bytes
+CHECKPOINT_PATH = "data/uncertain_classified.jsonl"  # one entry per line, appended as we go
+PENDING_BATCH_PATH = "data/uncertain_pending_batch.json"  # submitted but not yet collected
+LOOKUP_CHUNK = 1000  # feature ids per first_page_images call (PostgREST max rows)
+
 CLASSIFY_PROMPT = """Look at this magazine page from Architectural Digest. I need you to classify this article into one of two categories:
 
 **HOME_TOUR**: An article that is primarily about a specific person's home, apartment, or residence. The article tours or showcases the interior/exterior of a private home. This includes:
@@ -41,147 +73,341 @@ CLASSIFY_PROMPT = """Look at this magazine page from Architectural Digest. I nee
 
 IMPORTANT: If the article MENTIONS a famous person but is really about a place, firm, region, or topic — it's NOT_HOME_TOUR. The test is: does this article primarily show us inside someone's private residence?
 
-Respond with EXACTLY this JSON format:
-{"classification": "HOME_TOUR" or "NOT_HOME_TOUR", "section_header": "the section/department header if visible (e.g. TRAVELS, CULTURE, DISCOVERIES) or null", "reason": "brief 5-10 word reason"}"""
-
-
-def get_first_image(feature_id: int) -> bytes | None:
-    """Download first page image for a feature."""
-    imgs = (
-        sb.table("feature_images")
-        .select("storage_path")
-        .eq("feature_id", feature_id)
-        .order("page_number")
-        .limit(1)
-        .execute()
-    )
-    if not imgs.data:
+Record your answer with the classify_article tool."""
+
+# Structured output: forcing this tool makes the answer arrive as a parsed
+# object, so there's no JSON to fish out of free text.
+CLASSIFY_TOOL = {
+    "name": "classify_article",
+    "description": "Record the article classification for this page.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "classification": {"type": "string", "enum": ["HOME_TOUR", "NOT_HOME_TOUR"]},
+            "section_header": {
+                "type": ["string", "null"],
+                "description": "Section/department header if visible (e.g. TRAVELS, CULTURE, DISCOVERIES), else null",
+            },
+            "reason": {"type": "string", "description": "Brief 5-10 word reason"},
+        },
+        "required": ["classification", "section_header", "reason"],
+    },
+}
+TOOL_CHOICE = {"type": "tool", "name": CLASSIFY_TOOL["name"]}
+
+
+def get_first_page_paths(feature_ids: list[int]) -> dict[int, str]:
+    """Storage path of each feature's lowest-numbered page, in bulk.
+
+    Uses the first_page_images RPC (migrations/005): one query per
+    LOOKUP_CHUNK features instead of one per feature.
+    """
+    paths = {}
+    for i in range(0, len(feature_ids), LOOKUP_CHUNK):
+        chunk = feature_ids[i : i + LOOKUP_CHUNK]
+        rows = sb.rpc("first_page_images", {"feature_ids": chunk}).execute()
+        for row in rows.data or []:
+            paths[row["feature_id"]] = row["storage_path"]
+    return paths
+
+
+def read_cached_image(feature_id: int) -> bytes | None:
+    """First-page bytes from the local image cache, or None."""
+    try:
+        with open(os.path.join(IMAGE_CACHE_DIR, f"{feature_id}.jpg"), "rb") as f:
+            return f.read()
+    except FileNotFoundError:
         return None
 
-    path = imgs.data[0]["storage_path"]
-    for bucket in ["feature-images", "dossier-images"]:
-        try:
-            return sb.storage.from_(bucket).download(path)
-        except Exception:
-            continue
+
+def write_cached_image(feature_id: int, data: bytes):
+    os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+    with open(os.path.join(IMAGE_CACHE_DIR, f"{feature_id}.jpg"), "wb") as f:
+        f.write(data)
+
+
+async def _download(session, sem, path: str) -> bytes | None:
+    """Fetch one storage object, trying each image bucket in turn."""
+    async with sem:
+        for bucket in IMAGE_BUCKETS:
+            url = f"{SUPABASE_URL}/storage/v1/object/{bucket}/{path}"
+            try:
+                async with session.get(url) as resp:
+                    if resp.status == 200:
+                        return await resp.read()
+            except aiohttp.ClientError:
+                continue
     return None
 
 
-def classify_image(image_data: bytes) -> dict:
-    """Send image to Haiku Vision for classification."""
-    b64 = base64.b64encode(image_data).decode("utf-8")
-
-    response = client.messages.create(
-        model="claude-haiku-4-5-20251001",
-        max_tokens=200,
-        messages=[
-            {
-                "role": "user",
-                "content": [
-                    {
-                        "type": "image",
-                        "source": {
-                            "type": "base64",
-                            "media_type": "image/jpeg",
-                            "data": b64,
-                        },
-                    },
-                    {"type": "text", "text": CLASSIFY_PROMPT},
-                ],
-            }
-        ],
-    )
+async def download_first_images(paths: dict[int, str]) -> dict[int, bytes]:
+    """Download first-page images concurrently. Returns {feature_id: bytes}."""
+    sem = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+    ssl_ctx = ssl.create_default_context(cafile=certifi.where())
+    connector = aiohttp.TCPConnector(limit=DOWNLOAD_CONCURRENCY, ssl=ssl_ctx)
+    timeout = aiohttp.ClientTimeout(total=60)
+    headers = {
+        "apikey": SUPABASE_SERVICE_KEY,
+        "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}",
+    }
+
+    async with aiohttp.ClientSession(
+        connector=connector, timeout=timeout, headers=headers
+    ) as session:
+        fids = list(paths)
+        blobs = await asyncio.gather(*(_download(session, sem, paths[f]) for f in fids))
+    return {fid: blob for fid, blob in zip(fids, blobs) if blob}
+
 
-    text = response.content[0].text.strip()
-    # Parse JSON from response
+def downscale_image(image_data: bytes) -> bytes:
+    """Shrink to MAX_IMAGE_EDGE on the long side and re-encode as JPEG.
+
+    Returns the original bytes if Pillow is missing, the image can't be
+    decoded, or re-encoding wouldn't make it smaller.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return image_data  # No PIL — send as-is
     try:
-        # Find JSON in response
-        start = text.index("{")
-        end = text.rindex("}") + 1
-        return json.loads(text[start:end])
-    except (ValueError, json.JSONDecodeError):
-        return {
-            "classification": "UNKNOWN",
-            "section_header": None,
-            "reason": f"Parse error: {text[:100]}",
+        img = Image.open(io.BytesIO(image_data))
+        img.thumbnail((MAX_IMAGE_EDGE, MAX_IMAGE_EDGE), Image.LANCZOS)
+        buf = io.BytesIO()
+        img.convert("RGB").save(buf, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+    except Exception:
+        return image_data
+    small = buf.getvalue()
+    return small if len(small) < len(image_data) else image_data
+
+
+# Static instructions as the system prompt; the user turn is just the image.
+# No cache_control: the prompt is far below Haiku's minimum cacheable prefix.
+SYSTEM = [{"type": "text", "text": CLASSIFY_PROMPT}]
+
+
+def _image_message(image_data: bytes) -> list[dict]:
+    """User message content: the first-page image (instructions live in SYSTEM)."""
+    b64 = base64.b64encode(downscale_image(image_data)).decode("utf-8")
+    return [
+        {
+            "role": "user",
+            "content": [
+                {
+                    "type": "image",
+                    "source": {
+                        "type": "base64",
+                        "media_type": "image/jpeg",
+                        "data": b64,
+                    },
+                },
+            ],
+        }
+    ]
+
+
+def parse_classification(message) -> dict:
+    """Classification dict from the forced classify_article tool call."""
+    for block in message.content:
+        if block.type == "tool_use":
+            return dict(block.input)
+    return {
+        "classification": "UNKNOWN",
+        "section_header": None,
+        "reason": f"No tool call (stop_reason={message.stop_reason})",
+    }
+
+
+def submit_images_batch(images: dict[int, bytes]) -> str:
+    """Submit one Message Batches job classifying every image; returns its id.
+
+    The id and the submitted feature ids are saved to PENDING_BATCH_PATH
+    before polling starts, so a batch that is already paid for can still be
+    collected after a crash or Ctrl-C (see main).
+
+    Args:
+        images: {feature_id: image bytes}
+    """
+    requests = [
+        {
+            "custom_id": f"feat-{fid}",
+            "params": {
+                "model": MODEL,
+                "max_tokens": MAX_TOKENS,
+                "system": SYSTEM,
+                "tools": [CLASSIFY_TOOL],
+                "tool_choice": TOOL_CHOICE,
+                "messages": _image_message(img),
+            },
         }
+        for fid, img in images.items()
+    ]
+
+    batch = client.messages.batches.create(requests=requests)
+    with open(PENDING_BATCH_PATH, "w") as f:
+        f.write(dumps({"batch_id": batch.id, "feature_ids": list(images)}))
+    print(f"Submitted batch {batch.id} ({len(requests)} requests)")
+    return batch.id
+
+
+def collect_images_batch(batch_id: str) -> dict[int, dict]:
+    """Poll a submitted batch until it ends and read its results.
+
+    Returns:
+        {feature_id: classification dict}; failed requests map to
+        {"error": ...} instead.
+    """
+    batch = client.messages.batches.retrieve(batch_id)
+    while batch.processing_status != "ended":
+        time.sleep(BATCH_POLL_INTERVAL)
+        batch = client.messages.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        print(f"  {batch.processing_status}: {counts.succeeded} done, "
+              f"{counts.errored} errored, {counts.processing} processing")
+
+    results = {}
+    for item in client.messages.batches.results(batch_id):
+        fid = int(item.custom_id.removeprefix("feat-"))
+        if item.result.type == "succeeded":
+            results[fid] = parse_classification(item.result.message)
+        else:
+            results[fid] = {"error": item.result.type}
+    return results
+
+
+def load_pending_batch() -> dict | None:
+    """{"batch_id", "feature_ids"} of a batch submitted but never collected, if any."""
+    if not os.path.exists(PENDING_BATCH_PATH):
+        return None
+    with open(PENDING_BATCH_PATH, "rb") as f:
+        return loads(f.read())
+
+
+def record_batch(features: list[dict], submitted, classified: dict[int, dict],
+                 results: list[dict], errors: list[dict]):
+    """Append a collected batch's classifications to the checkpoint.
+
+    Features already in results (saved before an interrupted run crashed)
+    are skipped, so collecting a batch twice never duplicates an entry.
+    Then the pending-batch marker is removed: everything it held is saved.
+    """
+    submitted = set(submitted) - {e["id"] for e in results}
+    batch_features = [f for f in features if f["id"] in submitted]
+    with open(CHECKPOINT_PATH, "a") as out:
+        for i, feat in enumerate(batch_features):
+            fid = feat["id"]
+            title = feat["title"]
+            owner = feat["owner"]
+            issue = feat["issue"]
+
+            result = classified.get(fid, {"error": "missing from batch results"})
+            if "error" in result:
+                print(f"  [{i+1}/{len(batch_features)}] #{fid} — API ERROR: {result['error']}")
+                errors.append({**feat, "error": result["error"]})
+                continue
+
+            classification = result.get("classification", "UNKNOWN")
+            section = result.get("section_header")
+            reason = result.get("reason", "")
+
+            entry = {
+                **feat,
+                "classification": classification,
+                "section_header": section,
+                "reason_llm": reason,
+            }
+            results.append(entry)
+            out.write(dumps(entry) + "\n")
+            out.flush()
+
+            marker = "KEEP" if classification == "HOME_TOUR" else "DEL "
+
+            section_str = f" [{section}]" if section else ""
+            print(
+                f"  [{i+1}/{len(batch_features)}] {marker} #{fid} \"{title}\" ({owner}, {issue}){section_str} — {reason}"
+            )
+    os.remove(PENDING_BATCH_PATH)
+
+
+def load_checkpoint(path: str = CHECKPOINT_PATH) -> list[dict]:
+    """Entries classified by earlier (possibly interrupted) runs."""
+    if not os.path.exists(path):
+        return []
+    entries = []
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                entries.append(loads(line))
+            except ValueError:
+                continue  # torn last line from a crash mid-write
+    return entries
 
 
 def main():
+    if "--clear-image-cache" in sys.argv:
+        shutil.rmtree(IMAGE_CACHE_DIR, ignore_errors=True)
+        print(f"Cleared {IMAGE_CACHE_DIR}")
+
     # Load remaining uncertain features
-    with open("data/unmatched_uncertain.json") as f:
-        all_uncertain = json.load(f)
+    with open("data/unmatched_uncertain.json", "rb") as f:
+        all_uncertain = loads(f.read())
 
+    # Resume: skip anything already in the checkpoint
+    results = load_checkpoint()
     already_handled = {4384, 7234, 6602, 6690, 5407}
+    errors = []
+
+    # A batch submitted by an interrupted run is collected, not paid for again
+    pending = load_pending_batch()
+    if pending:
+        print(f"Resuming batch {pending['batch_id']} from an interrupted run...")
+        record_batch(all_uncertain, pending["feature_ids"],
+                     collect_images_batch(pending["batch_id"]), results, errors)
+
+    already_handled |= {e["id"] for e in results}
     features = [f for f in all_uncertain if f["id"] not in already_handled]
 
+    if results:
+        print(f"Resuming: {len(results)} already classified in {CHECKPOINT_PATH}")
     print(f"Classifying {len(features)} uncertain features with Haiku Vision...")
     print()
 
-    results = []
-    home_tours = []
-    not_home_tours = []
-    errors = []
+    # First pages: local cache, then concurrent downloads for the rest;
+    # then classify them all in one batch job
+    images = {}
+    for feat in features:
+        cached = read_cached_image(feat["id"])
+        if cached:
+            images[feat["id"]] = cached
+    misses = [f["id"] for f in features if f["id"] not in images]
+    downloaded = asyncio.run(download_first_images(get_first_page_paths(misses))) if misses else {}
+    for fid, data in downloaded.items():
+        write_cached_image(fid, data)
+    images.update(downloaded)
+    print(f"First-page images: {len(images)}/{len(features)} "
+          f"({len(images) - len(downloaded)} cached, {len(downloaded)} downloaded)")
 
     for i, feat in enumerate(features):
         fid = feat["id"]
-        title = feat["title"]
-        owner = feat["owner"]
-        issue = feat["issue"]
-
-        # Download first page
-        img = get_first_image(fid)
-        if not img:
+        if fid not in images:
             print(f"  [{i+1}/{len(features)}] #{fid} — NO IMAGE, skipping")
             errors.append({**feat, "error": "no_image"})
-            continue
-
-        # Classify
-        try:
-            result = classify_image(img)
-        except Exception as e:
-            print(f"  [{i+1}/{len(features)}] #{fid} — API ERROR: {e}")
-            errors.append({**feat, "error": str(e)})
-            time.sleep(2)
-            continue
-
-        classification = result.get("classification", "UNKNOWN")
-        section = result.get("section_header")
-        reason = result.get("reason", "")
-
-        entry = {
-            **feat,
-            "classification": classification,
-            "section_header": section,
-            "reason_llm": reason,
-        }
-        results.append(entry)
-
-        if classification == "HOME_TOUR":
-            home_tours.append(entry)
-            marker = "KEEP"
-        else:
-            not_home_tours.append(entry)
-            marker = "DEL "
 
-        section_str = f" [{section}]" if section else ""
-        print(
-            f"  [{i+1}/{len(features)}] {marker} #{fid} \"{title}\" ({owner}, {issue}){section_str} — {reason}"
-        )
+    if images:
+        batch_id = submit_images_batch(images)
+        record_batch(features, images, collect_images_batch(batch_id), results, errors)
 
-        # Rate limit: ~1 req/sec is fine for Haiku
-        if (i + 1) % 50 == 0:
-            time.sleep(2)
+    # Save results (checkpoint + this run)
+    home_tours = [e for e in results if e["classification"] == "HOME_TOUR"]
+    not_home_tours = [e for e in results if e["classification"] != "HOME_TOUR"]
 
-    # Save results
     with open("data/uncertain_classified.json", "w") as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+        f.write(dumps(results, indent=True))
 
     with open("data/uncertain_keep.json", "w") as f:
-        json.dump(home_tours, f, indent=2, ensure_ascii=False)
+        f.write(dumps(home_tours, indent=True))
 
     with open("data/uncertain_delete.json", "w") as f:
-        json.dump(not_home_tours, f, indent=2, ensure_ascii=False)
+        f.write(dumps(not_home_tours, indent=True))
 
     print()
     print(f"=== RESULTS ===")
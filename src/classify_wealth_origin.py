@@ -15,11 +15,19 @@ Usage:
     python3 src/classify_wealth_origin.py --dry-run      # Preview names only
     python3 src/classify_wealth_origin.py --limit 10     # First 10 only
     python3 src/classify_wealth_origin.py --report       # Print results summary
+    python3 src/classify_wealth_origin.py --concurrency 20  # Parallel Opus calls (default 10)
+    python3 src/classify_wealth_origin.py --batch        # Message Batches API (~50% cheaper, async)
+    python3 src/classify_wealth_origin.py --batch-id msgbatch_...  # Collect a submitted batch
+    python3 src/classify_wealth_origin.py --no-cache     # Re-ask even for cached people
+    python3 src/classify_wealth_origin.py --resume       # Skip people already in earlier result files
 
 Cost estimate (Opus): ~$0.02-0.04 per name, ~$8-15 for 400 names.
 """
 
 import argparse
+import asyncio
+import glob
+import itertools
 import json
 import os
 import random
@@ -27,20 +35,44 @@ import sys
 import time
 from collections import Counter
 from datetime import datetime, timezone
+from typing import Literal
 
 import anthropic
 from dotenv import load_dotenv
+from pydantic import BaseModel, ValidationError, field_validator
 from supabase import create_client
 
+try:
+    import json_repair
+except ImportError:  # optional: fall back to scanning for the first decodable value
+    json_repair = None
+
+sys.path.insert(0, os.path.dirname(__file__))
+from rate_limit import AnthropicLimiter, backoff_delay, parse_retry_after
+from llm_cache import ResponseCache, make_key
+from fast_json import dumps, loads
+
 load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
 
 MODEL = "claude-opus-4-6"
-MODEL_PRICING = {"input": 15.0, "output": 75.0}  # per 1M tokens
-
-# Output file for results (also stored in Supabase)
+MAX_TOKENS = 500  # per person
+DEFAULT_CONCURRENCY = 10
+PEOPLE_PER_CALL = 8  # people packed into one request (cuts RPM and repeated instructions)
+MAX_ATTEMPTS = 5  # per API call, for 429 / 5xx / connection errors
+RETRY_MAX_DELAY = 30  # seconds, cap for jittered exponential backoff
+BATCH_POLL_INTERVAL = 30  # seconds between Message Batches status polls
+# per 1M tokens; cache writes bill at 1.25x input, cache reads at 0.1x
+MODEL_PRICING = {"input": 15.0, "output": 75.0, "cache_write": 18.75, "cache_read": 1.5}
+
+# Output file for results (also stored in Supabase: wealth_classifications)
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "wealth_origin")
 
-CLASSIFICATION_PROMPT = """You are classifying the wealth origin of a person who was featured as a homeowner in Architectural Digest magazine. This person has been confirmed as having a documented connection to Jeffrey Epstein's social network (appearing in DOJ records, flight logs, black book, etc.).
+# Exact-match response cache; bump PROMPT_VERSION whenever a prompt changes
+CACHE_PATH = os.path.join(OUTPUT_DIR, "response_cache.db")
+PROMPT_VERSION = "v1"
+MODEL_FIELDS = ("classification", "confidence", "rationale", "wealth_source", "notable_facts")
+
+CLASSIFICATION_INSTRUCTIONS = """You are classifying the wealth origin of a person who was featured as a homeowner in Architectural Digest magazine. This person has been confirmed as having a documented connection to Jeffrey Epstein's social network (appearing in DOJ records, flight logs, black book, etc.).
 
 Based on your knowledge of this person, classify their wealth origin into ONE of these categories:
 
@@ -60,25 +92,17 @@ Important guidelines:
 - "Old money" requires GENERATIONAL wealth — the fortune predates them by at least one generation
 - Consider the PRIMARY source of the wealth that funded the AD-featured home
 - Be honest when you're uncertain — use UNKNOWN rather than guessing
-- Provide a brief rationale (1-2 sentences) explaining your classification
-
-Person to classify:
-Name: {name}
-Category in AD: {category}
-Location: {location}
-Year featured: {year}
-Designer: {designer}
+- Provide a brief rationale (1-2 sentences) explaining your classification"""
 
-Respond in this exact JSON format:
-{{
+CLASSIFICATION_FORMAT = """{
   "classification": "SELF_MADE" | "OLD_MONEY" | "MARRIED_INTO" | "MIXED" | "UNKNOWN",
   "confidence": "HIGH" | "MEDIUM" | "LOW",
   "rationale": "Brief explanation",
   "wealth_source": "Brief description of primary wealth source (e.g., 'Hedge fund founder', 'Vanderbilt heir', 'Married to real estate developer')",
   "notable_facts": "Any relevant context about their social positioning"
-}}"""
+}"""
 
-BASELINE_PROMPT = """You are classifying the wealth origin of a person who was featured as a homeowner in Architectural Digest magazine. This person is NOT known to be connected to Jeffrey Epstein — they are part of the general AD homeowner population.
+BASELINE_INSTRUCTIONS = """You are classifying the wealth origin of a person who was featured as a homeowner in Architectural Digest magazine. This person is NOT known to be connected to Jeffrey Epstein — they are part of the general AD homeowner population.
 
 Based on your knowledge of this person, classify their wealth origin into ONE of these categories:
 
@@ -95,23 +119,29 @@ Based on your knowledge of this person, classify their wealth origin into ONE of
 Important guidelines:
 - Base this on publicly available biographical information
 - Be honest when you're uncertain — use UNKNOWN rather than guessing
-- Provide a brief rationale (1-2 sentences)
-
-Person to classify:
-Name: {name}
-Category in AD: {category}
-Location: {location}
-Year featured: {year}
-Designer: {designer}
+- Provide a brief rationale (1-2 sentences)"""
 
-Respond in this exact JSON format:
-{{
+BASELINE_FORMAT = """{
   "classification": "SELF_MADE" | "OLD_MONEY" | "MARRIED_INTO" | "MIXED" | "UNKNOWN",
   "confidence": "HIGH" | "MEDIUM" | "LOW",
   "rationale": "Brief explanation",
   "wealth_source": "Brief description of primary wealth source",
   "notable_facts": "Any relevant context"
-}}"""
+}"""
+
+# Static prompt pieces, joined once at import: (cacheable head, single-person
+# tail, group tail) keyed by is_baseline. Only the person lines vary per call.
+PROMPT_PIECES = {
+    is_baseline: (
+        f"{instructions}\n\n",
+        f"\n\nRespond in this exact JSON format:\n{fmt}",
+        f" objects, one per person in the order listed, each in this format:\n{fmt}",
+    )
+    for is_baseline, instructions, fmt in (
+        (False, CLASSIFICATION_INSTRUCTIONS, CLASSIFICATION_FORMAT),
+        (True, BASELINE_INSTRUCTIONS, BASELINE_FORMAT),
+    )
+}
 
 
 def get_supabase():
@@ -120,6 +150,73 @@ def get_supabase():
     return create_client(url, key)
 
 
+FEATURE_COLUMNS = (
+    "id, homeowner_name, subject_category, location_city, "
+    "location_state, location_country, designer_name, issue_id"
+)
+IN_CHUNK = 200  # ids per in_() filter, well under PostgREST URL limits
+RESULTS_TABLE = "wealth_classifications"  # migrations/007
+WRITE_CHUNK = 500  # rows per upsert
+
+
+def name_key(name):
+    """Normalised name for dedupe/exclusion; casefold also folds non-ASCII case."""
+    return (name or "").strip().casefold()
+
+
+def fetch_by_ids(sb, table, columns, ids):
+    """{id: row} for the given ids, one in_() query per IN_CHUNK ids."""
+    ids = list(dict.fromkeys(i for i in ids if i is not None))
+    rows = {}
+    for i in range(0, len(ids), IN_CHUNK):
+        chunk = ids[i : i + IN_CHUNK]
+        batch = sb.table(table).select(columns).in_("id", chunk).execute()
+        for row in batch.data:
+            rows[row["id"]] = row
+    return rows
+
+
+def fetch_issue_years(sb, features):
+    """{issue_id: year} for every issue referenced by the features."""
+    issues = fetch_by_ids(sb, "issues", "id, year", (f["issue_id"] for f in features))
+    return {iid: row["year"] for iid, row in issues.items()}
+
+
+def iter_named_features(sb, page_size=1000, source="features"):
+    """Yield every feature with a homeowner_name, keyset-paginated on id.
+
+    source may be the non_confirmed_features view (migrations/006) to have
+    the server drop confirmed features.
+
+    Each page is an index seek (id > last_id ORDER BY id LIMIT n) rather
+    than an OFFSET scan that re-walks every earlier row.
+    """
+    last_id = None
+    while True:
+        q = (sb.table(source).select(FEATURE_COLUMNS)
+             .not_.is_("homeowner_name", "null").order("id").limit(page_size))
+        if last_id is not None:
+            q = q.gt("id", last_id)
+        batch = q.execute()
+        if not batch.data:
+            break
+        yield from batch.data
+        last_id = batch.data[-1]["id"]
+        if len(batch.data) < page_size:
+            break
+
+
+def reservoir_sample(items, k, rng):
+    """Uniform random sample of k items from a stream in O(k) memory (Algorithm R)."""
+    reservoir = []
+    for i, item in enumerate(items):
+        if i < k:
+            reservoir.append(item)
+        elif (j := rng.randint(0, i)) < k:
+            reservoir[j] = item
+    return reservoir
+
+
 def fetch_confirmed_homeowners(sb, limit=None):
     """Fetch all confirmed Epstein-connected homeowners with feature context."""
     # Get confirmed dossiers
@@ -140,27 +237,22 @@ def fetch_confirmed_homeowners(sb, limit=None):
     seen_names = set()
     unique_dossiers = []
     for d in all_dossiers:
-        name = (d.get("subject_name") or "").strip().lower()
+        name = name_key(d.get("subject_name"))
         if name and name not in seen_names:
             seen_names.add(name)
             unique_dossiers.append(d)
 
-    # Fetch feature context for each
+    # Feature context + issue years in bulk (two in_() passes, not 2 per dossier)
+    feat_by_id = fetch_by_ids(sb, "features", FEATURE_COLUMNS,
+                              (d["feature_id"] for d in unique_dossiers))
+    year_by_issue = fetch_issue_years(sb, feat_by_id.values())
+
     results = []
     for d in unique_dossiers:
-        feat = sb.table("features").select(
-            "id, homeowner_name, subject_category, location_city, "
-            "location_state, location_country, designer_name, issue_id"
-        ).eq("id", d["feature_id"]).execute()
-
-        if not feat.data:
+        f = feat_by_id.get(d["feature_id"])
+        if not f:
             continue
-
-        f = feat.data[0]
-
-        # Get issue year
-        issue = sb.table("issues").select("year").eq("id", f["issue_id"]).execute()
-        year = issue.data[0]["year"] if issue.data else None
+        year = year_by_issue.get(f["issue_id"])
 
         location_parts = [f.get("location_city"), f.get("location_state"), f.get("location_country")]
         location = ", ".join(p for p in location_parts if p) or "Unknown"
@@ -183,196 +275,704 @@ def fetch_confirmed_homeowners(sb, limit=None):
     return results
 
 
-def fetch_baseline_homeowners(sb, count=200, exclude_names=None):
-    """Fetch a random sample of non-Epstein AD homeowners for comparison."""
-    exclude_names = exclude_names or set()
+def _baseline_features(sb, seed, limit):
+    """Named features without a confirmed dossier, in a seeded random order.
 
-    # Get features that do NOT have a confirmed dossier
-    # First get all confirmed feature IDs
-    confirmed = sb.table("dossiers").select("feature_id").eq(
-        "editor_verdict", "CONFIRMED"
-    ).execute()
-    confirmed_ids = set(d["feature_id"] for d in confirmed.data)
+    Sampled server-side by the sample_non_confirmed_features RPC
+    (migrations/006), which anti-joins confirmed dossiers and returns at most
+    `limit` rows. Falls back to streaming the non_confirmed_features view
+    through a reservoir, so only `limit` rows are ever held in memory.
+    """
+    try:
+        return sb.rpc("sample_non_confirmed_features", {
+            "n": limit, "seed": str(seed),
+        }).execute().data or []
+    except Exception as e:
+        print(f"  sample_non_confirmed_features unavailable ({e}); scanning non_confirmed_features")
+        rng = random.Random(seed)
+        named = (f for f in iter_named_features(sb, source="non_confirmed_features")
+                 if name_key(f.get("homeowner_name")) not in ("anonymous", "unknown", ""))
+        rows = reservoir_sample(named, limit, rng)
+        rng.shuffle(rows)  # the reservoir keeps early rows in scan order
+        return rows
+
+
+def _baseline_person(f, issue_years):
+    location_parts = [f.get("location_city"), f.get("location_state"), f.get("location_country")]
+    return {
+        "feature_id": f["id"],
+        "name": f.get("homeowner_name") or "Unknown",
+        "category": f.get("subject_category") or "Unknown",
+        "location": ", ".join(p for p in location_parts if p) or "Unknown",
+        "year": issue_years.get(f["issue_id"]),
+        "designer": f.get("designer_name") or "Unknown",
+        "group": "baseline",
+    }
 
-    # Fetch named features
-    all_features = []
-    offset = 0
-    while True:
-        batch = sb.table("features").select(
-            "id, homeowner_name, subject_category, location_city, "
-            "location_state, location_country, designer_name, issue_id"
-        ).not_.is_("homeowner_name", "null").range(offset, offset + 999).execute()
-        all_features.extend(batch.data)
-        if len(batch.data) < 1000:
-            break
-        offset += 1000
 
-    # Filter out confirmed and anonymous
-    baseline_pool = []
-    seen_names = set()
-    for f in all_features:
-        if f["id"] in confirmed_ids:
-            continue
-        name = (f.get("homeowner_name") or "").strip()
-        name_lower = name.lower()
-        if not name or name_lower in ("anonymous", "unknown", ""):
-            continue
-        if name_lower in exclude_names or name_lower in seen_names:
+def iter_baseline_candidates(sb, *, exclude_names=(), seed=42, limit=1000):
+    """Yield baseline people (one per distinct name) in a reproducible random order.
+
+    Draws at most `limit` features, skips anonymous and excluded names
+    (compared by name_key), and looks up issue years IN_CHUNK people at a time so a
+    consumer that stops early doesn't pay for the rest.
+    """
+    seen_names = set(exclude_names)
+    pending = []
+    for f in _baseline_features(sb, seed, limit):
+        name = name_key(f.get("homeowner_name"))
+        if name in ("anonymous", "unknown", "") or name in seen_names:
             continue
-        seen_names.add(name_lower)
-        baseline_pool.append(f)
+        seen_names.add(name)
+        pending.append(f)
+        if len(pending) == IN_CHUNK:
+            issue_years = fetch_issue_years(sb, pending)
+            yield from (_baseline_person(p, issue_years) for p in pending)
+            pending = []
+    if pending:
+        issue_years = fetch_issue_years(sb, pending)
+        yield from (_baseline_person(p, issue_years) for p in pending)
+
+
+def fetch_baseline_homeowners(sb, count=200, exclude_names=None, seed=42):
+    """Fetch a random sample of non-Epstein AD homeowners for comparison."""
+    # Oversample so the name filters still leave `count`
+    candidates = iter_baseline_candidates(
+        sb, exclude_names=exclude_names or (), seed=seed, limit=count * 5)
+    return list(itertools.islice(candidates, count))
 
-    # Random sample
-    random.seed(42)  # Reproducible
-    sample = random.sample(baseline_pool, min(count, len(baseline_pool)))
 
-    # Enrich with issue year
-    results = []
-    issue_cache = {}
-    for f in sample:
-        iid = f["issue_id"]
-        if iid not in issue_cache:
-            issue = sb.table("issues").select("year").eq("id", iid).execute()
-            issue_cache[iid] = issue.data[0]["year"] if issue.data else None
+def _person_block(person):
+    get = person.get
+    return (f"Name: {person['name']}\n"
+            f"Category in AD: {get('category', 'Unknown')}\n"
+            f"Location: {get('location', 'Unknown')}\n"
+            f"Year featured: {get('year', 'Unknown')}\n"
+            f"Designer: {get('designer', 'Unknown')}")
 
-        location_parts = [f.get("location_city"), f.get("location_state"), f.get("location_country")]
-        location = ", ".join(p for p in location_parts if p) or "Unknown"
 
-        results.append({
-            "feature_id": f["id"],
-            "name": f.get("homeowner_name") or "Unknown",
-            "category": f.get("subject_category") or "Unknown",
-            "location": location,
-            "year": issue_cache[iid],
-            "designer": f.get("designer_name") or "Unknown",
-            "group": "baseline",
-        })
+def _prompt_parts(people, is_baseline):
+    """(static instructions, per-call text) for one or several people."""
+    head, single_tail, group_tail = PROMPT_PIECES[bool(is_baseline)]
+    if len(people) == 1:
+        return head, f"Person to classify:\n{_person_block(people[0])}{single_tail}"
+    listing = "\n\n".join(f"Person {i}:\n{_person_block(p)}" for i, p in enumerate(people, 1))
+    return head, (f"People to classify ({len(people)}):\n\n{listing}"
+                  f"\n\nRespond with a JSON array of exactly {len(people)}{group_tail}")
 
-    return results
 
+def build_prompt(person, is_baseline=False):
+    """Fill the confirmed or baseline prompt for one person."""
+    return "".join(_prompt_parts([person], is_baseline))
 
-def classify_person(client, person, is_baseline=False):
-    """Call Opus to classify a single person's wealth origin."""
-    prompt_template = BASELINE_PROMPT if is_baseline else CLASSIFICATION_PROMPT
-    prompt = prompt_template.format(
-        name=person["name"],
-        category=person.get("category", "Unknown"),
-        location=person.get("location", "Unknown"),
-        year=person.get("year", "Unknown"),
-        designer=person.get("designer", "Unknown"),
-    )
 
-    response = client.messages.create(
-        model=MODEL,
-        max_tokens=500,
-        messages=[{"role": "user", "content": prompt}],
-    )
+def build_group_prompt(people, is_baseline=False):
+    """One prompt covering several people; the answer is a JSON array in order."""
+    return "".join(_prompt_parts(people, is_baseline))
+
+
+def build_content(people, is_baseline=False):
+    """User-message content for one or several people.
+
+    Not marked for prompt caching: the shared instructions are far below
+    the model's minimum cacheable prefix, so a cache_control marker would
+    never produce a cache hit.
+    """
+    return [{"type": "text", "text": "".join(_prompt_parts(people, is_baseline))}]
 
-    # Parse JSON from response
+
+def _response_text(response):
+    """Model text with any markdown code fence stripped."""
     text = response.content[0].text.strip()
-    # Strip markdown code fences if present
     if text.startswith("```"):
         text = text.split("\n", 1)[1] if "\n" in text else text[3:]
         if text.endswith("```"):
             text = text[:-3]
         text = text.strip()
+    return text
+
+
+class ClassificationResult(BaseModel):
+    """Schema one model answer must satisfy before it is recorded or cached."""
+
+    classification: Literal["SELF_MADE", "OLD_MONEY", "MARRIED_INTO", "MIXED", "UNKNOWN"]
+    confidence: Literal["HIGH", "MEDIUM", "LOW"]
+    rationale: str
+    wealth_source: str = ""
+    notable_facts: str = ""
+
+    @field_validator("classification", "confidence", mode="before")
+    @classmethod
+    def _upper(cls, value):
+        return value.strip().upper() if isinstance(value, str) else value
+
+    @field_validator("rationale", "wealth_source", "notable_facts", mode="before")
+    @classmethod
+    def _none_to_empty(cls, value):
+        return "" if value is None else value
 
+
+def _load_json(text):
+    """Best-effort JSON from model text: strict, then repaired, then first embedded value."""
     try:
-        result = json.loads(text)
+        return json.loads(text)
     except json.JSONDecodeError:
-        # Try to extract JSON from the response
-        import re
-        match = re.search(r'\{[^{}]*\}', text, re.DOTALL)
-        if match:
-            result = json.loads(match.group())
-        else:
-            result = {
-                "classification": "UNKNOWN",
-                "confidence": "LOW",
-                "rationale": f"Failed to parse response: {text[:200]}",
-                "wealth_source": "",
-                "notable_facts": "",
-            }
+        pass
+    if json_repair is not None:
+        return json_repair.loads(text)
+    # raw_decode handles nested braces, unlike a {[^{}]*} regex
+    decoder = json.JSONDecoder()
+    for i, ch in enumerate(text):
+        if ch in "{[":
+            try:
+                return decoder.raw_decode(text, i)[0]
+            except json.JSONDecodeError:
+                continue
+    return None
 
-    # Track cost
-    usage = response.usage
-    cost = (usage.input_tokens * MODEL_PRICING["input"] / 1_000_000 +
+
+def _validate(answer, text):
+    """Validated classification dict, or the UNKNOWN fallback if it doesn't fit the schema."""
+    try:
+        return ClassificationResult.model_validate(answer).model_dump()
+    except ValidationError:
+        return _parse_failure(text)
+
+
+def _parse_failure(text):
+    return {
+        "classification": "UNKNOWN",
+        "confidence": "LOW",
+        "rationale": f"Failed to parse response: {text[:200]}",
+        "wealth_source": "",
+        "notable_facts": "",
+    }
+
+
+def _cache_tokens(usage):
+    """(cache write, cache read) input tokens; absent on uncached responses."""
+    return (getattr(usage, "cache_creation_input_tokens", None) or 0,
+            getattr(usage, "cache_read_input_tokens", None) or 0)
+
+
+def _usage_cost(usage):
+    cache_write, cache_read = _cache_tokens(usage)
+    return (usage.input_tokens * MODEL_PRICING["input"] / 1_000_000 +
+            cache_write * MODEL_PRICING["cache_write"] / 1_000_000 +
+            cache_read * MODEL_PRICING["cache_read"] / 1_000_000 +
             usage.output_tokens * MODEL_PRICING["output"] / 1_000_000)
 
+
+def _input_tokens(usage):
+    """All prompt tokens the call ingested, cached or not."""
+    return usage.input_tokens + sum(_cache_tokens(usage))
+
+
+def parse_response(person, response):
+    """Merge the model's JSON classification and token cost into the person dict."""
+    text = _response_text(response)
+    result = _validate(_load_json(text), text)
+
+    usage = response.usage
     return {
         **person,
         **result,
-        "cost": cost,
-        "input_tokens": usage.input_tokens,
+        "cost": _usage_cost(usage),
+        "input_tokens": _input_tokens(usage),
         "output_tokens": usage.output_tokens,
     }
 
 
+def parse_group_response(people, response):
+    """Split a JSON-array answer back onto its people; cost is shared evenly.
+
+    Returns None when the answer isn't an array of exactly len(people)
+    items: then nothing says which answer belongs to whom.
+    """
+    text = _response_text(response)
+    answers = _load_json(text)
+    if not isinstance(answers, list) or len(answers) != len(people):
+        return None
+
+    usage = response.usage
+    k = len(people)
+    return [
+        {
+            **person,
+            **_validate(answer, text),
+            "cost": _usage_cost(usage) / k,
+            "input_tokens": _input_tokens(usage) // k,
+            "output_tokens": usage.output_tokens // k,
+        }
+        for person, answer in zip(people, answers)
+    ]
+
+
+def _is_transient(exc):
+    """Rate limits, overloads, server errors and dropped connections are worth retrying."""
+    if isinstance(exc, (anthropic.RateLimitError, anthropic.APIConnectionError)):
+        return True
+    return isinstance(exc, anthropic.APIStatusError) and exc.status_code >= 500
+
+
+def _retry_delay(exc, attempt):
+    """Server's Retry-After if it sent one, else jittered exponential backoff."""
+    response = getattr(exc, "response", None)
+    retry_after = parse_retry_after(getattr(response, "headers", None))
+    return retry_after if retry_after is not None else backoff_delay(attempt, cap=RETRY_MAX_DELAY)
+
+
+async def create_message_async(client, **params):
+    """AsyncAnthropic messages.create with retries on transient API errors."""
+    for attempt in range(MAX_ATTEMPTS):
+        try:
+            return await client.messages.create(**params)
+        except anthropic.APIError as e:
+            if not _is_transient(e) or attempt == MAX_ATTEMPTS - 1:
+                raise
+            delay = _retry_delay(e, attempt)
+            print(f"    {type(e).__name__}, retrying in {delay:.1f}s ({attempt + 1}/{MAX_ATTEMPTS})")
+            await asyncio.sleep(delay)
+
+
+_response_cache = None
+
+
+def get_response_cache():
+    """Singleton ResponseCache at CACHE_PATH."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache(CACHE_PATH)
+    return _response_cache
+
+
+def _cache_key(person, is_baseline):
+    return make_key(
+        MODEL, PROMPT_VERSION, "baseline" if is_baseline else "epstein",
+        person["name"], person.get("category", "Unknown"), person.get("location", "Unknown"),
+        person.get("year", "Unknown"), person.get("designer", "Unknown"),
+    )
+
+
+def cached_result(person, is_baseline=False):
+    """Result rebuilt from the response cache (zero cost), or None on a miss."""
+    hit = get_response_cache().get(_cache_key(person, is_baseline))
+    if hit is None:
+        return None
+    return {**person, **hit, "cost": 0, "input_tokens": 0, "output_tokens": 0, "cached": True}
+
+
+def remember_result(person, result, is_baseline=False):
+    """Store the model's answer for this person unless the response didn't parse."""
+    if str(result.get("rationale", "")).startswith("Failed to parse"):
+        return
+    get_response_cache().put(
+        _cache_key(person, is_baseline),
+        {k: result[k] for k in MODEL_FIELDS if k in result},
+    )
+
+
+async def classify_person_async(client, person, is_baseline=False, limiter=None, use_cache=True):
+    """Call Opus to classify a single person's wealth origin, paced by an AnthropicLimiter."""
+    if use_cache and (hit := cached_result(person, is_baseline)):
+        return hit
+    prompt = build_prompt(person, is_baseline)
+    est = AnthropicLimiter.estimate(prompt, MAX_TOKENS)
+    if limiter:
+        await limiter.acquire_async(est)
+    response = await create_message_async(
+        client,
+        model=MODEL,
+        max_tokens=MAX_TOKENS,
+        messages=[{"role": "user", "content": build_content([person], is_baseline)}],
+    )
+    if limiter:
+        limiter.record(est, response.usage.input_tokens + response.usage.output_tokens)
+    result = parse_response(person, response)
+    if use_cache:
+        remember_result(person, result, is_baseline)
+    return result
+
+
+async def classify_group_async(client, people, is_baseline=False, limiter=None, use_cache=True):
+    """Classify several same-group people in one request (cache hits skipped).
+
+    Falls back to the single-person prompt when only one person is left.
+    Returns results in the order of `people`.
+    """
+    results = {}
+    misses = []
+    for i, person in enumerate(people):
+        hit = cached_result(person, is_baseline) if use_cache else None
+        if hit:
+            results[i] = hit
+        else:
+            misses.append(i)
+
+    if len(misses) == 1:
+        i = misses[0]
+        results[i] = await classify_person_async(
+            client, people[i], is_baseline, limiter=limiter, use_cache=use_cache)
+    elif misses:
+        group = [people[i] for i in misses]
+        prompt = build_group_prompt(group, is_baseline)
+        max_tokens = MAX_TOKENS * len(group)
+        est = AnthropicLimiter.estimate(prompt, max_tokens)
+        if limiter:
+            await limiter.acquire_async(est)
+        response = await create_message_async(
+            client,
+            model=MODEL,
+            max_tokens=max_tokens,
+            messages=[{"role": "user", "content": build_content(group, is_baseline)}],
+        )
+        if limiter:
+            limiter.record(est, response.usage.input_tokens + response.usage.output_tokens)
+        group_results = parse_group_response(group, response)
+        if group_results is None:
+            # Malformed or short array: ask about each person on their own
+            # rather than marking the whole group UNKNOWN
+            print(f"    Group answer unusable for {len(group)} people, retrying one at a time")
+            singles = await asyncio.gather(*(
+                classify_person_async(client, p, is_baseline, limiter=limiter, use_cache=use_cache)
+                for p in group
+            ))
+            results.update(zip(misses, singles))
+        else:
+            for i, result in zip(misses, group_results):
+                if use_cache:
+                    remember_result(people[i], result, is_baseline)
+                results[i] = result
+
+    return [results[i] for i in range(len(people))]
+
+
+def _result_row(result):
+    """wealth_classifications row for a result, or None if it shouldn't be stored."""
+    if result.get("classification") == "ERROR" or not result.get("feature_id"):
+        return None
+    return {
+        "feature_id": result["feature_id"],
+        "dossier_id": result.get("dossier_id"),
+        "sample_group": result.get("group"),
+        "name": result.get("name"),
+        **{k: result.get(k) for k in MODEL_FIELDS},
+        "model": MODEL,
+        "cost": result.get("cost", 0),
+    }
+
+
+def persist_results(sb, results):
+    """Upsert results into wealth_classifications; failures are reported, not raised.
+
+    Returns the number of rows written.
+    """
+    rows = [row for r in results if (row := _result_row(r))]
+    written = 0
+    for i in range(0, len(rows), WRITE_CHUNK):
+        chunk = rows[i : i + WRITE_CHUNK]
+        try:
+            sb.table(RESULTS_TABLE).upsert(chunk, on_conflict="feature_id").execute()
+            written += len(chunk)
+        except Exception as e:
+            print(f"  {RESULTS_TABLE} upsert failed ({len(chunk)} rows): {e}")
+    return written
+
+
+async def classify_all(people, out, concurrency=DEFAULT_CONCURRENCY, stop_after=None,
+                       use_cache=True, group_size=PEOPLE_PER_CALL, sb=None):
+    """Classify people concurrently, streaming each result to `out` as it lands.
+
+    People are packed group_size per request (same group only), and up to
+    `concurrency` Opus calls run at once, paced by an AnthropicLimiter
+    (ANTHROPIC_RPM / ANTHROPIC_TPM). A single writer task drains a queue so
+    jsonl lines are written in completion order, one at a time. If
+    stop_after is set, people not yet started are skipped once that many
+    non-UNKNOWN classifications have come back. With `sb`, each result is
+    also upserted to wealth_classifications in a background thread, so the
+    database write overlaps the next API call.
+
+    Returns the list of result dicts (errors included as classification=ERROR).
+    """
+    client = anthropic.AsyncAnthropic()
+    limiter = AnthropicLimiter.from_env()
+    sem = asyncio.Semaphore(concurrency)
+    queue = asyncio.Queue()
+    stop = asyncio.Event()
+    results = []
+    total = len(people)
+
+    # Same-group chunks, since confirmed and baseline use different prompts
+    groups = []
+    for label in dict.fromkeys(p.get("group") for p in people):
+        members = [p for p in people if p.get("group") == label]
+        groups += [members[i : i + group_size] for i in range(0, len(members), group_size)]
+
+    async def worker(group):
+        async with sem:
+            if stop.is_set():
+                return
+            try:
+                group_results = await classify_group_async(
+                    client, group,
+                    is_baseline=(group[0].get("group") == "baseline"),
+                    limiter=limiter,
+                    use_cache=use_cache,
+                )
+            except Exception as e:
+                group_results = [{
+                    **person,
+                    "classification": "ERROR",
+                    "confidence": "LOW",
+                    "rationale": str(e),
+                    "cost": 0,
+                } for person in group]
+            for result in group_results:
+                await queue.put(result)
+
+    persists = []
+
+    async def writer():
+        non_unknown = 0
+        while (result := await queue.get()) is not None:
+            results.append(result)
+            out.write(dumps(result) + "\n")
+            out.flush()
+            if sb is not None:
+                persists.append(asyncio.create_task(asyncio.to_thread(persist_results, sb, [result])))
+
+            group_label = "EPSTEIN" if result.get("group") == "epstein" else "BASELINE"
+            cls = result.get("classification", "?")
+            conf = result.get("confidence", "?")
+            if cls == "ERROR":
+                status = f"ERROR: {result.get('rationale')}"
+            else:
+                status = f"→ {cls:<15} ({conf})"
+            print(f"  [{len(results)}/{total}] [{group_label}] {result['name']:<35}  {status}")
+
+            if cls not in ("UNKNOWN", "ERROR"):
+                non_unknown += 1
+                if stop_after and non_unknown >= stop_after and not stop.is_set():
+                    print(f"\n  Reached target! {non_unknown} non-UNKNOWN classified.")
+                    stop.set()
+
+    writer_task = asyncio.create_task(writer())
+    await asyncio.gather(*(worker(g) for g in groups))
+    await queue.put(None)
+    await writer_task
+    await asyncio.gather(*persists)
+    return results
+
+
+def _custom_id(person, i):
+    """Batch custom_id (must match [a-zA-Z0-9_-]{1,64})."""
+    if person.get("dossier_id"):
+        return f"dossier_{person['dossier_id']}"
+    return f"baseline_{i}"
+
+
+def run_batch(people, out, use_cache=True, sb=None):
+    """Batch-mode driver: answer cache hits locally, submit the rest, collect.
+
+    With `sb`, the results are upserted to wealth_classifications once collected.
+    """
+    results, misses = [], []
+    for p in people:
+        hit = cached_result(p, p.get("group") == "baseline") if use_cache else None
+        if hit:
+            results.append(hit)
+            out.write(dumps(hit) + "\n")
+        else:
+            misses.append(p)
+    if results:
+        print(f"  {len(results)} answered from cache")
+    if misses:
+        results += collect_batch(submit_batch(misses), out, use_cache=use_cache)
+    if sb is not None:
+        print(f"  Stored {persist_results(sb, results)} rows in {RESULTS_TABLE}")
+    return results
+
+
+def submit_batch(people):
+    """Submit every person as one Message Batches job.
+
+    The {custom_id: person} map is saved next to the results so a batch can
+    be collected later with --batch-id even if this process exits.
+    Returns the batch id.
+    """
+    client = anthropic.Anthropic()
+    by_id = {_custom_id(p, i): p for i, p in enumerate(people)}
+    requests = [
+        {
+            "custom_id": cid,
+            "params": {
+                "model": MODEL,
+                "max_tokens": MAX_TOKENS,
+                "messages": [{
+                    "role": "user",
+                    "content": build_content([p], is_baseline=(p.get("group") == "baseline")),
+                }],
+            },
+        }
+        for cid, p in by_id.items()
+    ]
+    batch = client.messages.batches.create(requests=requests)
+    with open(os.path.join(OUTPUT_DIR, f"batch_{batch.id}.json"), "w") as f:
+        f.write(dumps(by_id))
+    print(f"Submitted batch {batch.id} ({len(requests)} requests)")
+    return batch.id
+
+
+def collect_batch(batch_id, out, use_cache=True):
+    """Poll a submitted batch until it ends, then write its results to `out`.
+
+    Batch pricing is half the synchronous rate, so recorded cost is halved.
+    Returns the list of result dicts (errors included as classification=ERROR).
+    """
+    client = anthropic.Anthropic()
+    with open(os.path.join(OUTPUT_DIR, f"batch_{batch_id}.json"), "rb") as f:
+        by_id = loads(f.read())
+
+    batch = client.messages.batches.retrieve(batch_id)
+    while batch.processing_status != "ended":
+        counts = batch.request_counts
+        print(f"  {batch.processing_status}: {counts.succeeded} done, "
+              f"{counts.errored} errored, {counts.processing} processing")
+        time.sleep(BATCH_POLL_INTERVAL)
+        batch = client.messages.batches.retrieve(batch_id)
+
+    results = []
+    for item in client.messages.batches.results(batch_id):
+        person = by_id[item.custom_id]
+        if item.result.type == "succeeded":
+            result = parse_response(person, item.result.message)
+            result["cost"] /= 2
+            if use_cache:
+                remember_result(person, result, person.get("group") == "baseline")
+        else:
+            result = {
+                **person,
+                "classification": "ERROR",
+                "confidence": "LOW",
+                "rationale": f"batch request {item.result.type}",
+                "cost": 0,
+            }
+        results.append(result)
+        out.write(dumps(result) + "\n")
+    out.flush()
+    print(f"  Collected {len(results)} results from batch {batch_id}")
+    return results
+
+
+def read_jsonl(path):
+    """All records of a results jsonl, read in one go and decoded from bytes."""
+    with open(path, "rb") as f:
+        return [loads(line) for line in f.read().splitlines() if line.strip()]
+
+
+def _result_key(r):
+    """Identity of a classified person across runs: dossier for confirmed, else feature."""
+    if r.get("dossier_id"):
+        return ("dossier", r["dossier_id"])
+    return ("feature", r.get("feature_id"))
+
+
+def load_done(output_dir=OUTPUT_DIR):
+    """{person key: result} from every classification_*.jsonl, newest file winning.
+
+    ERROR results are left out so resumed runs retry them.
+    """
+    done = {}
+    for path in sorted(glob.glob(os.path.join(output_dir, "classification_*.jsonl"))):
+        for r in read_jsonl(path):
+            if r.get("classification") != "ERROR":
+                done[_result_key(r)] = r
+    return done
+
+
+REPORT_CATEGORIES = ("SELF_MADE", "OLD_MONEY", "MARRIED_INTO", "MIXED", "UNKNOWN")
+_ROW_FMT = "    %-15s %3d  (%5.1f%%)  %s"
+_COMPARE_FMT = "    %-15s  Epstein: %5.1f%%  Baseline: %5.1f%%  %s %+.1fpp"
+BARS = ["█" * i for i in range(51)]  # one block per 2 percentage points
+
+
+def tally_results(results):
+    """One pass over results: (group, classification) counts, overall and confident-only.
+
+    Returns (counts, confident_counts, group_sizes, totals) where totals holds
+    cost and token sums.
+    """
+    counts = Counter()
+    confident_counts = Counter()
+    group_sizes = Counter()
+    totals = {"cost": 0.0, "input_tokens": 0, "output_tokens": 0}
+    for r in results:
+        group = r.get("group")
+        cls = r.get("classification", "UNKNOWN")
+        group_sizes[group] += 1
+        counts[group, cls] += 1
+        if r.get("confidence") in ("HIGH", "MEDIUM"):
+            confident_counts[group, cls] += 1
+        for k in totals:
+            totals[k] += r.get(k, 0)
+    return counts, confident_counts, group_sizes, totals
+
+
 def print_report(results):
     """Print a summary comparison of Epstein vs baseline wealth origins."""
-    epstein = [r for r in results if r.get("group") == "epstein"]
-    baseline = [r for r in results if r.get("group") == "baseline"]
+    counts, confident_counts, group_sizes, totals = tally_results(results)
 
     def summarize(group, label):
-        total = len(group)
+        total = group_sizes[group]
         if total == 0:
             print(f"\n  {label}: No data")
             return
 
-        counts = Counter(r.get("classification", "UNKNOWN") for r in group)
-        confident = [r for r in group if r.get("confidence") in ("HIGH", "MEDIUM")]
-        confident_counts = Counter(r.get("classification", "UNKNOWN") for r in confident)
+        n_confident = sum(n for (g, _), n in confident_counts.items() if g == group)
 
         print(f"\n  {label} (n={total}):")
         print(f"  {'─' * 50}")
 
-        categories = ["SELF_MADE", "OLD_MONEY", "MARRIED_INTO", "MIXED", "UNKNOWN"]
-        for cat in categories:
-            n = counts.get(cat, 0)
+        for cat in REPORT_CATEGORIES:
+            n = counts[group, cat]
             pct = (n / total) * 100 if total > 0 else 0
-            bar = "█" * int(pct / 2)
-            print(f"    {cat:<15} {n:>3}  ({pct:5.1f}%)  {bar}")
+            print(_ROW_FMT % (cat, n, pct, BARS[int(pct / 2)]))
 
-        print(f"\n    High/Medium confidence only (n={len(confident)}):")
-        for cat in categories:
+        print(f"\n    High/Medium confidence only (n={n_confident}):")
+        for cat in REPORT_CATEGORIES:
             if cat == "UNKNOWN":
                 continue
-            n = confident_counts.get(cat, 0)
-            pct = (n / len(confident)) * 100 if confident else 0
-            bar = "█" * int(pct / 2)
-            print(f"    {cat:<15} {n:>3}  ({pct:5.1f}%)  {bar}")
+            n = confident_counts[group, cat]
+            pct = (n / n_confident) * 100 if n_confident else 0
+            print(_ROW_FMT % (cat, n, pct, BARS[int(pct / 2)]))
 
     print("\n" + "=" * 60)
     print("  WEALTH ORIGIN CLASSIFICATION — SUMMARY")
     print("=" * 60)
 
-    summarize(epstein, "EPSTEIN ORBIT")
-    summarize(baseline, "AD BASELINE")
+    summarize("epstein", "EPSTEIN ORBIT")
+    summarize("baseline", "AD BASELINE")
 
     # Chi-square-style comparison
-    if epstein and baseline:
+    if group_sizes["epstein"] and group_sizes["baseline"]:
         print(f"\n  {'─' * 50}")
         print("  COMPARISON (High/Med confidence, excl. UNKNOWN):")
         print(f"  {'─' * 50}")
 
-        ep_conf = [r for r in epstein if r.get("confidence") in ("HIGH", "MEDIUM") and r.get("classification") != "UNKNOWN"]
-        bl_conf = [r for r in baseline if r.get("confidence") in ("HIGH", "MEDIUM") and r.get("classification") != "UNKNOWN"]
+        def known(group):
+            return sum(n for (g, cls), n in confident_counts.items() if g == group and cls != "UNKNOWN")
 
-        if ep_conf and bl_conf:
-            for cat in ["SELF_MADE", "OLD_MONEY", "MARRIED_INTO", "MIXED"]:
-                ep_n = sum(1 for r in ep_conf if r.get("classification") == cat)
-                bl_n = sum(1 for r in bl_conf if r.get("classification") == cat)
-                ep_pct = (ep_n / len(ep_conf)) * 100
-                bl_pct = (bl_n / len(bl_conf)) * 100
+        ep_total, bl_total = known("epstein"), known("baseline")
+        if ep_total and bl_total:
+            for cat in REPORT_CATEGORIES[:-1]:
+                ep_pct = (confident_counts["epstein", cat] / ep_total) * 100
+                bl_pct = (confident_counts["baseline", cat] / bl_total) * 100
                 diff = ep_pct - bl_pct
                 arrow = "▲" if diff > 0 else "▼" if diff < 0 else "="
-                print(f"    {cat:<15}  Epstein: {ep_pct:5.1f}%  Baseline: {bl_pct:5.1f}%  {arrow} {abs(diff):+.1f}pp")
+                print(_COMPARE_FMT % (cat, ep_pct, bl_pct, arrow, abs(diff)))
 
     # Total cost
-    total_cost = sum(r.get("cost", 0) for r in results)
-    total_input = sum(r.get("input_tokens", 0) for r in results)
-    total_output = sum(r.get("output_tokens", 0) for r in results)
-    print(f"\n  Cost: ${total_cost:.2f} ({total_input:,} in / {total_output:,} out tokens)")
+    print(f"\n  Cost: ${totals['cost']:.2f} ({totals['input_tokens']:,} in / {totals['output_tokens']:,} out tokens)")
     print("=" * 60)
 
 
@@ -388,52 +988,64 @@ def main():
                         help="Print report from existing results file")
     parser.add_argument("--topup-baseline", type=int, default=0,
                         help="Classify more baseline names to reach N non-UNKNOWN total (e.g. --topup-baseline 200)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Parallel Opus requests (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--group-size", type=int, default=PEOPLE_PER_CALL,
+                        help=f"People per request (default: {PEOPLE_PER_CALL}; 1 = one call each)")
+    parser.add_argument("--batch", action="store_true",
+                        help="Submit via the Message Batches API (~50%% cheaper, up to 24h)")
+    parser.add_argument("--batch-id", default=None,
+                        help="Collect results of an already-submitted batch")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore and don't update the local response cache")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip people already classified in earlier result files")
     args = parser.parse_args()
 
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
     output_file = os.path.join(OUTPUT_DIR, f"classification_{timestamp}.jsonl")
 
+    # Collect mode: results of a batch submitted by an earlier --batch run
+    if args.batch_id:
+        with open(output_file, "w") as f:
+            results = collect_batch(args.batch_id, f, use_cache=not args.no_cache)
+        print(f"  Stored {persist_results(get_supabase(), results)} rows in {RESULTS_TABLE}")
+        print(f"\nDone! Results saved to {output_file}")
+        print_report(results)
+        return
+
     sb = get_supabase()
 
     # Report mode: just print from latest results file
     if args.report:
-        import glob
         files = sorted(glob.glob(os.path.join(OUTPUT_DIR, "classification_*.jsonl")))
         if not files:
             print("No results files found.")
             return
         latest = files[-1]
         print(f"Reading: {latest}")
-        results = []
-        with open(latest) as f:
-            for line in f:
-                results.append(json.loads(line))
+        results = read_jsonl(latest)
         print_report(results)
         return
 
     # Top-up mode: classify more baseline names to reach target non-UNKNOWN count
     if args.topup_baseline > 0:
-        import glob as globmod
         target = args.topup_baseline
 
         # Load existing results
-        files = sorted(globmod.glob(os.path.join(OUTPUT_DIR, "classification_*.jsonl")))
+        files = sorted(glob.glob(os.path.join(OUTPUT_DIR, "classification_*.jsonl")))
         if not files:
             print("No existing results to top up from.")
             return
         latest = files[-1]
         print(f"Loading existing results from: {latest}")
 
-        existing = []
-        with open(latest) as f:
-            for line in f:
-                existing.append(json.loads(line))
+        existing = read_jsonl(latest)
 
         # Count current non-UNKNOWN baseline
         existing_baseline = [r for r in existing if r.get("group") == "baseline"]
         non_unknown = [r for r in existing_baseline if r.get("classification") != "UNKNOWN"]
-        already_classified_names = set(r["name"].strip().lower() for r in existing_baseline)
 
         print(f"  Existing baseline: {len(existing_baseline)} total, {len(non_unknown)} non-UNKNOWN")
         needed = target - len(non_unknown)
@@ -445,61 +1057,12 @@ def main():
         oversample = int(needed * 1.6)  # ~40% buffer for UNKNOWNs
         print(f"  Need {needed} more non-UNKNOWN. Sampling ~{oversample} new names...")
 
-        # Get confirmed names to exclude
+        # Exclude confirmed names and everyone already in the baseline
         confirmed = fetch_confirmed_homeowners(sb)
-        exclude = set(p["name"].strip().lower() for p in confirmed) | already_classified_names
-
-        # Fetch larger pool with different seed
-        all_features = []
-        offset = 0
-        while True:
-            batch = sb.table("features").select(
-                "id, homeowner_name, subject_category, location_city, "
-                "location_state, location_country, designer_name, issue_id"
-            ).not_.is_("homeowner_name", "null").range(offset, offset + 999).execute()
-            all_features.extend(batch.data)
-            if len(batch.data) < 1000:
-                break
-            offset += 1000
-
-        confirmed_ids = set(d["feature_id"] for d in confirmed)
-        pool = []
-        seen = set()
-        for f in all_features:
-            if f["id"] in confirmed_ids:
-                continue
-            name = (f.get("homeowner_name") or "").strip()
-            name_lower = name.lower()
-            if not name or name_lower in ("anonymous", "unknown", ""):
-                continue
-            if name_lower in exclude or name_lower in seen:
-                continue
-            seen.add(name_lower)
-            pool.append(f)
-
-        random.seed(99)  # Different seed from original run
-        random.shuffle(pool)
-        candidates = pool[:oversample]
-
-        # Enrich with issue year
-        issue_cache = {}
-        new_people = []
-        for f in candidates:
-            iid = f["issue_id"]
-            if iid not in issue_cache:
-                issue = sb.table("issues").select("year").eq("id", iid).execute()
-                issue_cache[iid] = issue.data[0]["year"] if issue.data else None
-            location_parts = [f.get("location_city"), f.get("location_state"), f.get("location_country")]
-            location = ", ".join(p for p in location_parts if p) or "Unknown"
-            new_people.append({
-                "feature_id": f["id"],
-                "name": f.get("homeowner_name") or "Unknown",
-                "category": f.get("subject_category") or "Unknown",
-                "location": location,
-                "year": issue_cache[iid],
-                "designer": f.get("designer_name") or "Unknown",
-                "group": "baseline",
-            })
+        exclude = frozenset(name_key(p["name"]) for p in itertools.chain(confirmed, existing_baseline))
+
+        # Different seed from the original run
+        new_people = fetch_baseline_homeowners(sb, count=oversample, exclude_names=exclude, seed=99)
 
         if args.dry_run:
             print(f"\n  DRY RUN — would classify {len(new_people)} new baseline names")
@@ -510,44 +1073,24 @@ def main():
             return
 
         # Classify until we hit target
-        client = anthropic.Anthropic()
-        new_results = []
-        new_non_unknown = 0
-        total_cost = 0.0
-
         print(f"\nClassifying up to {len(new_people)} new baseline names (stopping at {needed} non-UNKNOWN)...\n")
 
         with open(output_file, "w") as out:
             # Write all existing results first
             for r in existing:
-                out.write(json.dumps(r, default=str) + "\n")
-
-            for i, person in enumerate(new_people, 1):
-                print(f"  [{i}/{len(new_people)}] [BASELINE] {person['name']:<35}", end="", flush=True)
-                try:
-                    result = classify_person(client, person, is_baseline=True)
-                    new_results.append(result)
-                    total_cost += result.get("cost", 0)
-                    cls = result.get("classification", "?")
-                    conf = result.get("confidence", "?")
-                    print(f"  → {cls:<15} ({conf})")
-                    out.write(json.dumps(result, default=str) + "\n")
-                    out.flush()
-
-                    if cls != "UNKNOWN":
-                        new_non_unknown += 1
-                        if new_non_unknown >= needed:
-                            print(f"\n  Reached target! {new_non_unknown} new non-UNKNOWN classified.")
-                            break
-
-                    time.sleep(0.5)
-                except Exception as e:
-                    print(f"  ERROR: {e}")
-                    error_result = {**person, "classification": "ERROR", "confidence": "LOW", "rationale": str(e), "cost": 0}
-                    new_results.append(error_result)
-                    out.write(json.dumps(error_result, default=str) + "\n")
-                    out.flush()
-                    time.sleep(2)
+                out.write(dumps(r) + "\n")
+
+            if args.batch:
+                # No early stop in a batch — the oversampled set goes in whole
+                new_results = run_batch(new_people, out, use_cache=not args.no_cache, sb=sb)
+            else:
+                new_results = asyncio.run(classify_all(
+                    new_people, out, concurrency=args.concurrency, stop_after=needed,
+                    use_cache=not args.no_cache, group_size=args.group_size, sb=sb))
+
+        new_non_unknown = sum(1 for r in new_results
+                              if r.get("classification") not in ("UNKNOWN", "ERROR"))
+        total_cost = sum(r.get("cost", 0) for r in new_results)
 
         print(f"\n  Added {len(new_results)} new ({new_non_unknown} non-UNKNOWN)")
         print(f"  Cost: ${total_cost:.2f}")
@@ -566,13 +1109,21 @@ def main():
     # Fetch baseline if requested
     baseline = []
     if args.baseline > 0:
-        exclude = set(p["name"].strip().lower() for p in confirmed)
+        exclude = frozenset(name_key(p["name"]) for p in confirmed)
         print(f"Fetching {args.baseline} random baseline homeowners...")
         baseline = fetch_baseline_homeowners(sb, count=args.baseline, exclude_names=exclude)
         print(f"  Found {len(baseline)} baseline homeowners")
 
     all_people = confirmed + baseline
 
+    # Resume: carry earlier answers into this run's file instead of re-asking
+    carried = []
+    if args.resume:
+        done = load_done()
+        carried = [done[k] for p in all_people if (k := _result_key(p)) in done]
+        all_people = [p for p in all_people if _result_key(p) not in done]
+        print(f"  Resuming: {len(carried)} already classified, {len(all_people)} to go")
+
     if args.dry_run:
         print(f"\n{'─' * 60}")
         print(f"DRY RUN — would classify {len(all_people)} people")
@@ -591,50 +1142,20 @@ def main():
         return
 
     # Classify
-    client = anthropic.Anthropic()
-    results = []
-    total_cost = 0.0
-
-    print(f"\nClassifying {len(all_people)} homeowners with {MODEL}...")
+    mode = "Message Batches API" if args.batch else f"{args.concurrency} concurrent"
+    print(f"\nClassifying {len(all_people)} homeowners with {MODEL} ({mode})...")
     print(f"Output: {output_file}\n")
 
     with open(output_file, "w") as f:
-        for i, person in enumerate(all_people, 1):
-            group_label = "EPSTEIN" if person.get("group") == "epstein" else "BASELINE"
-            print(f"  [{i}/{len(all_people)}] [{group_label}] {person['name']:<35}", end="", flush=True)
-
-            try:
-                result = classify_person(
-                    client, person,
-                    is_baseline=(person.get("group") == "baseline")
-                )
-                results.append(result)
-                total_cost += result.get("cost", 0)
-
-                cls = result.get("classification", "?")
-                conf = result.get("confidence", "?")
-                print(f"  → {cls:<15} ({conf})")
-
-                # Write line
-                f.write(json.dumps(result, default=str) + "\n")
-                f.flush()
-
-                # Rate limiting — be gentle with Opus
-                time.sleep(0.5)
-
-            except Exception as e:
-                print(f"  ERROR: {e}")
-                error_result = {
-                    **person,
-                    "classification": "ERROR",
-                    "confidence": "LOW",
-                    "rationale": str(e),
-                    "cost": 0,
-                }
-                results.append(error_result)
-                f.write(json.dumps(error_result, default=str) + "\n")
-                f.flush()
-                time.sleep(2)  # Back off on error
+        for r in carried:
+            f.write(dumps(r) + "\n")
+        if args.batch:
+            results = run_batch(all_people, f, use_cache=not args.no_cache, sb=sb)
+        else:
+            results = asyncio.run(classify_all(
+                all_people, f, concurrency=args.concurrency, use_cache=not args.no_cache,
+                group_size=args.group_size, sb=sb))
+        results = carried + results
 
     print(f"\nDone! Results saved to {output_file}")
     print_report(results)
@@ -14,19 +14,32 @@ Usage:
     python3 src/cross_reference.py --status        # Show cross-reference progress
 """
 
-import json
+import bisect
+import functools
+import itertools
 import os
 import re
+import sqlite3
 import sys
 from datetime import datetime
 from dotenv import load_dotenv
 from supabase import create_client
 
+from fast_json import dumps, loads
+
+try:
+    import ahocorasick
+except ImportError:  # optional: find_whole_words falls back to one regex per term
+    ahocorasick = None
+
 load_dotenv()
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
 BLACK_BOOK_PATH = os.path.join(DATA_DIR, "black_book.txt")
 XREF_DIR = os.path.join(DATA_DIR, "cross_references")
+RESULTS_PATH = os.path.join(XREF_DIR, "results.jsonl")
+LEGACY_RESULTS_PATH = os.path.join(XREF_DIR, "results.json")  # pre-JSONL, read only
+CHECKED_DB_PATH = os.path.join(XREF_DIR, "xref.db")
 COSTS_DIR = os.path.join(DATA_DIR, "costs")
 
 MODEL_PRICING = {
@@ -40,41 +53,65 @@ key = os.getenv("SUPABASE_ANON_KEY")
 supabase = create_client(url, key)
 
 # Names to skip (not real people, generic words, or known false positives)
-SKIP_NAMES = {"anonymous", "unknown", "none", "n/a", "", "others", "and others",
-              "the", "brothers", "hotel", "studio", "associates", "group",
-              "house", "estate", "residence", "apartment", "villa", "palace",
-              "design", "modern", "classic", "gallery"}
+SKIP_NAMES = frozenset({"anonymous", "unknown", "none", "n/a", "", "others", "and others",
+                        "the", "brothers", "hotel", "studio", "associates", "group",
+                        "house", "estate", "residence", "apartment", "villa", "palace",
+                        "design", "modern", "classic", "gallery"})
 
 # Words that indicate a name is a business, hotel, or landmark — not a person
-NON_PERSON_INDICATORS = {"hotel", "palace", "resort", "inn", "lodge", "manor",
-                         "club", "foundation", "museum", "gallery", "studio",
-                         "associates", "group", "corporation", "corp", "inc",
-                         "llc", "ltd", "company", "partners", "estate",
-                         "chateau", "castle", "tower", "plaza", "center",
-                         "institute", "academy", "church", "temple",
-                         "ranch", "farm", "vineyard", "winery"}
+NON_PERSON_INDICATORS = frozenset({"hotel", "palace", "resort", "inn", "lodge", "manor",
+                                   "club", "foundation", "museum", "gallery", "studio",
+                                   "associates", "group", "corporation", "corp", "inc",
+                                   "llc", "ltd", "company", "partners", "estate",
+                                   "chateau", "castle", "tower", "plaza", "center",
+                                   "institute", "academy", "church", "temple",
+                                   "ranch", "farm", "vineyard", "winery"})
 
 # DOJ context keywords that suggest a person is staff/contractor, not a principal
-DOJ_UNRELATED_ROLES = {"contractor", "construction", "electrician", "plumber",
-                       "maintenance", "security", "guard", "driver", "chef",
-                       "housekeeper", "gardener", "landscaper", "painter",
-                       "carpenter", "mechanic", "worker", "employee", "staff"}
+DOJ_UNRELATED_ROLES = frozenset({"contractor", "construction", "electrician", "plumber",
+                                 "maintenance", "security", "guard", "driver", "chef",
+                                 "housekeeper", "gardener", "landscaper", "painter",
+                                 "carpenter", "mechanic", "worker", "employee", "staff"})
 
 # Minimum name length to search (avoids matching single first names like "Kevin")
 MIN_NAME_LENGTH = 2  # Must have at least first + last name
 
 
 def load_black_book():
-    """Load the Black Book text file into memory."""
-    if not os.path.exists(BLACK_BOOK_PATH):
+    """Load the Black Book text file into memory.
+
+    The text is read once per file version and the same str is returned on
+    every later call, so the per-book caches below (_lowered, _token_lines,
+    ...) hit on identity instead of re-hashing and comparing megabytes.
+    """
+    try:
+        st = os.stat(BLACK_BOOK_PATH)
+    except FileNotFoundError:
         print("Warning: Black Book text file not found at", BLACK_BOOK_PATH)
         return ""
-    with open(BLACK_BOOK_PATH) as f:
+    return _read_book(BLACK_BOOK_PATH, st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=2)
+def _read_book(path, mtime_ns, size):
+    with open(path) as f:
         return f.read()
 
 
-def search_black_book(name, book_text):
-    """Search the Black Book for a name. Returns match details or None."""
+def _surname_in_index(name, book_index):
+    """True if the name's surname could appear in a book with these word tokens."""
+    parts = name.strip().split()
+    if not parts:
+        return False
+    tokens = _TOKEN_RE.findall(parts[-1].lower())
+    return all(t in book_index for t in tokens)
+
+
+def search_black_book(name, book_text, found=None):
+    """Search the Black Book for a name. Returns match details or None.
+
+    `found` is passed through to _search_single_name (see find_whole_words).
+    """
     if not book_text or not name:
         return None
 
@@ -89,13 +126,17 @@ def search_black_book(name, book_text):
 
     results = []
     for individual in individual_names:
-        matches = _search_single_name(individual, book_text)
+        matches = _search_single_name(individual, book_text, found=found)
         if matches:
             results.extend(matches)
 
     return results if results else None
 
 
+_LEADING_ARTICLE = re.compile(r"^(The|the)\s+")
+_TRAILING_QUALIFIER = re.compile(r",?\s*(and others|et al\.?)$", re.IGNORECASE)
+
+
 def split_names(name):
     """Split compound names into individuals, filtering out non-name words.
 
@@ -103,12 +144,30 @@ def split_names(name):
     - "Jane & Max Gottschalk" → ["Jane Gottschalk", "Max Gottschalk"]
     - "Kevin and Nicole" → [] (no last name, filtered out)
     - "Tom Kundig, Jamie Bush" → ["Tom Kundig", "Jamie Bush"]
+
+    Results are memoized per name; callers get a fresh list each time.
     """
+    return list(_split_names(name))
+
+
+def _is_capitalized_word(word):
+    """One ASCII word, capital then lowercase: the [A-Z][a-z]+ of "Last, First"."""
+    return len(word) > 1 and word.isascii() and word.isalpha() and word[0].isupper() and word[1:].islower()
+
+
+def _looks_like_last_first(name):
+    """True for a single "Last, First" name, which must not be split on its comma."""
+    last, sep, first = name.partition(", ")
+    return bool(sep) and _is_capitalized_word(last) and _is_capitalized_word(first)
+
+
+@functools.lru_cache(maxsize=4096)
+def _split_names(name):
     # Strip leading articles
-    name = re.sub(r"^(The|the)\s+", "", name)
+    name = _LEADING_ARTICLE.sub("", name)
 
     # Strip trailing qualifiers like "and others", "et al"
-    name = re.sub(r",?\s*(and others|et al\.?)$", "", name, flags=re.IGNORECASE)
+    name = _TRAILING_QUALIFIER.sub("", name)
 
     # Handle "First & First Last" pattern
     name = name.replace(" and ", " & ")
@@ -124,55 +183,211 @@ def split_names(name):
                 first_parts = parts[0].strip().split()
                 if len(first_parts) == 1:
                     first_names[0] = f"{first_parts[0]} {last_name}"
-                return _filter_names(first_names)
+                return _filter_names_cached(tuple(first_names))
             # Both parts are single words (e.g., "Kevin & Nicole") — no last name
-            return _filter_names([parts[0].strip(), parts[1].strip()])
+            return _filter_names_cached((parts[0].strip(), parts[1].strip()))
 
     # Handle comma-separated names
-    if ", " in name and not re.match(r"^[A-Z][a-z]+, [A-Z][a-z]+$", name):
+    if ", " in name and not _looks_like_last_first(name):
         # Multiple names separated by commas (but not "Last, First" format)
-        return _filter_names([n.strip() for n in name.split(",") if n.strip()])
+        return _filter_names_cached(tuple(n.strip() for n in name.split(",") if n.strip()))
 
-    return _filter_names([name])
+    return _filter_names_cached((name,))
 
 
 def _filter_names(names):
     """Remove non-name entries from a list of names."""
+    return list(_filter_names_cached(tuple(names)))
+
+
+@functools.lru_cache(maxsize=4096)
+def _filter_names_cached(names):
     filtered = []
     for n in names:
-        if n.lower() in SKIP_NAMES:
+        lowered = n.lower()
+        if lowered in SKIP_NAMES:
             continue
-        words = n.split()
+        words = lowered.split()
         if len(words) < MIN_NAME_LENGTH:
             continue
         # Skip if any word in the name is a skip word (e.g., "Danaos brothers")
-        if any(w.lower() in SKIP_NAMES for w in words):
+        if any(w in SKIP_NAMES for w in words):
             continue
         filtered.append(n)
-    return filtered
+    return tuple(filtered)
+
+
+@functools.lru_cache(maxsize=8)
+def _lowered(text):
+    """Lowercased copy of a text, computed once per distinct book.
+
+    Matching against the lowered text with a lowered pattern avoids
+    re.IGNORECASE, which is much slower over a text the size of the book.
+    """
+    return text.lower()
+
+
+@functools.lru_cache(maxsize=8)
+def _line_pairs(text):
+    """(original lines, lowered lines) of a text; indices line up."""
+    return text.split("\n"), _lowered(text).split("\n")
+
+
+@functools.lru_cache(maxsize=8)
+def _line_offsets(text):
+    """Start offset of every line within the lowered text, for bisecting a hit to its line."""
+    lowered_lines = _line_pairs(text)[1]
+    return [0, *itertools.accumulate(len(line) + 1 for line in lowered_lines[:-1])]
+
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+@functools.lru_cache(maxsize=8)
+def _token_lines(text):
+    """Inverted index of a text: lowercased word token -> indices of lines containing it.
+
+    A whole-word match of a term lies on one line, and every \\w+ run in the
+    term is a whole token there, so only lines holding the term's rarest
+    token need to be searched.
+    """
+    index = {}
+    for i, line in enumerate(_line_pairs(text)[1]):
+        for token in set(_TOKEN_RE.findall(line)):
+            index.setdefault(token, []).append(i)
+    return index
+
+
+@functools.lru_cache(maxsize=4096)
+def _compiled(term):
+    """Case-folded whole-word pattern for a search term."""
+    return re.compile(r'\b' + re.escape(term.lower()) + r'\b')
 
 
 def _word_boundary_search(term, text):
-    """Check if term appears as a whole word (not substring) in text."""
-    pattern = r'\b' + re.escape(term) + r'\b'
-    return re.search(pattern, text, re.IGNORECASE)
+    """Check if term appears as a whole word (not substring) in text.
+
+    Looks the term's tokens up in the text's _token_lines index and only
+    runs the regex over lines holding its rarest token.
+    """
+    tokens = _TOKEN_RE.findall(term.lower())
+    if not tokens:
+        return _compiled(term).search(_lowered(text))
+    index = _token_lines(text)
+    line_ids = min((index.get(t, ()) for t in tokens), key=len)
+    lowered_lines = _line_pairs(text)[1]
+    pattern = _compiled(term)
+    for i in line_ids:
+        if match := pattern.search(lowered_lines[i]):
+            return match
+    return None
+
+
+def candidate_terms(name):
+    """Every term _search_single_name may look up for one individual's name."""
+    parts = name.strip().split()
+    if len(parts) < MIN_NAME_LENGTH:
+        return []
+    terms = [name]
+    last_name, first_name = parts[-1], parts[0]
+    if len(last_name) > 3:
+        terms.append(f"{last_name}, {first_name}")
+        if len(last_name) >= 5:
+            terms.append(last_name)
+    return terms
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+
+def _at_boundary(text, i):
+    """Regex \\b at position i: word-ness differs on either side."""
+    before = i > 0 and _is_word_char(text[i - 1])
+    after = i < len(text) and _is_word_char(text[i])
+    return before != after
+
+
+# Terms per alternation regex; long alternations backtrack badly, small chunks don't
+ALTERNATION_CHUNK = 25
+
+
+def _alternation_hits(keys, lowered):
+    """Whole-word hits of lowercased keys, scanning with one regex per chunk of terms.
+
+    finditer never reports overlapping matches, so a term hidden under another
+    one's match (e.g. "smith" inside "john smith") is missed on the first
+    pass; a chunk is rescanned with only its unfound terms until a pass finds
+    nothing new.
+    """
+    hits = set()
+    ordered = sorted(keys)
+    for i in range(0, len(ordered), ALTERNATION_CHUNK):
+        remaining = set(ordered[i:i + ALTERNATION_CHUNK])
+        while remaining:
+            pattern = re.compile(r"\b(?:" + "|".join(map(re.escape, sorted(remaining))) + r")\b")
+            new = {m.group() for m in pattern.finditer(lowered)}
+            if not new:
+                break
+            hits |= new
+            remaining -= new
+    return hits
 
 
-def _search_single_name(name, book_text):
+def find_whole_words(terms, text):
+    """Lowercased subset of terms that occur as whole words in text.
+
+    One Aho-Corasick pass over the lowered text finds every term at once
+    when pyahocorasick is installed; otherwise the terms are scanned as
+    regex alternations, ALTERNATION_CHUNK terms per pattern. Pass the
+    result to search_black_book as found=lambda t: t.lower() in hits to
+    batch many names.
+    """
+    keys = {t.lower() for t in terms if t}
+    if not keys or not text:
+        return set()
+    lowered = _lowered(text)
+    if ahocorasick is None:
+        return _alternation_hits(keys, lowered)
+
+    automaton = ahocorasick.Automaton()
+    for k in keys:
+        automaton.add_word(k, k)
+    automaton.make_automaton()
+    hits = set()
+    for end, k in automaton.iter(lowered):
+        start = end - len(k) + 1
+        if k not in hits and _at_boundary(lowered, start) and _at_boundary(lowered, end + 1):
+            hits.add(k)
+    return hits
+
+
+def _search_single_name(name, book_text, found=None):
     """Search for a single name in the Black Book.
 
     Uses word-boundary matching to avoid substring false positives
     (e.g., "Bush" matching "Bushnell", "Sultana" matching "Sultanate").
+    `found(term)` replaces the per-term regex scan when hits were already
+    computed for a whole batch of names with find_whole_words().
     """
     parts = name.strip().split()
     if len(parts) < MIN_NAME_LENGTH:
         # Skip single-word names (first name only, generic words)
         return None
 
+    if found is None:
+        # Every strategy needs the surname as a whole word, so a surname with
+        # a token the book never contains can't match: one dict probe per token
+        if not _surname_in_index(name, _token_lines(book_text)):
+            return None
+
+        def found(term):
+            return _word_boundary_search(term, book_text)
+
     matches = []
 
     # Strategy 1: Full name search (word boundary)
-    if _word_boundary_search(name, book_text):
+    if found(name):
         context = _get_context(name, book_text)
         matches.append({"query": name, "match_type": "full_name", "context": context})
 
@@ -184,13 +399,13 @@ def _search_single_name(name, book_text):
         if len(last_name) > 3:
             # Check for "Last, First" format (common in the book) — high confidence
             pattern = f"{last_name}, {first_name}"
-            if _word_boundary_search(pattern, book_text):
+            if found(pattern):
                 context = _get_context(pattern, book_text)
                 matches.append({"query": pattern, "match_type": "last_first", "context": context})
             # Only fall back to last-name-only if the last name is uncommon (5+ chars)
             # and we haven't found a better match
             elif not matches and len(last_name) >= 5:
-                if _word_boundary_search(last_name, book_text):
+                if found(last_name):
                     context = _get_context(last_name, book_text)
                     matches.append({"query": last_name, "match_type": "last_name_only", "context": context})
 
@@ -198,82 +413,157 @@ def _search_single_name(name, book_text):
 
 
 def _get_context(search_term, text, context_lines=5):
-    """Get surrounding context for a match in the text."""
-    lines = text.split("\n")
+    """Get surrounding context for a match in the text.
+
+    The first occurrence is found with one str.find over the cached lowered
+    text and mapped to its line by bisecting the cached line offsets.
+    """
     search_lower = search_term.lower()
+    if "\n" in search_lower:
+        return None  # a match never spans lines
+    pos = _lowered(text).find(search_lower)
+    if pos < 0:
+        return None
 
-    for i, line in enumerate(lines):
-        if search_lower in line.lower():
-            start = max(0, i - 1)
-            end = min(len(lines), i + context_lines)
-            return "\n".join(lines[start:end]).strip()
+    lines = _line_pairs(text)[0]
+    i = bisect.bisect_right(_line_offsets(text), pos) - 1
+    start = max(0, i - 1)
+    end = min(len(lines), i + context_lines)
+    return "\n".join(lines[start:end]).strip()
+
+
+def _scan(table, columns, page_size=1000):
+    """Every row of a table/view, keyset-paginated on id (no silent max-rows cap)."""
+    rows = []
+    last_id = None
+    while True:
+        q = supabase.table(table).select(columns).order("id").limit(page_size)
+        if last_id is not None:
+            q = q.gt("id", last_id)
+        batch = q.execute().data
+        rows.extend(batch)
+        if len(batch) < page_size:
+            return rows
+        last_id = batch[-1]["id"]
 
-    return None
+
+def _is_skipped(feature):
+    name = feature.get("homeowner_name")
+    return not name or name.strip().lower() in SKIP_NAMES
 
 
 def get_unchecked_features():
     """Get features from Supabase that haven't been cross-referenced yet.
 
-    Primary: Uses cross_references table in Supabase (one row per checked feature).
-    Fallback: Uses local results.json if cross_references table not available.
+    Primary: the features_unchecked view (migrations/008), which anti-joins
+    features against cross_references server-side.
+    Fallback: local results (results.jsonl) if the view is not available.
 
-    A feature is considered "checked" if it has a row in cross_references OR
-    has no homeowner_name / name is in SKIP_NAMES.
+    Returns (unchecked features, number of checked features). A feature is
+    considered "checked" if it has a cross-reference OR has no
+    homeowner_name / name is in SKIP_NAMES. Only ids and names of candidates
+    are downloaded; the checked number comes from an exact count of features.
     """
-    # Get all features from Supabase (source of truth)
-    result = supabase.table("features").select("*").execute()
-    features = result.data
-
-    # Try Supabase cross_references table first
-    has_xref_ids = set()
     try:
-        from db import get_features_without_xref
-        unchecked_from_db = get_features_without_xref()
-        # Build checked set from features NOT in unchecked list
-        unchecked_ids = {f["id"] for f in unchecked_from_db}
-        # Features that don't need checking (no name or skip-listed)
-        skip_ids = set(
-            f["id"] for f in features
-            if not f.get("homeowner_name") or f["homeowner_name"].strip().lower() in SKIP_NAMES
-        )
-        checked_ids = {f["id"] for f in features if f["id"] not in unchecked_ids} | skip_ids
-        unchecked = [f for f in features if f["id"] not in checked_ids]
-        return unchecked, checked_ids
-    except Exception:
-        pass
+        candidates = _scan("features_unchecked", "id, homeowner_name")
+        total = supabase.table("features").select("id", count="exact", head=True).execute().count
+    except Exception as e:
+        print(f"  features_unchecked unavailable ({e}); using local results")
+    else:
+        unchecked = [f for f in candidates if not _is_skipped(f)]
+        return unchecked, (total or 0) - len(unchecked)
 
-    # Fallback: local results.json
-    os.makedirs(XREF_DIR, exist_ok=True)
-    results_path = os.path.join(XREF_DIR, "results.json")
-    has_result_ids = set()
-    if os.path.exists(results_path):
-        with open(results_path) as f:
-            results = json.load(f)
-        for r in results:
-            has_result_ids.add(r["feature_id"])
-
-    skip_ids = set(
-        f["id"] for f in features
-        if not f.get("homeowner_name") or f["homeowner_name"].strip().lower() in SKIP_NAMES
-    )
+    # Fallback: local results
+    features = _scan("features", "id, homeowner_name")
+    has_result_ids = {r["feature_id"] for r in load_results()}
+    unchecked = [f for f in features if f["id"] not in has_result_ids and not _is_skipped(f)]
+    return unchecked, len(features) - len(unchecked)
 
-    truly_done = has_result_ids | skip_ids
-    unchecked = [f for f in features if f["id"] not in truly_done]
-    checked_ids = truly_done
 
-    return unchecked, checked_ids
+def load_results():
+    """All local results: the legacy results.json array, then results.jsonl."""
+    results = []
+    if os.path.exists(LEGACY_RESULTS_PATH):
+        with open(LEGACY_RESULTS_PATH, "rb") as f:
+            results.extend(loads(f.read()))
+    if os.path.exists(RESULTS_PATH):
+        with open(RESULTS_PATH, "rb") as f:
+            results.extend(loads(line) for line in f if line.strip())
+    return results
+
+
+def update_results(update_fn):
+    """Rewrite the local results with update_fn(records).
+
+    update_fn gets load_results() and can modify the list in place or return
+    a new one. Everything is written back to results.jsonl under the same
+    file lock cross_reference_all appends with, so no appended row is lost,
+    and the legacy results.json, now folded in, is removed.
+    """
+    from agents.base import update_jsonl_locked
+
+    def _update(records):
+        results = []
+        if os.path.exists(LEGACY_RESULTS_PATH):
+            with open(LEGACY_RESULTS_PATH, "rb") as f:
+                results.extend(loads(f.read()))
+        results.extend(records)
+        updated = update_fn(results)
+        return results if updated is None else updated
+
+    update_jsonl_locked(RESULTS_PATH, _update)
+    if os.path.exists(LEGACY_RESULTS_PATH):
+        os.remove(LEGACY_RESULTS_PATH)
+
+
+def _checked_db():
+    """Connection to the checked-ids store, creating the table on first use."""
+    os.makedirs(XREF_DIR, exist_ok=True)
+    conn = sqlite3.connect(CHECKED_DB_PATH)
+    conn.execute("CREATE TABLE IF NOT EXISTS checked (id INTEGER PRIMARY KEY)")
+    return conn
 
 
 def save_checked_ids(checked_ids):
-    """Save the set of checked feature IDs."""
-    checked_path = os.path.join(XREF_DIR, "checked_features.json")
-    with open(checked_path, "w") as f:
-        json.dump(sorted(checked_ids), f)
+    """Record checked feature IDs; ids already stored are left alone."""
+    conn = _checked_db()
+    with conn:
+        conn.executemany("INSERT OR IGNORE INTO checked (id) VALUES (?)",
+                         ((fid,) for fid in checked_ids))
+    conn.close()
+
+
+def remove_checked_ids(feature_ids):
+    """Forget checked feature IDs so the next run checks them again."""
+    conn = _checked_db()
+    with conn:
+        conn.executemany("DELETE FROM checked WHERE id = ?", ((fid,) for fid in feature_ids))
+    conn.close()
+
+
+def count_checked_ids():
+    """Number of feature IDs recorded in the checked store."""
+    conn = _checked_db()
+    (count,) = conn.execute("SELECT count(*) FROM checked").fetchone()
+    conn.close()
+    return count
+
+
+def _result_row(feature, bb_matches):
+    """Local result record for one feature's Black Book search."""
+    return {
+        "feature_id": feature["id"],
+        "homeowner_name": feature["homeowner_name"],
+        "black_book_status": "match" if bb_matches else "no_match",
+        "black_book_matches": bb_matches,
+        "doj_status": "pending",  # Needs Playwright agent
+        "doj_results": None,
+    }
 
 
 def cross_reference_all():
     """Run cross-reference on all unchecked features."""
-    unchecked, checked_ids = get_unchecked_features()
+    unchecked, _ = get_unchecked_features()
 
     if not unchecked:
         print("All features have been cross-referenced.")
@@ -282,65 +572,62 @@ def cross_reference_all():
     print(f"Cross-referencing {len(unchecked)} unchecked features...\n")
 
     book_text = load_black_book()
-    results_path = os.path.join(XREF_DIR, "results.json")
-
-    # Load existing results
-    if os.path.exists(results_path):
-        with open(results_path) as f:
-            all_results = json.load(f)
-    else:
-        all_results = []
 
     black_book_hits = 0
     doj_queue = []
 
-    for feature in unchecked:
-        name = feature.get("homeowner_name")
-        feature_id = feature["id"]
+    # One pass over the book for every term any unchecked name could need
+    terms = {
+        term
+        for feature in unchecked
+        if (name := feature.get("homeowner_name")) and name.strip().lower() not in SKIP_NAMES
+        for individual in split_names(name.strip())
+        for term in candidate_terms(individual)
+    }
+    hits = find_whole_words(terms, book_text)
 
-        if not name or name.strip().lower() in SKIP_NAMES:
-            checked_ids.add(feature_id)
-            continue
+    def found(term):
+        return term.lower() in hits
 
-        print(f"  Checking: {name}")
+    # Each name's results are appended (under the results file lock) as soon
+    # as they exist, so a crash keeps what ran and a concurrent prune can't drop them
+    from agents.base import append_jsonl_locked
+    os.makedirs(XREF_DIR, exist_ok=True)
+    new_checked = []
 
-        # Black Book search
-        bb_matches = search_black_book(name, book_text)
-        bb_status = "match" if bb_matches else "no_match"
+    # The Black Book answer depends only on the name, so features sharing a
+    # homeowner are searched once and the result is fanned out to each
+    by_name = {}
+    for feature in unchecked:
+        if _is_skipped(feature):
+            new_checked.append(feature["id"])
+        else:
+            by_name.setdefault(feature["homeowner_name"], []).append(feature)
+
+    for name, features in by_name.items():
+        print(f"  Checking: {name}" + (f" ({len(features)} features)" if len(features) > 1 else ""))
+        bb_matches = search_black_book(name, book_text=book_text, found=found)
         if bb_matches:
-            black_book_hits += 1
+            black_book_hits += len(features)
             print(f"    BLACK BOOK MATCH: {bb_matches[0]['query']} ({bb_matches[0]['match_type']})")
 
-        result = {
-            "feature_id": feature_id,
-            "homeowner_name": name,
-            "black_book_status": bb_status,
-            "black_book_matches": bb_matches,
-            "doj_status": "pending",  # Needs Playwright agent
-            "doj_results": None,
-        }
-
-        all_results.append(result)
-        checked_ids.add(feature_id)
+        append_jsonl_locked(RESULTS_PATH, [_result_row(feature, bb_matches) for feature in features])
+        new_checked.extend(feature["id"] for feature in features)
 
         # Queue for DOJ search (to be done by epstein-search agent)
         doj_queue.append(name)
 
-    # Save results
-    os.makedirs(XREF_DIR, exist_ok=True)
-    with open(results_path, "w") as f:
-        json.dump(all_results, f, indent=2)
-    save_checked_ids(checked_ids)
+    save_checked_ids(new_checked)
 
     # Save DOJ queue for the epstein-search agent
     queue_path = os.path.join(XREF_DIR, "doj_search_queue.json")
-    with open(queue_path, "w") as f:
-        json.dump(doj_queue, f, indent=2)
+    with open(queue_path, "w", encoding="utf-8") as f:
+        f.write(dumps(doj_queue, indent=True))
 
     print(f"\nCross-reference complete!")
     print(f"  Black Book matches: {black_book_hits}")
     print(f"  DOJ searches queued: {len(doj_queue)} (run /epstein-search for each)")
-    print(f"  Results saved to: {results_path}")
+    print(f"  Results saved to: {RESULTS_PATH}")
 
 
 def search_single_name(name):
@@ -367,20 +654,19 @@ def search_single_name(name):
 
 def show_status():
     """Show cross-reference progress."""
-    unchecked, checked_ids = get_unchecked_features()
-    total = len(unchecked) + len(checked_ids)
+    unchecked, checked = get_unchecked_features()
+    total = len(unchecked) + checked
 
     print("=" * 50)
     print("Cross-Reference Status")
     print("=" * 50)
     print(f"  Total features: {total}")
-    print(f"  Checked: {len(checked_ids)}")
+    print(f"  Checked: {checked}")
     print(f"  Unchecked: {len(unchecked)}")
+    print(f"  Checked IDs stored locally: {count_checked_ids()}")
 
-    results_path = os.path.join(XREF_DIR, "results.json")
-    if os.path.exists(results_path):
-        with open(results_path) as f:
-            results = json.load(f)
+    results = load_results()
+    if results:
         bb_matches = sum(1 for r in results if r["black_book_status"] == "match")
         doj_pending = sum(1 for r in results if r["doj_status"] == "pending")
         print(f"\n  Black Book matches: {bb_matches}")
@@ -391,7 +677,7 @@ def show_status():
 # ── Verdict Assessment (used by Detective agent) ───────────────────
 
 # Common last names — matches on these are more likely false positives
-COMMON_LAST_NAMES = {
+COMMON_LAST_NAMES = frozenset({
     "smith", "johnson", "williams", "brown", "jones", "davis", "miller",
     "wilson", "moore", "taylor", "anderson", "thomas", "jackson", "white",
     "harris", "martin", "thompson", "garcia", "martinez", "robinson",
@@ -406,9 +692,9 @@ COMMON_LAST_NAMES = {
     "hughes", "price", "myers", "long", "foster", "sanders", "ross",
     "morales", "powell", "sullivan", "russell", "ortiz", "jenkins",
     "gutierrez", "perry", "butler", "barnes", "fisher",
-}
+})
 
-HONORIFICS_SET = {"jr", "jr.", "sr", "sr.", "ii", "iii", "iv", "esq", "esq.", "phd"}
+HONORIFICS_SET = frozenset({"jr", "jr.", "sr", "sr.", "ii", "iii", "iv", "esq", "esq.", "phd"})
 
 
 def generate_name_variations(name: str) -> list:
@@ -420,13 +706,17 @@ def generate_name_variations(name: str) -> list:
     """
     if not name or not name.strip():
         return []
+    return list(_name_variations(name))
 
+
+@functools.lru_cache(maxsize=4096)
+def _name_variations(name: str) -> tuple:
     name = name.strip()
     variations = [name]
     parts = name.split()
 
     if len(parts) < 2:
-        return variations
+        return tuple(variations)
 
     # "Last, First" format
     first_name = parts[0]
@@ -457,7 +747,7 @@ def generate_name_variations(name: str) -> list:
     if len(last_name) >= 5 and last_name not in variations:
         variations.append(last_name)
 
-    return variations
+    return tuple(variations)
 
 
 def assess_combined_verdict(name: str, bb_matches, doj_result) -> dict:
@@ -472,8 +762,7 @@ def assess_combined_verdict(name: str, bb_matches, doj_result) -> dict:
         Dict with verdict, confidence_score, rationale, false_positive_indicators, evidence_summary
     """
     bb_has_match = bool(bb_matches)
-    bb_match_types = [m.get("match_type", "") for m in (bb_matches or [])]
-    bb_best = _best_bb_match_type(bb_match_types)
+    bb_best = best_bb_match_type(bb_matches)
 
     doj_confidence = "none"
     doj_total = 0
@@ -512,13 +801,17 @@ def assess_combined_verdict(name: str, bb_matches, doj_result) -> dict:
     }
 
 
-def _best_bb_match_type(match_types: list) -> str:
-    """Return the highest-confidence match type from a list."""
-    rank = {"last_first": 4, "full_name": 3, "last_name_only": 2}
+# Black Book match types, strongest first; unknown types rank 0
+MATCH_TYPE_RANK = {"last_first": 4, "full_name": 3, "last_name_only": 2}
+
+
+def best_bb_match_type(bb_matches) -> str:
+    """Return the highest-confidence match type among Black Book matches ("" if none)."""
     best = ""
     best_rank = 0
-    for mt in match_types:
-        r = rank.get(mt, 0)
+    for m in bb_matches or ():
+        mt = m.get("match_type", "")
+        r = MATCH_TYPE_RANK.get(mt, 0)
         if r > best_rank:
             best_rank = r
             best = mt
@@ -598,12 +891,11 @@ def detect_false_positive_indicators(name: str, bb_matches, doj_result) -> list:
     if not name:
         return indicators
 
-    parts = name.strip().split()
-    last_name = parts[-1].lower() if parts else ""
-    name_words = {w.lower() for w in parts}
+    parts = name.strip().lower().split()
+    last_name = parts[-1] if parts else ""
 
     # Non-person entity check (hotel, palace, resort, etc.)
-    entity_words = name_words & NON_PERSON_INDICATORS
+    entity_words = [w for w in dict.fromkeys(parts) if w in NON_PERSON_INDICATORS]
     if entity_words:
         indicators.append(f"Name contains non-person entity words: {', '.join(entity_words)} — likely a business/hotel/landmark, not a person")
 
@@ -707,25 +999,35 @@ def _track_xref_cost(response, model=None):
         pass
 
 
-def contextual_glance(name, bb_matches, doj_result):
-    """LLM glance for ambiguous cases — returns YES/NO or None (skip LLM).
+GLANCE_MODEL = "claude-haiku-4-5-20251001"
+GLANCE_BATCH_SIZE = 20  # ambiguous names per contextual_glance_batch request
 
-    Clear NO (0 BB + DOJ none): return None → caller uses heuristic (NO)
-    Clear YES (BB last_first + DOJ high): return None → caller uses heuristic (YES)
-    Ambiguous: call Haiku with DOJ snippets for ~$0.001
+_GLANCE_RULES = """Answer YES if there is any reasonable possibility this could be the same person. This flags the name for deeper investigation — it is NOT a final verdict.
+Answer NO only if it is clearly a different person (e.g., different country, different era, clearly a contractor/vendor invoice, or a completely different context like a cultural reference).
+IMPORTANT: Being famous or a public figure is NOT a reason to say NO. Celebrities and public figures DO appear in Epstein records."""
 
-    Returns:
-        "YES", "NO", or None (caller should fall back to heuristic)
+_GLANCE_LINE_RE = re.compile(r"^\W*(\d+)\W+(YES|NO)\b", re.MULTILINE)
+
+_anthropic_client = None
+
+
+def _get_anthropic():
+    """Shared Anthropic client (one connection pool for every glance)."""
+    global _anthropic_client
+    if _anthropic_client is None:
+        import anthropic
+        _anthropic_client = anthropic.Anthropic()
+    return _anthropic_client
+
+
+def _glance_evidence(bb_matches, doj_result):
+    """(bb_context, snippet_text) for an ambiguous case, or None if the heuristic is clear.
+
+    Clear NO (0 BB + DOJ none) and clear YES (BB last_first + DOJ high)
+    never need the LLM.
     """
     bb_has_match = bool(bb_matches)
-    bb_best = ""
-    if bb_matches:
-        rank = {"last_first": 4, "full_name": 3, "last_name_only": 2}
-        bb_best = max(
-            (m.get("match_type", "") for m in bb_matches),
-            key=lambda mt: rank.get(mt, 0),
-            default=""
-        )
+    bb_best = best_bb_match_type(bb_matches)
 
     doj_confidence = "none"
     if doj_result and doj_result.get("search_successful"):
@@ -739,27 +1041,41 @@ def contextual_glance(name, bb_matches, doj_result):
     if bb_best == "last_first" and doj_confidence == "high":
         return None
 
+    # Build snippet context from DOJ results
+    snippets = []
+    if doj_result:
+        raw_snippets = doj_result.get("snippets", [])
+        for s in raw_snippets[:5]:
+            if isinstance(s, str):
+                snippets.append(s[:200])
+
+    snippet_text = "\n".join(snippets) if snippets else "(no DOJ snippets available)"
+    bb_context = ""
+    if bb_matches:
+        bb_context = f"Black Book match type: {bb_best}"
+        for m in bb_matches[:2]:
+            if m.get("context"):
+                bb_context += f"\nBB context: {m['context'][:150]}"
+    return bb_context, snippet_text
+
+
+def contextual_glance(name, bb_matches, doj_result):
+    """LLM glance for ambiguous cases — returns YES/NO or None (skip LLM).
+
+    Clear NO (0 BB + DOJ none): return None → caller uses heuristic (NO)
+    Clear YES (BB last_first + DOJ high): return None → caller uses heuristic (YES)
+    Ambiguous: call Haiku with DOJ snippets for ~$0.001
+
+    Returns:
+        "YES", "NO", or None (caller should fall back to heuristic)
+    """
+    evidence = _glance_evidence(bb_matches, doj_result)
+    if evidence is None:
+        return None
+    bb_context, snippet_text = evidence
+
     # Ambiguous — call Haiku for a glance
     try:
-        import anthropic
-        client = anthropic.Anthropic()
-
-        # Build snippet context from DOJ results
-        snippets = []
-        if doj_result:
-            raw_snippets = doj_result.get("snippets", [])
-            for s in raw_snippets[:5]:
-                if isinstance(s, str):
-                    snippets.append(s[:200])
-
-        snippet_text = "\n".join(snippets) if snippets else "(no DOJ snippets available)"
-        bb_context = ""
-        if bb_matches:
-            bb_context = f"Black Book match type: {bb_best}"
-            for m in bb_matches[:2]:
-                if m.get("context"):
-                    bb_context += f"\nBB context: {m['context'][:150]}"
-
         prompt = f"""Is the person "{name}" from Architectural Digest magazine possibly the same person referenced in these Epstein-related records?
 
 {bb_context}
@@ -767,18 +1083,15 @@ def contextual_glance(name, bb_matches, doj_result):
 DOJ search snippets:
 {snippet_text}
 
-Answer YES if there is any reasonable possibility this could be the same person. This flags the name for deeper investigation — it is NOT a final verdict.
-Answer NO only if it is clearly a different person (e.g., different country, different era, clearly a contractor/vendor invoice, or a completely different context like a cultural reference).
-IMPORTANT: Being famous or a public figure is NOT a reason to say NO. Celebrities and public figures DO appear in Epstein records.
+{_GLANCE_RULES}
 Respond with only YES or NO."""
 
-        model_id = "claude-haiku-4-5-20251001"
-        response = client.messages.create(
-            model=model_id,
+        response = _get_anthropic().messages.create(
+            model=GLANCE_MODEL,
             max_tokens=10,
             messages=[{"role": "user", "content": prompt}],
         )
-        _track_xref_cost(response, model_id)
+        _track_xref_cost(response, GLANCE_MODEL)
 
         answer = response.content[0].text.strip().upper()
         if answer.startswith("YES"):
@@ -791,6 +1104,53 @@ Respond with only YES or NO."""
         return None  # On error, fall back to heuristic
 
 
+def contextual_glance_batch(cases):
+    """contextual_glance for many (name, bb_matches, doj_result) cases at once.
+
+    Clear cases are answered without the LLM; ambiguous ones go to Haiku
+    GLANCE_BATCH_SIZE per request as a numbered list. Returns one of
+    "YES" / "NO" / None per case, in order — None wherever the single-case
+    version would also fall back to the heuristic (clear case, missing or
+    unparseable line, API error).
+    """
+    answers = [None] * len(cases)
+    pending = []
+    for i, (name, bb_matches, doj_result) in enumerate(cases):
+        evidence = _glance_evidence(bb_matches, doj_result)
+        if evidence is not None:
+            pending.append((i, name, *evidence))
+
+    for start in range(0, len(pending), GLANCE_BATCH_SIZE):
+        chunk = pending[start:start + GLANCE_BATCH_SIZE]
+        items = "\n\n".join(
+            f"### {n}. \"{name}\"\n{bb_context}\n\nDOJ search snippets:\n{snippet_text}"
+            for n, (_, name, bb_context, snippet_text) in enumerate(chunk, 1)
+        )
+        prompt = f"""For each numbered person below, is the person from Architectural Digest magazine possibly the same person referenced in the Epstein-related records shown for them?
+
+{items}
+
+{_GLANCE_RULES}
+Respond with exactly one line per person, in the form "<number>: YES" or "<number>: NO", and nothing else."""
+
+        try:
+            response = _get_anthropic().messages.create(
+                model=GLANCE_MODEL,
+                max_tokens=10 * len(chunk) + 20,
+                messages=[{"role": "user", "content": prompt}],
+            )
+            _track_xref_cost(response, GLANCE_MODEL)
+        except Exception:
+            continue  # On error, these cases fall back to the heuristic
+
+        for num, verdict in _GLANCE_LINE_RE.findall(response.content[0].text.upper()):
+            n = int(num)
+            if 1 <= n <= len(chunk):
+                answers[chunk[n - 1][0]] = verdict
+
+    return answers
+
+
 if __name__ == "__main__":
     if "--status" in sys.argv:
         show_status()
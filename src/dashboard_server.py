@@ -7,73 +7,358 @@ POST /api/inbox for human-to-Editor communication.
 Usage:
     python3 src/dashboard_server.py              # Port 8787
     python3 src/dashboard_server.py --port 9000  # Custom port
+    DASHBOARD_PORT=9000 python3 src/dashboard_server.py
 """
 
-import json
+import argparse
+import collections
+import fcntl
+import functools
+import gzip
 import os
+import re
+import socket
 import sys
+import threading
 import time
 from datetime import datetime
-from http.server import HTTPServer, SimpleHTTPRequestHandler
-from urllib.parse import urlparse
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from fast_json import dumps, loads
+from agents.base import (
+    atomic_write_bytes, migrate_json_to_jsonl, update_json_locked, update_jsonl_locked,
+)
 
 BASE_DIR = os.path.join(os.path.dirname(__file__), "..")
 DATA_DIR = os.path.join(BASE_DIR, "data")
-HUMAN_MESSAGES_PATH = os.path.join(DATA_DIR, "human_messages.json")
+HUMAN_MESSAGES_PATH = os.path.join(DATA_DIR, "human_messages.jsonl")
+LEGACY_HUMAN_MESSAGES_PATH = os.path.join(DATA_DIR, "human_messages.json")
+HUMAN_MESSAGES_CAP = 100
+# Messages are appended; past this size the file is cut back to the last CAP
+HUMAN_MESSAGES_COMPACT_BYTES = 64 * 1024
 SKILLS_DIR = os.path.join(BASE_DIR, "src", "agents", "skills")
 AGENT_COMMANDS_PATH = os.path.join(DATA_DIR, "agent_commands.json")
 
+KEEPALIVE_TIMEOUT_SECONDS = 30
+
+# Request body caps: inbox messages are short, skills files are markdown docs
+MAX_BODY = 64 * 1024
+MAX_SKILLS_BODY = 1024 * 1024
+READ_CHUNK = 32 * 1024
+
+# Skills replies smaller than this go out uncompressed (gzip overhead dominates)
+GZIP_MIN_BYTES = 1024
+
+# How long the flusher waits after a POST so a burst is written in one go
+FLUSH_DEBOUNCE_SECONDS = 0.25
+
+# POSTs only queue their record here and return; the flusher thread writes
+# queued records out. Only new records are held in memory: the Editor and
+# orchestrator rewrite these files too (read / processed flags), so on-disk
+# contents are always re-read at flush time, never overwritten from a copy.
+# Keyed by the file each list is bound for; one flush writes them all.
+_pending_writes = {HUMAN_MESSAGES_PATH: [], AGENT_COMMANDS_PATH: []}
+_pending_lock = threading.Lock()
+_dirty = threading.Event()
+
+
+def _queue(path, record):
+    with _pending_lock:
+        _pending_writes[path].append(record)
+    _dirty.set()
+
+
+class _HeldAppender:
+    """Appends to one JSON Lines file through an fd held open across flushes.
+
+    Takes the same .lock sidecar as agents.base.append_jsonl_locked, so it
+    interleaves safely with other writers. When the file is replaced (the
+    Editor marking messages read, or compaction) its inode changes and the
+    fd is reopened; otherwise a flush is just flock, stat, write, unlock.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+        self._ino = None
+        self._lock_fd = None
+        self._mutex = threading.Lock()
+
+    def append(self, records):
+        """Append records as one write; returns the file's size afterwards."""
+        payload = "".join(dumps(r) + "\n" for r in records).encode()
+        with self._mutex:
+            if self._lock_fd is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._lock_fd = os.open(self.path + ".lock", os.O_WRONLY | os.O_CREAT, 0o644)
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                try:
+                    ino = os.stat(self.path).st_ino
+                except FileNotFoundError:
+                    ino = None
+                if self._fd is not None and ino != self._ino:
+                    os.close(self._fd)
+                    self._fd = None
+                if self._fd is None:
+                    self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                    self._ino = os.fstat(self._fd).st_ino
+                view = memoryview(payload)
+                while view:
+                    view = view[os.write(self._fd, view):]
+                return os.fstat(self._fd).st_size
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def close(self):
+        with self._mutex:
+            for fd in (self._fd, self._lock_fd):
+                if fd is not None:
+                    os.close(fd)
+            self._fd = self._lock_fd = None
+
+
+_inbox_file = _HeldAppender(HUMAN_MESSAGES_PATH)
+
+
+# (epoch second, "HH:MM", ISO timestamp) for the current second
+_ts_cache = (0, "", "")
+
+
+def _now_strs():
+    """("HH:MM", ISO timestamp) for now, formatted at most once per second.
+
+    Timestamps have second resolution. Two threads racing on a new second
+    just format it twice; the tuple swap itself is atomic.
+    """
+    global _ts_cache
+    t = int(time.time())
+    cached = _ts_cache
+    if cached[0] != t:
+        dt = datetime.fromtimestamp(t)
+        cached = _ts_cache = (t, dt.strftime("%H:%M"), dt.isoformat())
+    return cached[1], cached[2]
+
+
+# Request log lines wait here for _log_drain, so a handler never blocks on stderr
+_log_lines = collections.deque(maxlen=1024)
+_log_ready = threading.Event()
+
+
+def _log_drain():
+    """Background loop: write queued log lines to stderr in batches."""
+    while True:
+        _log_ready.wait()
+        time.sleep(0.1)
+        _log_ready.clear()
+        lines = []
+        while _log_lines:
+            lines.append(_log_lines.popleft())
+        sys.stderr.write("".join(lines))
+
+
+def _write_messages(messages):
+    # Cap at 100 messages, rewriting only once the file has grown well past that
+    if _inbox_file.append(messages) > HUMAN_MESSAGES_COMPACT_BYTES:
+        update_jsonl_locked(HUMAN_MESSAGES_PATH, lambda msgs: msgs[-HUMAN_MESSAGES_CAP:], durable=True)
+
+
+def _write_commands(commands):
+    update_json_locked(AGENT_COMMANDS_PATH, lambda existing: existing.extend(commands), durable=True)
+
+
+_WRITERS = {HUMAN_MESSAGES_PATH: _write_messages, AGENT_COMMANDS_PATH: _write_commands}
+
+
+def flush_pending():
+    """Write every queued message and command to disk in one pass.
+
+    A file whose write fails gets its records put back at the front of its
+    queue for the next flush; the other files are still written.
+    """
+    with _pending_lock:
+        batches = [(path, pending[:]) for path, pending in _pending_writes.items() if pending]
+        for pending in _pending_writes.values():
+            pending.clear()
+
+    error = None
+    for path, records in batches:
+        try:
+            _WRITERS[path](records)
+        except Exception as e:
+            with _pending_lock:
+                _pending_writes[path][:0] = records
+            _dirty.set()
+            error = error or e
+    if error:
+        raise error
+
+
+def _flusher():
+    """Background loop: after each burst of POSTs, flush the queued records."""
+    while True:
+        _dirty.wait()
+        time.sleep(FLUSH_DEBOUNCE_SECONDS)
+        _dirty.clear()
+        try:
+            flush_pending()
+        except Exception as e:
+            print(f"Flush failed: {e}", file=sys.stderr)
+
+
+# API routes; one match per request picks the handler and captures its argument
+_GET_ROUTES = re.compile(r"/api/skills(?:/(?P<skill>[^/]+))?")
+_POST_ROUTES = re.compile(
+    r"/api/(?:(?P<inbox>inbox)|skills/(?P<skill>[^/]+)|agent/(?P<agent>[^/]+)/(?P<cmd>pause|resume))"
+)
+
+# Constant pieces of every reply, built once instead of per request
+_OK_BODY = b'{"ok":true}'
+_CORS_HEADERS = (
+    ("Access-Control-Allow-Origin", "*"),
+    ("Access-Control-Allow-Methods", "GET, POST, OPTIONS"),
+    ("Access-Control-Allow-Headers", "Content-Type"),
+)
+
+# (epoch second, RFC 7231 Date header value) for the current second
+_date_cache = (0, "")
+
+
+@functools.lru_cache(maxsize=128)
+def _skill_body(skills_path, agent, mtime_ns, size):
+    """(body, gzipped body or None) for /api/skills/<agent>.
+
+    mtime and size in the key retire stale entries, so each file version is
+    encoded and compressed once. Bodies under GZIP_MIN_BYTES aren't worth
+    compressing.
+    """
+    with open(skills_path) as f:
+        content = f.read()
+    body = dumps({"agent": agent, "content": content}).encode()
+    gz_body = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else None
+    return body, gz_body
+
 
 class DashboardHandler(SimpleHTTPRequestHandler):
     """Serves static files from project root + handles API endpoints."""
 
+    # Keep-alive: dashboard polling reuses one connection instead of a TCP
+    # handshake per request. Every reply therefore carries Content-Length.
+    protocol_version = "HTTP/1.1"
+    # Idle keep-alive connections give their thread back after this long
+    timeout = KEEPALIVE_TIMEOUT_SECONDS
+    # Server header value, built once rather than on every response
+    _version = f"{SimpleHTTPRequestHandler.server_version} {SimpleHTTPRequestHandler.sys_version}"
+
+    def setup(self):
+        super().setup()
+        # Small JSON replies go out immediately instead of waiting on Nagle
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
     def do_GET(self):
-        parsed = urlparse(self.path)
+        m = _GET_ROUTES.fullmatch(self.path.partition("?")[0])
 
-        if parsed.path == "/api/skills":
-            self._handle_skills_list()
-        elif parsed.path.startswith("/api/skills/"):
-            agent_name = parsed.path.split("/")[-1]
-            self._handle_skills_get(agent_name)
-        else:
+        if m is None:
             super().do_GET()
+        elif m["skill"]:
+            self._handle_skills_get(m["skill"])
+        else:
+            self._handle_skills_list()
 
     def do_POST(self):
-        parsed = urlparse(self.path)
+        m = _POST_ROUTES.fullmatch(self.path.partition("?")[0])
 
-        if parsed.path == "/api/inbox":
+        if m is None:
+            self.send_error(404, "Not found")
+        elif m["inbox"]:
             self._handle_inbox_post()
-        elif parsed.path.startswith("/api/skills/"):
-            agent_name = parsed.path.split("/")[-1]
-            self._handle_skills_save(agent_name)
-        elif parsed.path.startswith("/api/agent/") and parsed.path.endswith("/pause"):
-            agent_id = parsed.path.split("/")[3]
-            self._handle_agent_command(agent_id, "pause")
-        elif parsed.path.startswith("/api/agent/") and parsed.path.endswith("/resume"):
-            agent_id = parsed.path.split("/")[3]
-            self._handle_agent_command(agent_id, "resume")
+        elif m["skill"]:
+            self._handle_skills_save(m["skill"])
         else:
-            self.send_error(404, "Not found")
+            self._handle_agent_command(m["agent"], m["cmd"])
+
+    def copyfile(self, source, outputfile):
+        """Send static files with sendfile(2) when writing straight to the socket.
+
+        socket.sendfile hands the copy to the kernel (page cache -> socket)
+        and falls back to a send() loop itself where sendfile isn't available.
+        """
+        if outputfile is self.wfile:
+            self.connection.sendfile(source)
+        else:
+            super().copyfile(source, outputfile)
 
     def do_OPTIONS(self):
         """Handle CORS preflight."""
         self.send_response(200)
         self._cors_headers()
+        self.send_header("Content-Length", "0")
         self.end_headers()
 
     def _cors_headers(self):
-        self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type")
-
-    def _handle_inbox_post(self):
-        """Receive a message from the human and append to human_messages.json."""
+        for keyword, value in _CORS_HEADERS:
+            self.send_header(keyword, value)
+
+    def version_string(self):
+        return self._version
+
+    def date_time_string(self, timestamp=None):
+        """Date header for now, formatted at most once per second."""
+        global _date_cache
+        if timestamp is not None:
+            return super().date_time_string(timestamp)
+        t = int(time.time())
+        cached = _date_cache
+        if cached[0] != t:
+            cached = _date_cache = (t, super().date_time_string(t))
+        return cached[1]
+
+    def _read_body(self, limit):
+        """Raw request body, or None once an error is sent.
+
+        Content-Length is checked against `limit` before anything is read, and
+        the body is read in READ_CHUNK pieces, so an oversized request costs
+        neither the memory it claims nor the time to receive it.
+        """
         try:
             content_length = int(self.headers.get("Content-Length", 0))
-            body = self.rfile.read(content_length)
-            data = json.loads(body)
-        except (json.JSONDecodeError, ValueError):
+        except ValueError:
+            self.send_error(400, "Invalid Content-Length")
+            return None
+        if content_length < 0:
+            self.send_error(400, "Invalid Content-Length")
+            return None
+        if content_length > limit:
+            self.send_error(413, "Payload too large")
+            return None
+
+        body = bytearray()
+        while len(body) < content_length:
+            chunk = self.rfile.read(min(READ_CHUNK, content_length - len(body)))
+            if not chunk:
+                break
+            body += chunk
+        return body
+
+    def _read_json_body(self, limit):
+        """Parsed JSON object from the request body, or None once an error is sent."""
+        body = self._read_body(limit)
+        if body is None:
+            return None
+
+        try:
+            data = loads(body)
+        except ValueError:  # both json and orjson decode errors, incl. bad UTF-8
+            data = None
+        if not isinstance(data, dict):
             self.send_error(400, "Invalid JSON")
+            return None
+        return data
+
+    def _handle_inbox_post(self):
+        """Receive a message from the human and append to human_messages.jsonl."""
+        data = self._read_json_body(MAX_BODY)
+        if data is None:
             return
 
         text = data.get("text", "").strip()
@@ -81,96 +366,112 @@ class DashboardHandler(SimpleHTTPRequestHandler):
             self.send_error(400, "Empty message")
             return
 
-        # Read existing messages
-        messages = []
-        if os.path.exists(HUMAN_MESSAGES_PATH):
-            try:
-                with open(HUMAN_MESSAGES_PATH) as f:
-                    messages = json.load(f)
-            except (json.JSONDecodeError, IOError):
-                messages = []
-
-        # Append new message
-        now = datetime.now()
-        messages.append({
-            "time": now.strftime("%H:%M"),
-            "timestamp": now.isoformat(),
+        # Queued in memory; the flusher appends it to human_messages.jsonl
+        hhmm, timestamp = _now_strs()
+        _queue(HUMAN_MESSAGES_PATH, {
+            "time": hhmm,
+            "timestamp": timestamp,
             "text": text,
             "read": False,
         })
 
-        # Cap at 100 messages
-        if len(messages) > 100:
-            messages = messages[-100:]
-
-        # Write back
-        os.makedirs(DATA_DIR, exist_ok=True)
-        with open(HUMAN_MESSAGES_PATH, "w") as f:
-            json.dump(messages, f)
+        self._send_json(_OK_BODY)
 
-        # Respond
+    def _send_json(self, body):
+        """200 response with a pre-encoded JSON body and its Content-Length."""
         self.send_response(200)
         self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
         self._cors_headers()
         self.end_headers()
-        self.wfile.write(json.dumps({"ok": True}).encode())
+        self.wfile.write(body)
+
+    # Encoded /api/skills reply, rebuilt only when the skills directory changes
+    _skills_cache = {"mtime": None, "body": b""}
+    _skills_cache_lock = threading.Lock()
 
     def _handle_skills_list(self):
         """Return list of available agent skills files."""
-        skills = []
-        if os.path.exists(SKILLS_DIR):
-            for fname in sorted(os.listdir(SKILLS_DIR)):
-                if fname.endswith(".md"):
-                    agent_name = fname[:-3]
-                    skills.append({"agent": agent_name, "file": fname})
-
-        self.send_response(200)
-        self.send_header("Content-Type", "application/json")
-        self._cors_headers()
-        self.end_headers()
-        self.wfile.write(json.dumps({"skills": skills}).encode())
+        try:
+            mtime = os.stat(SKILLS_DIR).st_mtime_ns
+        except FileNotFoundError:
+            mtime = -1
+
+        cache = DashboardHandler._skills_cache
+        with DashboardHandler._skills_cache_lock:
+            if cache["mtime"] != mtime:
+                skills = []
+                if mtime != -1:
+                    for fname in sorted(os.listdir(SKILLS_DIR)):
+                        if fname.endswith(".md"):
+                            agent_name = fname[:-3]
+                            skills.append({"agent": agent_name, "file": fname})
+                cache["body"] = dumps({"skills": skills}).encode()
+                cache["mtime"] = mtime
+            body = cache["body"]
+
+        self._send_json(body)
 
     def _handle_skills_get(self, agent_name):
-        """Return the contents of a specific agent's skills file."""
+        """Return the contents of a specific agent's skills file.
+
+        Replies carry a weak ETag built from the file's mtime and size; a
+        matching If-None-Match gets a bodiless 304.
+        """
         # Sanitize agent_name to prevent path traversal
         safe_name = os.path.basename(agent_name)
         skills_path = os.path.join(SKILLS_DIR, f"{safe_name}.md")
 
-        if not os.path.exists(skills_path):
+        try:
+            st = os.stat(skills_path)
+        except FileNotFoundError:
             self.send_error(404, f"No skills file for '{safe_name}'")
             return
 
+        etag = f'W/"{st.st_mtime_ns}-{st.st_size}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self._cors_headers()
+            self.end_headers()
+            return
+
         try:
-            with open(skills_path) as f:
-                content = f.read()
+            body, gz_body = _skill_body(skills_path, safe_name, st.st_mtime_ns, st.st_size)
         except IOError:
             self.send_error(500, "Failed to read skills file")
             return
 
+        gzipped = gz_body is not None and "gzip" in self.headers.get("Accept-Encoding", "")
+        if gzipped:
+            body = gz_body
+
         self.send_response(200)
         self.send_header("Content-Type", "application/json")
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
         self._cors_headers()
         self.end_headers()
-        self.wfile.write(json.dumps({
-            "agent": safe_name,
-            "content": content,
-        }).encode())
+        self.wfile.write(body)
 
     def _handle_skills_save(self, agent_name):
         """Save updated content to an agent's skills file."""
         safe_name = os.path.basename(agent_name)
         skills_path = os.path.join(SKILLS_DIR, f"{safe_name}.md")
 
-        if not os.path.exists(skills_path):
+        # Saves only replace existing files. The atomic write goes through a
+        # rename that would create a missing one, so that one stat stays.
+        try:
+            os.stat(skills_path)
+        except FileNotFoundError:
             self.send_error(404, f"No skills file for '{safe_name}'")
             return
 
-        try:
-            content_length = int(self.headers.get("Content-Length", 0))
-            body = self.rfile.read(content_length)
-            data = json.loads(body)
-        except (json.JSONDecodeError, ValueError):
-            self.send_error(400, "Invalid JSON")
+        data = self._read_json_body(MAX_SKILLS_BODY)
+        if data is None:
             return
 
         content = data.get("content")
@@ -179,62 +480,70 @@ class DashboardHandler(SimpleHTTPRequestHandler):
             return
 
         try:
-            with open(skills_path, "w") as f:
-                f.write(content)
-        except IOError as e:
+            atomic_write_bytes(skills_path, content.encode(), durable=True)
+        except OSError as e:
             self.send_error(500, f"Failed to write skills file: {e}")
             return
 
-        self.send_response(200)
-        self.send_header("Content-Type", "application/json")
-        self._cors_headers()
-        self.end_headers()
-        self.wfile.write(json.dumps({"ok": True, "agent": safe_name}).encode())
+        self._send_json(dumps({"ok": True, "agent": safe_name}).encode())
 
     def _handle_agent_command(self, agent_id, command):
         """Queue a pause/resume command for an agent."""
-        # Write command to a JSON file that the orchestrator reads
-        commands = []
-        if os.path.exists(AGENT_COMMANDS_PATH):
-            try:
-                with open(AGENT_COMMANDS_PATH) as f:
-                    commands = json.load(f)
-            except (json.JSONDecodeError, IOError):
-                commands = []
+        # No body is expected, but anything sent must be consumed or the
+        # kept-alive connection would read it as the next request
+        if self._read_body(MAX_BODY) is None:
+            return
 
-        commands.append({
+        # Queued for the JSON file that the orchestrator reads (see flush_pending)
+        _queue(AGENT_COMMANDS_PATH, {
             "agent": agent_id,
             "command": command,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_strs()[1],
             "processed": False,
         })
 
-        os.makedirs(DATA_DIR, exist_ok=True)
-        with open(AGENT_COMMANDS_PATH, "w") as f:
-            json.dump(commands, f)
+        # command is always pause/resume; only the agent id needs escaping
+        self._send_json(b'{"ok":true,"command":"%s","agent":%s}' % (
+            command.encode(), dumps(agent_id).encode()))
 
-        self.send_response(200)
-        self.send_header("Content-Type", "application/json")
-        self._cors_headers()
-        self.end_headers()
-        self.wfile.write(json.dumps({"ok": True, "command": command, "agent": agent_id}).encode())
+    def log_request(self, code="-", size="-"):
+        """Quieter logging — only show errors and POSTs."""
+        if self.command == "POST" or (isinstance(code, int) and code >= 400):
+            super().log_request(code, size)
 
     def log_message(self, format, *args):
-        """Quieter logging — only show errors and POSTs."""
-        if args and ("POST" in str(args[0]) or "404" in str(args[1]) if len(args) > 1 else False):
-            super().log_message(format, *args)
+        """Queue the line for the log drain thread instead of writing stderr here."""
+        _log_lines.append("%s - - [%s] %s\n" % (
+            self.address_string(), self.log_date_time_string(), format % args))
+        _log_ready.set()
+
+
+class DashboardServer(ThreadingHTTPServer):
+    """Thread-per-connection server sized for many idle polling clients."""
+
+    # listen() backlog; the stdlib default of 5 resets connections when a
+    # burst of dashboard tabs connects at once
+    request_queue_size = 128
+    # Don't wait on idle keep-alive threads when shutting down
+    block_on_close = False
 
 
 def main():
-    port = 8787
-    if "--port" in sys.argv:
-        idx = sys.argv.index("--port")
-        port = int(sys.argv[idx + 1])
+    parser = argparse.ArgumentParser(description="Agent Office dashboard server")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("DASHBOARD_PORT", "8787")),
+                        help="Port to listen on (default: $DASHBOARD_PORT or 8787)")
+    args = parser.parse_args()
+    port = args.port
 
     # Change to project root so static files are served correctly
     os.chdir(BASE_DIR)
+    migrate_json_to_jsonl(LEGACY_HUMAN_MESSAGES_PATH, HUMAN_MESSAGES_PATH, keep=HUMAN_MESSAGES_CAP)
 
-    server = HTTPServer(("", port), DashboardHandler)
+    # One thread per connection (daemon threads), so a slow POST doesn't
+    # hold up dashboard polling
+    server = DashboardServer(("", port), DashboardHandler)
+    threading.Thread(target=_flusher, name="flusher", daemon=True).start()
+    threading.Thread(target=_log_drain, name="log_drain", daemon=True).start()
     print(f"Dashboard server running at http://localhost:{port}")
     print(f"Open: http://localhost:{port}/tools/agent-office/agent-office.html")
     print("Press Ctrl+C to stop.\n")
@@ -242,6 +551,8 @@ def main():
     try:
         server.serve_forever()
     except KeyboardInterrupt:
+        flush_pending()
+        _inbox_file.close()
         print("\nServer stopped.")
         server.server_close()
 
@@ -9,31 +9,82 @@ Usage:
 """
 
 import functools
+import importlib.util
 import json
 import os
+import random
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+import httpx
 from dotenv import load_dotenv
-from supabase import create_client
+from supabase import ClientOptions, create_client
 
 load_dotenv()
 
 # Singleton client
 _supabase = None
 
+# One keep-alive connection pool shared by every Supabase client in the
+# process, so threaded/batched scripts reuse TLS connections instead of
+# opening new ones. HTTP/2 needs the optional h2 package.
+_http_client = None
+HTTP_POOL_LIMITS = httpx.Limits(max_keepalive_connections=16, max_connections=32)
+HTTP_TIMEOUT = 30
+
+# Max IDs per in_() filter; they travel in the query string
+IN_FILTER_CHUNK = 500
+
+# Threaded callers (cross_reference, bulk scripts) hit get_supabase() at once
+# on startup; without this lock each racing thread built its own client and pool.
+_client_lock = threading.Lock()
+
+
+def pooled_client_options():
+    """ClientOptions that route Supabase REST/storage calls through the shared pool."""
+    global _http_client
+    with _client_lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                http2=importlib.util.find_spec("h2") is not None,
+                limits=HTTP_POOL_LIMITS,
+                timeout=HTTP_TIMEOUT,
+                follow_redirects=True,
+            )
+    return ClientOptions(postgrest_client_timeout=HTTP_TIMEOUT, httpx_client=_http_client)
+
 
 def get_supabase():
-    """Return a singleton Supabase client."""
+    """Return a singleton Supabase client (created once, even under threads)."""
     global _supabase
     if _supabase is None:
         url = os.getenv("SUPABASE_URL")
         key = os.getenv("SUPABASE_ANON_KEY")
         if not url or not key:
             raise RuntimeError("SUPABASE_URL and SUPABASE_ANON_KEY must be set in .env")
-        _supabase = create_client(url, key)
+        options = pooled_client_options()
+        with _client_lock:
+            if _supabase is None:
+                _supabase = create_client(url, key, options=options)
     return _supabase
 
 
+# Error text that means retrying can't help: constraint violations, auth
+# errors, bad requests, and Postgres codes 23505/23514 and class 42 (syntax,
+# undefined table/column). One case-insensitive scan of the message.
+_NON_RETRYABLE_RE = re.compile(
+    r"violates|constraint|duplicate|not found|permission|unauthorized|invalid|23505|23514|42",
+    re.IGNORECASE,
+)
+
+
+# Backoff cap in seconds, and jitter as a fraction of each delay
+RETRY_MAX_DELAY = 30.0
+RETRY_JITTER = 0.5
+
+
 def with_retry(max_retries=3, base_delay=0.5):
     """Decorator that retries Supabase operations with exponential backoff.
 
@@ -47,24 +98,125 @@ def with_retry(max_retries=3, base_delay=0.5):
             for attempt in range(max_retries + 1):
                 try:
                     return fn(*args, **kwargs)
+                except (httpx.TransportError, ConnectionError) as e:
+                    # Network/timeout: always transient, whatever the message says
+                    last_exc = e
+                except (ValueError, TypeError, KeyError, AttributeError):
+                    # Bugs in the calling code; retrying gives the same result
+                    raise
                 except Exception as e:
-                    err_str = str(e).lower()
                     # Don't retry constraint violations, auth errors, or bad requests
-                    if any(k in err_str for k in (
-                        "violates", "constraint", "duplicate",
-                        "not found", "permission", "unauthorized",
-                        "invalid", "23505", "23514", "42",
-                    )):
+                    if _NON_RETRYABLE_RE.search(str(e)):
                         raise
                     last_exc = e
-                    if attempt < max_retries:
-                        delay = base_delay * (2 ** attempt)
-                        time.sleep(delay)
+                if attempt < max_retries:
+                    # Jittered so parallel workers hit by one outage don't retry in lockstep
+                    delay = min(base_delay * (2 ** attempt), RETRY_MAX_DELAY)
+                    time.sleep(delay * (1 + random.random() * RETRY_JITTER))
             raise last_exc
         return wrapper
     return decorator
 
 
+# ── Pagination ──────────────────────────────────────────────
+
+# Supabase returns at most 1000 rows per request
+PAGE_SIZE = 1000
+PAGE_FETCH_WORKERS = 8
+
+
+def _fetch_all_pages(make_query):
+    """Every row of a select that may span many pages.
+
+    make_query(count=None) builds the filtered, ordered select (ordering
+    must be total, e.g. end with "id", so pages neither overlap nor skip).
+    The first page comes back with the exact row count; the remaining pages
+    are then fetched concurrently and joined in order.
+    """
+    first = make_query(count="exact").range(0, PAGE_SIZE - 1).execute()
+    rows = list(first.data or [])
+    starts = range(PAGE_SIZE, first.count or 0, PAGE_SIZE)
+    if starts:
+        def fetch(lo):
+            return make_query().range(lo, lo + PAGE_SIZE - 1).execute().data or []
+
+        with ThreadPoolExecutor(max_workers=min(PAGE_FETCH_WORKERS, len(starts))) as pool:
+            for batch in pool.map(fetch, starts):
+                rows.extend(batch)
+    return rows
+
+
+# ── Read Cache ──────────────────────────────────────────────
+
+# Agents re-run the same reads (issue lists, status counts, dossier checks)
+# within seconds. Cached replies live this long; every write helper below
+# clears them, so this process always sees its own writes immediately and
+# other processes' writes within READ_CACHE_TTL seconds.
+READ_CACHE_TTL = 30
+READ_CACHE_MAXSIZE = 256
+
+_read_caches = []
+_cache_lock = threading.Lock()
+# Bumped by invalidate_caches(); a read that started before a write
+# doesn't store its (possibly stale) result
+_cache_generation = 0
+
+
+def _fresh_copy(value):
+    """Copy of a cached reply (list of row dicts or one row dict) for a caller to mutate."""
+    if isinstance(value, list):
+        return [dict(r) if isinstance(r, dict) else r for r in value]
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+def ttl_cached(fn):
+    """Decorator: cache a read helper's result per arguments for READ_CACHE_TTL seconds."""
+    cache = {}
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+        with _cache_lock:
+            hit = cache.get(key)
+            generation = _cache_generation
+        if hit is not None and hit[0] > now:
+            return _fresh_copy(hit[1])
+
+        value = fn(*args, **kwargs)
+        with _cache_lock:
+            if generation == _cache_generation:
+                if len(cache) >= READ_CACHE_MAXSIZE:
+                    cache.pop(next(iter(cache)))  # oldest entry
+                cache[key] = (now + READ_CACHE_TTL, value)
+        return _fresh_copy(value)
+
+    _read_caches.append(cache)
+    return wrapper
+
+
+def invalidate_caches():
+    """Drop every cached read (called by all write helpers)."""
+    global _cache_generation
+    with _cache_lock:
+        _cache_generation += 1
+        for cache in _read_caches:
+            cache.clear()
+
+
+def invalidates_caches(fn):
+    """Decorator for write helpers: clear the read cache once the write is done."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            invalidate_caches()
+    return wrapper
+
+
 # ── Issue Operations ─────────────────────────────────────────
 
 
@@ -83,6 +235,7 @@ def get_issue_by_id(issue_id):
     return result.data[0] if result.data else None
 
 
+@invalidates_caches
 @with_retry()
 def get_or_create_issue(month, year, **extra):
     """Get existing issue by (month, year) or create a new one. Returns the issue ID.
@@ -112,29 +265,22 @@ def get_or_create_issue(month, year, **extra):
     return result.data[0]["id"]
 
 
+@invalidates_caches
 @with_retry()
 def upsert_issue(identifier, data):
     """Upsert an issue by identifier. Used by Scout for discovery.
 
     If the identifier exists, updates the row. Otherwise inserts a new row.
-    Returns the upserted row dict.
+    One round-trip: issues.identifier is UNIQUE, so PostgREST resolves it
+    with ON CONFLICT. Returns the upserted row dict.
     """
     sb = get_supabase()
-
-    existing = sb.table("issues").select("id").eq("identifier", identifier).execute()
-
-    if existing.data:
-        # Update existing row
-        issue_id = existing.data[0]["id"]
-        result = sb.table("issues").update(data).eq("id", issue_id).execute()
-        return result.data[0] if result.data else None
-    else:
-        # Insert new row
-        data["identifier"] = identifier
-        result = sb.table("issues").insert(data).execute()
-        return result.data[0] if result.data else None
+    data["identifier"] = identifier
+    result = sb.table("issues").upsert(data, on_conflict="identifier").execute()
+    return result.data[0] if result.data else None
 
 
+@invalidates_caches
 @with_retry()
 def update_issue(identifier, updates):
     """Update an issue's fields by identifier. Used for status transitions.
@@ -148,6 +294,7 @@ def update_issue(identifier, updates):
     return result.data[0] if result.data else None
 
 
+@invalidates_caches
 @with_retry()
 def update_issue_by_id(issue_id, updates):
     """Update an issue's fields by numeric ID.
@@ -161,6 +308,7 @@ def update_issue_by_id(issue_id, updates):
     return result.data[0] if result.data else None
 
 
+@ttl_cached
 @with_retry()
 def list_issues(status=None, min_year=None, source=None):
     """List issues from Supabase, optionally filtered.
@@ -187,7 +335,23 @@ def list_issues(status=None, min_year=None, source=None):
     return result.data
 
 
+@ttl_cached
 @with_retry()
+def _issue_status_rows():
+    """(status, n) rows for the issues table; raises if neither query works.
+
+    Errors propagate, so ttl_cached never holds on to a failed read.
+    """
+    sb = get_supabase()
+    try:
+        # One row per status, counted server-side (migrations/009)
+        return sb.rpc("issue_status_counts", {}).execute().data or []
+    except Exception:
+        # RPC missing (migration not applied): count a row per issue instead
+        result = sb.table("issues").select("status").execute()
+        return [{"status": r.get("status"), "n": 1} for r in result.data or []]
+
+
 def count_issues_by_status():
     """Count issues grouped by status. Returns dict like {"discovered": N, "downloaded": M, ...}.
 
@@ -200,24 +364,24 @@ def count_issues_by_status():
         "error": 0, "no_pdf": 0, "extraction_error": 0,
     }
     try:
-        sb = get_supabase()
-        result = sb.table("issues").select("id,status,year,month").execute()
+        rows = _issue_status_rows()
     except Exception:
         return _defaults
 
-    if not result or not result.data:
+    if not rows:
         return _defaults
 
     counts = {}
     total = 0
     downloaded_or_extracted = 0
 
-    for row in result.data:
-        total += 1
+    for row in rows:
         s = row.get("status") or "discovered"
-        counts[s] = counts.get(s, 0) + 1
+        n = row.get("n") or 0
+        counts[s] = counts.get(s, 0) + n
+        total += n
         if s in ("downloaded", "extracted"):
-            downloaded_or_extracted += 1
+            downloaded_or_extracted += n
 
     counts["total"] = total
     counts["downloaded_plus_extracted"] = downloaded_or_extracted
@@ -250,6 +414,13 @@ def feature_exists(issue_id, page_number):
 
 
 @with_retry()
+def get_feature_pages(issue_id):
+    """Page numbers that already have a feature for this issue (one query per issue)."""
+    sb = get_supabase()
+    result = sb.table("features").select("page_number").eq("issue_id", issue_id).execute()
+    return {r["page_number"] for r in result.data or []}
+
+
 def insert_feature(issue_id, row):
     """Insert a single feature row into Supabase.
 
@@ -257,9 +428,26 @@ def insert_feature(issue_id, row):
         issue_id: The issue's numeric primary key
         row: Dict of feature fields (should NOT include issue_id — it's added here)
     """
+    insert_features(issue_id, [row])
+
+
+@with_retry()
+def insert_features(issue_id, rows):
+    """Insert feature rows for one issue in a single request.
+
+    Args:
+        issue_id: The issue's numeric primary key
+        rows: List of feature field dicts (issue_id is added to each here)
+
+    Rows may carry different keys; a key missing from a row gets the column
+    default, as it would in a single-row insert.
+    """
+    if not rows:
+        return
     sb = get_supabase()
-    row["issue_id"] = issue_id
-    sb.table("features").insert(row).execute()
+    for row in rows:
+        row["issue_id"] = issue_id
+    sb.table("features").insert(rows, default_to_null=False).execute()
 
 
 @with_retry()
@@ -286,6 +474,25 @@ def update_detective_verdict(feature_id, verdict):
     }).eq("id", feature_id).execute()
 
 
+@with_retry()
+def update_detective_verdicts(feature_ids, verdict):
+    """Write one binary verdict to many features in a single UPDATE.
+
+    Unlike update_detective_verdict, callers are expected to have already
+    excluded features with editor overrides (upsert_cross_references
+    returns them).
+    """
+    if verdict not in ("YES", "NO"):
+        raise ValueError(f"Invalid detective verdict: {verdict!r} — must be YES or NO")
+    if not feature_ids:
+        return
+    sb = get_supabase()
+    sb.table("features").update({
+        "detective_verdict": verdict,
+        "detective_checked_at": datetime.now(timezone.utc).isoformat(),
+    }).in_("id", list(feature_ids)).execute()
+
+
 @with_retry()
 def get_features_needing_detective(issue_id=None):
     """Get features with detective_verdict IS NULL and non-empty homeowner_name.
@@ -355,6 +562,7 @@ def get_features_missing_crossref():
     return missing
 
 
+@invalidates_caches
 @with_retry()
 def delete_features_for_issue(issue_id):
     """Delete all features for a given issue. Returns count of deleted rows."""
@@ -368,7 +576,15 @@ def delete_features_for_issue(issue_id):
 
 # ── Dossier Operations ──────────────────────────────────────
 
+# Dossier fields a manual editor review owns; the pipeline never overwrites them
+DOSSIER_MANUAL_FIELDS = (
+    "editor_verdict", "editor_reasoning",
+    "connection_strength", "strength_rationale",
+    "key_findings",
+)
+
 
+@invalidates_caches
 @with_retry()
 def upsert_dossier(feature_id, data):
     """Upsert a dossier by feature_id (one dossier per feature).
@@ -382,36 +598,28 @@ def upsert_dossier(feature_id, data):
     """
     sb = get_supabase()
 
-    # Check if dossier exists for this feature
-    existing = sb.table("dossiers").select("id, editor_verdict, editor_reasoning").eq("feature_id", feature_id).execute()
-
     # Ensure feature_id is in the data
     data["feature_id"] = feature_id
     data["updated_at"] = "now()"
 
-    if existing.data:
-        dossier_id = existing.data[0]["id"]
-
-        # PROTECT manual editor decisions: if a dossier has been manually
-        # reviewed (editor_reasoning starts with "Manual override"), never
-        # let the pipeline overwrite the verdict or reasoning.
-        existing_reasoning = existing.data[0].get("editor_reasoning") or ""
+    # PROTECT manual editor decisions: if a dossier has been manually
+    # reviewed (editor_reasoning starts with "Manual override"), never
+    # let the pipeline overwrite the verdict or reasoning. Only a write
+    # that touches those fields needs to look at the existing row first.
+    if any(k in data for k in DOSSIER_MANUAL_FIELDS):
+        existing = sb.table("dossiers").select("editor_reasoning").eq("feature_id", feature_id).execute()
+        existing_reasoning = (existing.data[0].get("editor_reasoning") or "") if existing.data else ""
         if existing_reasoning.startswith("Manual override"):
             # Strip verdict/reasoning fields — keep manual decision intact
-            for protected in ("editor_verdict", "editor_reasoning",
-                              "connection_strength", "strength_rationale",
-                              "key_findings"):
+            for protected in DOSSIER_MANUAL_FIELDS:
                 data.pop(protected, None)
 
-        # Update existing
-        result = sb.table("dossiers").update(data).eq("id", dossier_id).execute()
-        return result.data[0] if result.data else None
-    else:
-        # Insert new
-        result = sb.table("dossiers").insert(data).execute()
-        return result.data[0] if result.data else None
+    # Insert or update in one statement (dossiers.feature_id is UNIQUE)
+    result = sb.table("dossiers").upsert(data, on_conflict="feature_id").execute()
+    return result.data[0] if result.data else None
 
 
+@ttl_cached
 def get_dossier(feature_id):
     """Fetch a single dossier by feature_id. Returns dict or None."""
     sb = get_supabase()
@@ -431,23 +639,19 @@ def list_dossiers(strength=None, editor_verdict=None):
         List of dossier dicts.
     """
     sb = get_supabase()
-    # Paginate — Supabase default limit is 1000 rows
-    all_rows = []
-    offset = 0
-    while True:
-        query = sb.table("dossiers").select("*")
+
+    def make_query(count=None):
+        query = sb.table("dossiers").select("*", count=count)
         if strength is not None:
             query = query.eq("connection_strength", strength)
         if editor_verdict is not None:
             query = query.eq("editor_verdict", editor_verdict)
-        batch = query.order("created_at", desc=True).range(offset, offset + 999).execute()
-        all_rows.extend(batch.data or [])
-        if len(batch.data or []) < 1000:
-            break
-        offset += 1000
-    return all_rows
+        return query.order("created_at", desc=True).order("id")
+
+    return _fetch_all_pages(make_query)
 
 
+@invalidates_caches
 def update_editor_verdict(feature_id, verdict, reasoning):
     """Update a dossier's editor verdict. Only the Editor calls this.
 
@@ -541,7 +745,14 @@ def upload_to_storage(bucket, path, file_data, content_type="image/png"):
 
 # ── Cross-Reference Operations ────────────────────────────
 
+# Fields an editor override owns (binary_verdict stays consistent with it)
+XREF_OVERRIDE_FIELDS = (
+    "editor_override_verdict", "editor_override_reason",
+    "editor_override_at", "binary_verdict",
+)
 
+
+@invalidates_caches
 @with_retry()
 def upsert_cross_reference(feature_id, data):
     """Upsert a cross-reference result by feature_id (one row per feature).
@@ -555,30 +766,74 @@ def upsert_cross_reference(feature_id, data):
     """
     sb = get_supabase()
 
-    existing = sb.table("cross_references").select("id, editor_override_verdict").eq("feature_id", feature_id).execute()
-
     data["feature_id"] = feature_id
     data["updated_at"] = datetime.now(timezone.utc).isoformat()
 
-    if existing.data:
-        xref_id = existing.data[0]["id"]
-
-        # PROTECT editor overrides: never let pipeline clobber manual decisions
-        if existing.data[0].get("editor_override_verdict"):
-            # Preserve all editor_override_* fields — strip them from incoming data
-            data.pop("editor_override_verdict", None)
-            data.pop("editor_override_reason", None)
-            data.pop("editor_override_at", None)
-            # Also preserve binary_verdict so it stays consistent with override
-            data.pop("binary_verdict", None)
-
-        result = sb.table("cross_references").update(data).eq("id", xref_id).execute()
-        return result.data[0] if result.data else None
-    else:
-        result = sb.table("cross_references").insert(data).execute()
-        return result.data[0] if result.data else None
+    # PROTECT editor overrides: never let pipeline clobber manual decisions.
+    # Only a write that touches the override fields (or binary_verdict,
+    # which stays consistent with the override) needs the existing row.
+    if any(k in data for k in XREF_OVERRIDE_FIELDS):
+        existing = (
+            sb.table("cross_references").select("editor_override_verdict")
+            .eq("feature_id", feature_id).execute()
+        )
+        if existing.data and existing.data[0].get("editor_override_verdict"):
+            for protected in XREF_OVERRIDE_FIELDS:
+                data.pop(protected, None)
+
+    # Insert or update in one statement (cross_references.feature_id is UNIQUE)
+    result = sb.table("cross_references").upsert(data, on_conflict="feature_id").execute()
+    return result.data[0] if result.data else None
 
 
+@invalidates_caches
+@with_retry()
+def upsert_cross_references(rows):
+    """Batch version of upsert_cross_reference — one round-trip per group.
+
+    Args:
+        rows: List of xref dicts, each including feature_id
+
+    Editor overrides are protected the same way as the single-row version:
+    rows whose existing xref has an editor_override_verdict are written
+    without the override fields or binary_verdict. Because PostgREST bulk
+    upserts null out missing keys, protected and normal rows go in separate
+    calls (each with uniform keys).
+
+    Returns:
+        Set of feature_ids that carry an editor override.
+    """
+    if not rows:
+        return set()
+    sb = get_supabase()
+
+    feature_ids = [r["feature_id"] for r in rows]
+    existing = (
+        sb.table("cross_references")
+        .select("feature_id, editor_override_verdict")
+        .in_("feature_id", feature_ids)
+        .execute()
+    )
+    overridden = {r["feature_id"] for r in existing.data if r.get("editor_override_verdict")}
+
+    now = datetime.now(timezone.utc).isoformat()
+    normal, protected = [], []
+    for row in rows:
+        row = {**row, "updated_at": now}
+        if row["feature_id"] in overridden:
+            for k in XREF_OVERRIDE_FIELDS:
+                row.pop(k, None)
+            protected.append(row)
+        else:
+            normal.append(row)
+
+    for group in (normal, protected):
+        if group:
+            sb.table("cross_references").upsert(group, on_conflict="feature_id").execute()
+    return overridden
+
+
+@ttl_cached
 def get_cross_reference(feature_id):
     """Fetch a single cross-reference by feature_id. Returns dict or None."""
     sb = get_supabase()
@@ -597,19 +852,14 @@ def list_cross_references(combined_verdict=None):
         List of xref dicts.
     """
     sb = get_supabase()
-    # Paginate — Supabase default limit is 1000 rows
-    all_rows = []
-    offset = 0
-    while True:
-        query = sb.table("cross_references").select("*")
+
+    def make_query(count=None):
+        query = sb.table("cross_references").select("*", count=count)
         if combined_verdict is not None:
             query = query.eq("combined_verdict", combined_verdict)
-        batch = query.order("checked_at", desc=True).range(offset, offset + 999).execute()
-        all_rows.extend(batch.data or [])
-        if len(batch.data or []) < 1000:
-            break
-        offset += 1000
-    return all_rows
+        return query.order("checked_at", desc=True).order("id")
+
+    return _fetch_all_pages(make_query)
 
 
 def get_xrefs_needing_doj_retry():
@@ -685,6 +935,7 @@ def get_xref_leads():
     return by_name
 
 
+@invalidates_caches
 def update_xref_editor_override(feature_id, verdict, reason):
     """Write an editor override to a cross-reference row.
 
@@ -711,27 +962,21 @@ def get_features_without_xref():
     """
     sb = get_supabase()
 
-    # Get all features with valid homeowner names
-    all_features = (
-        sb.table("features")
-        .select("id, homeowner_name, issue_id")
-        .neq("homeowner_name", "")
-        .not_.is_("homeowner_name", "null")
-        .neq("homeowner_name", "null")
-        .neq("homeowner_name", "None")
-        .execute()
-    )
-
-    if not all_features.data:
-        return []
-
-    # Get all feature_ids that already have xref rows
-    xref_rows = sb.table("cross_references").select("feature_id").execute()
-    has_xref = {r["feature_id"] for r in xref_rows.data}
+    # The features_unchecked view (migrations/008) anti-joins features against
+    # cross_references server-side and already drops NULL/blank names, so only
+    # the missing rows come back, every page of them.
+    def make_query(count=None):
+        return (
+            sb.table("features_unchecked")
+            .select("id, homeowner_name, issue_id", count=count)
+            .not_.in_("homeowner_name", ["null", "None"])
+            .order("id")
+        )
 
-    return [f for f in all_features.data if f["id"] not in has_xref]
+    return _fetch_all_pages(make_query)
 
 
+@invalidates_caches
 def delete_cross_references(feature_ids):
     """Delete cross-reference rows for the given feature IDs.
 
@@ -741,10 +986,14 @@ def delete_cross_references(feature_ids):
     if not feature_ids:
         return
     sb = get_supabase()
-    for fid in feature_ids:
-        sb.table("cross_references").delete().eq("feature_id", fid).execute()
+    # One DELETE ... WHERE feature_id IN (...) per chunk, not one per ID;
+    # chunked so the id list stays within URL length limits
+    ids = list(feature_ids)
+    for i in range(0, len(ids), IN_FILTER_CHUNK):
+        sb.table("cross_references").delete().in_("feature_id", ids[i:i + IN_FILTER_CHUNK]).execute()
 
 
+@invalidates_caches
 def reset_xref_doj(feature_id):
     """Reset DOJ search status for a cross-reference (for retry).
 
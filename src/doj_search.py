@@ -6,7 +6,7 @@ confidence levels. Used by the Detective agent for automated cross-referencing.
 
 Usage:
     from doj_search import DOJSearchClient
-    client = DOJSearchClient()
+    client = DOJSearchClient()          # or DOJSearchClient(tabs=4) for concurrent searches
     await client.start()
     result = await client.search_name("Miranda Brooks")
     await client.stop()
@@ -41,16 +41,23 @@ HONORIFICS = {"jr", "jr.", "sr", "sr.", "ii", "iii", "iv", "esq", "esq.", "phd"}
 class DOJSearchClient:
     """Headless Chromium client for searching justice.gov/epstein."""
 
-    def __init__(self):
+    def __init__(self, tabs: int = 1):
+        self._tabs = max(1, tabs)
         self._playwright = None
         self._browser = None
         self._page = None
+        self._pages = []
+        self._free_pages = None
+        self._restart_lock = asyncio.Lock()
 
     async def start(self):
         """Launch Chromium, navigate to DOJ page, and pass gatekeeping.
 
         Uses non-headless mode with a real user-agent to avoid WAF blocking.
         The DOJ site (Akamai WAF) blocks headless browser API requests.
+
+        Opens `tabs` pages in one context (shared auth cookies) so that
+        concurrent search_name calls each get their own tab.
         """
         from playwright.async_api import async_playwright
         self._playwright = await async_playwright().start()
@@ -66,9 +73,13 @@ class DOJSearchClient:
             ),
             viewport={"width": 1280, "height": 720},
         )
-        self._page = await context.new_page()
-        # Navigate to DOJ page and handle gatekeeping
-        await self._navigate_and_authenticate()
+        self._pages = [await context.new_page() for _ in range(self._tabs)]
+        self._page = self._pages[0]
+        self._free_pages = asyncio.Queue()
+        # Navigate each tab to the DOJ page and handle gatekeeping
+        for page in self._pages:
+            await self._navigate_and_authenticate(page)
+            self._free_pages.put_nowait(page)
 
     async def stop(self):
         """Close browser and Playwright (idempotent)."""
@@ -84,6 +95,8 @@ class DOJSearchClient:
             pass
         self._browser = None
         self._page = None
+        self._pages = []
+        self._free_pages = None
         self._playwright = None
 
     async def ensure_ready(self) -> bool:
@@ -93,15 +106,21 @@ class DOJSearchClient:
                 return True
         except Exception:
             pass
-        # Browser is dead — restart
-        await self.stop()
-        try:
-            await self.start()
-            return True
-        except Exception:
-            return False
+        # Browser is dead — restart (once, even if several searches noticed)
+        async with self._restart_lock:
+            try:
+                if self._page and self._browser and self._browser.is_connected():
+                    return True
+            except Exception:
+                pass
+            await self.stop()
+            try:
+                await self.start()
+                return True
+            except Exception:
+                return False
 
-    async def _navigate_and_authenticate(self):
+    async def _navigate_and_authenticate(self, page=None):
         """Navigate to DOJ Epstein page and pass bot-check + age verification gates.
 
         The DOJ site has two gates:
@@ -109,7 +128,7 @@ class DOJSearchClient:
            which sets authorization cookies via SHA256 hashing, then reloads the page.
         2. Age verification: A button to confirm you're 18+.
         """
-        page = self._page
+        page = page or self._page
         await page.goto(DOJ_URL, wait_until="networkidle", timeout=30000)
         await asyncio.sleep(2)
 
@@ -151,9 +170,9 @@ class DOJSearchClient:
         except Exception:
             self._search_ready = False
 
-    async def _ensure_search_ready(self) -> bool:
+    async def _ensure_search_ready(self, page=None) -> bool:
         """Ensure we're on the search page with the search input available."""
-        page = self._page
+        page = page or self._page
         if not page:
             return False
 
@@ -166,7 +185,7 @@ class DOJSearchClient:
 
         # Try navigating again
         try:
-            await self._navigate_and_authenticate()
+            await self._navigate_and_authenticate(page)
             return await page.locator("#searchInput").count() > 0
         except Exception:
             return False
@@ -191,55 +210,16 @@ class DOJSearchClient:
                     result["error"] = "Browser not ready"
                     return result
 
-                page = self._page
-
-                # Ensure we're on the search page with the input available
-                if not await self._ensure_search_ready():
-                    result["error"] = f"Attempt {attempt + 1}: Search page not ready (age gate or CAPTCHA)"
-                    if attempt < MAX_RETRIES:
-                        await asyncio.sleep(3)
-                    continue
-
-                # Clear and fill search input
-                search_input = page.locator("#searchInput")
-                await search_input.fill("")
-                await search_input.fill(name)
-
-                # Click search button
-                search_button = page.locator("#searchButton")
-                await search_button.click()
-
-                # Wait for results to load
+                page = await self._checkout_page()
                 try:
-                    await page.wait_for_selector(
-                        "#paginationLabel, .search-results, .no-results, #results",
-                        timeout=SEARCH_TIMEOUT_MS,
-                    )
-                except Exception:
-                    # Timeout waiting for results — page may have different structure
-                    pass
-
-                # Small delay for dynamic content
-                await asyncio.sleep(1)
-
-                # Parse result count
-                total_results = await self._parse_result_count(page)
-                result["total_results"] = total_results
-
-                # Extract top results
-                top_results = await self._extract_results(page)
-                result["top_results"] = top_results[:10]  # Cap at 10
-
-                # Assess confidence
-                confidence, rationale = self._assess_confidence(
-                    name, total_results, top_results
-                )
-                result["confidence"] = confidence
-                result["confidence_rationale"] = rationale
-                result["snippets"] = [r.get("snippet", "") for r in top_results if r.get("snippet")]
-                result["search_successful"] = True
-                result["error"] = None
-                return result
+                    found = await self._search_on_page(page, name, result)
+                finally:
+                    self._return_page(page)
+                if found:
+                    return result
+                result["error"] = f"Attempt {attempt + 1}: {result['error']}"
+                if attempt < MAX_RETRIES:
+                    await asyncio.sleep(3)
 
             except Exception as e:
                 result["error"] = f"Attempt {attempt + 1}: {str(e)[:200]}"
@@ -250,6 +230,57 @@ class DOJSearchClient:
 
         return result
 
+    async def _search_on_page(self, page, name: str, result: dict) -> bool:
+        """Run one search on a checked-out tab, filling `result` in place.
+
+        Returns False if the search page wasn't reachable (age gate or CAPTCHA).
+        """
+        # Ensure we're on the search page with the input available
+        if not await self._ensure_search_ready(page):
+            result["error"] = "Search page not ready (age gate or CAPTCHA)"
+            return False
+
+        # Clear and fill search input
+        search_input = page.locator("#searchInput")
+        await search_input.fill("")
+        await search_input.fill(name)
+
+        # Click search button
+        search_button = page.locator("#searchButton")
+        await search_button.click()
+
+        # Wait for results to load
+        try:
+            await page.wait_for_selector(
+                "#paginationLabel, .search-results, .no-results, #results",
+                timeout=SEARCH_TIMEOUT_MS,
+            )
+        except Exception:
+            # Timeout waiting for results — page may have different structure
+            pass
+
+        # Small delay for dynamic content
+        await asyncio.sleep(1)
+
+        # Parse result count
+        total_results = await self._parse_result_count(page)
+        result["total_results"] = total_results
+
+        # Extract top results
+        top_results = await self._extract_results(page)
+        result["top_results"] = top_results[:10]  # Cap at 10
+
+        # Assess confidence
+        confidence, rationale = self._assess_confidence(
+            name, total_results, top_results
+        )
+        result["confidence"] = confidence
+        result["confidence_rationale"] = rationale
+        result["snippets"] = [r.get("snippet", "") for r in top_results if r.get("snippet")]
+        result["search_successful"] = True
+        result["error"] = None
+        return True
+
     async def search_name_variations(self, name: str) -> dict:
         """Try multiple name variations, merge results. Returns best result."""
         from cross_reference import generate_name_variations
@@ -310,6 +341,15 @@ class DOJSearchClient:
 
     # ── Private helpers ─────────────────────────────────────────
 
+    async def _checkout_page(self):
+        """Wait for a free tab. Each concurrent search holds one tab."""
+        return await self._free_pages.get()
+
+    def _return_page(self, page):
+        """Give a tab back to the pool (dropped if the browser was restarted)."""
+        if self._free_pages is not None and page in self._pages:
+            self._free_pages.put_nowait(page)
+
     async def _parse_result_count(self, page) -> int:
         """Parse total result count from the page."""
         try:
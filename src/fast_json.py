@@ -0,0 +1,38 @@
+"""
+JSON helpers that use orjson when it's installed and stdlib json otherwise.
+
+orjson's C encoder/decoder is several times faster than the stdlib on the
+large payloads the batch scripts move around. It's optional: without it
+these functions fall back to json with matching compact output.
+
+Usage:
+    from fast_json import dumps, loads
+    text = dumps({"a": 1})            # -> '{"a":1}'
+    data = loads(text)                # str or bytes
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover — exercised only without orjson
+    orjson = None
+
+
+def dumps(obj, indent=False):
+    """Serialize to a str. indent=True gives 2-space pretty output."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option, default=str).decode()
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=str)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def loads(data):
+    """Parse JSON from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
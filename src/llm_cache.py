@@ -0,0 +1,64 @@
+"""
+Exact-match sqlite cache for LLM responses.
+
+Classification prompts are deterministic in a handful of fields, so a rerun
+over the same people can reuse earlier answers instead of paying for them
+again. Keys are sha256 digests of the parts that determine the prompt; put
+the model name and a prompt version in the parts so that changing either
+invalidates old entries.
+
+Usage:
+    from llm_cache import ResponseCache, make_key
+    cache = ResponseCache("data/llm_cache.db")
+    key = make_key(MODEL, PROMPT_VERSION, name, category)
+    hit = cache.get(key)              # dict or None
+    cache.put(key, {"classification": "SELF_MADE"})
+    cache.close()
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from fast_json import dumps, loads
+
+
+def make_key(*parts):
+    """Stable sha256 hex digest of the given parts, joined with '|'."""
+    return hashlib.sha256("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe key -> JSON value store backed by one sqlite file."""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.hits = 0
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at INTEGER NOT NULL)"
+        )
+        self.conn.commit()
+
+    def get(self, key):
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self.hits += 1
+        return loads(row[0])
+
+    def put(self, key, value):
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created_at) VALUES (?, ?, ?)",
+                (key, dumps(value), int(time.time())),
+            )
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
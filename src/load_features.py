@@ -16,7 +16,7 @@ import sys
 
 sys.path.insert(0, os.path.dirname(__file__))
 
-from db import get_supabase, get_or_create_issue, feature_exists, insert_feature
+from db import get_supabase, get_or_create_issue, get_feature_pages, insert_features
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
 EXTRACTIONS_DIR = os.path.join(DATA_DIR, "extractions")
@@ -73,15 +73,17 @@ def load_extraction(extraction_path):
     issue_id = get_or_create_issue(month, year, identifier=identifier)
     print(f"  Issue: {year}-{month:02d} (id={issue_id})")
 
-    # Insert features
-    inserted = 0
+    # Collect new features, then insert them in one request
+    existing_pages = get_feature_pages(issue_id)
+    rows = []
     for feature in data.get("features", []):
-        page = feature.get("page_number")
+        # Normalized like the stored column, to compare with existing_pages
+        page = _sanitize_integer(feature.get("page_number"))
 
         # Skip if no page number or already exists
         if not page:
             continue
-        if feature_exists(issue_id, page):
+        if page in existing_pages:
             print(f"    Skipping page {page} (already exists)")
             continue
 
@@ -98,12 +100,15 @@ def load_extraction(extraction_path):
                     value = json.dumps(value)
                 row[field] = value
 
-        insert_feature(issue_id, row)
+        rows.append(row)
+        existing_pages.add(page)
+
+    insert_features(issue_id, rows)
+    for row in rows:
         homeowner = row.get("homeowner_name", "Unknown")
-        print(f"    Inserted: {homeowner} (page {page})")
-        inserted += 1
+        print(f"    Inserted: {homeowner} (page {row['page_number']})")
 
-    return inserted
+    return len(rows)
 
 
 def load_all(identifier=None):
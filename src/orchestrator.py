@@ -255,7 +255,7 @@ async def write_status(agents):
 def process_commands(agents):
     """Read agent_commands.json, execute unprocessed pause/resume commands.
 
-    Note: In the hub-and-spoke model, the Editor also reads human_messages.json
+    Note: In the hub-and-spoke model, the Editor also reads human_messages.jsonl
     for strategic instructions. This function handles low-level pause/resume commands
     from the dashboard that need to bypass the Editor (e.g., emergency pause).
     """
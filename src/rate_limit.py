@@ -0,0 +1,196 @@
+"""
+Adaptive token-bucket rate limiter shared by the batch scripts.
+
+Replaces fixed time.sleep() throttles: tokens are issued at `rate` per
+second, the rate is halved when the remote side pushes back (429 / 503 /
+timeouts) and creeps back toward the ceiling while requests succeed. When a
+server sends Retry-After, the bucket pauses for at least that long.
+
+AnthropicLimiter is the proactive variant for the Anthropic API: it tracks
+both requests/minute and tokens/minute and holds a call back *before*
+dispatch instead of waiting for a 429.
+
+Works from threads (acquire) and from asyncio (acquire_async).
+
+Usage:
+    from rate_limit import AdaptiveLimiter
+    limiter = AdaptiveLimiter(rate=8)
+    limiter.acquire()               # or: await limiter.acquire_async()
+    ...
+    limiter.on_success()            # or: limiter.on_throttle(retry_after=...)
+
+    from rate_limit import AnthropicLimiter
+    limiter = AnthropicLimiter.from_env()
+    est = limiter.estimate(prompt, max_tokens)
+    await limiter.acquire_async(est)
+    resp = await client.messages.create(...)
+    limiter.record(est, resp.usage.input_tokens + resp.usage.output_tokens)
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+
+
+class AdaptiveLimiter:
+    """Thread-safe token bucket whose rate adapts to remote pressure (AIMD).
+
+    Args:
+        rate: Ceiling in requests/second (also the starting rate)
+        min_rate: Floor the rate never drops below
+        recover_after: Consecutive successes before the rate steps back up
+        step: How much the rate grows per recovery step (requests/second)
+    """
+
+    def __init__(self, rate, min_rate=0.2, recover_after=20, step=None):
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.min_rate = min(float(min_rate), self.max_rate)
+        self.recover_after = recover_after
+        self.step = step if step is not None else max(self.max_rate / 10, 0.1)
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.successes = 0
+        self.throttles = 0
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """Take a token if one is ready; otherwise return seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self.paused_until:
+                return self.paused_until - now
+            burst = max(1.0, self.rate)
+            self.tokens = min(burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        """Block the calling thread until a token is available."""
+        while True:
+            wait = self._reserve()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Await until a token is available (doesn't block the event loop)."""
+        while True:
+            wait = self._reserve()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def on_success(self):
+        """Record a successful request; additively restore the rate."""
+        with self._lock:
+            self.successes += 1
+            if self.successes >= self.recover_after and self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.step)
+                self.successes = 0
+
+    def on_throttle(self, retry_after=None):
+        """Record a 429/503/timeout; halve the rate and honour Retry-After."""
+        with self._lock:
+            self.throttles += 1
+            self.successes = 0
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0.0
+            if retry_after:
+                self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+
+
+class AnthropicLimiter:
+    """Dual token bucket over requests/minute and tokens/minute.
+
+    A call reserves one request plus an estimated token count; record()
+    later settles the difference against the real usage, so a generous
+    estimate (max_tokens) is refunded once the response arrives.
+
+    Args:
+        rpm: Requests per minute allowed
+        tpm: Tokens (input + output) per minute allowed
+    """
+
+    def __init__(self, rpm, tpm):
+        self.rpm = float(rpm)
+        self.tpm = float(tpm)
+        self.requests = self.rpm
+        self.tokens = self.tpm
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, rpm=50, tpm=50_000):
+        """Limits from ANTHROPIC_RPM / ANTHROPIC_TPM, else the given defaults."""
+        return cls(
+            rpm=float(os.environ.get("ANTHROPIC_RPM", rpm)),
+            tpm=float(os.environ.get("ANTHROPIC_TPM", tpm)),
+        )
+
+    @staticmethod
+    def estimate(prompt, max_tokens):
+        """Rough token cost of a call: ~4 chars per input token + max output."""
+        return len(prompt) // 4 + max_tokens
+
+    def _refill(self, now):
+        elapsed = now - self.updated
+        self.updated = now
+        self.requests = min(self.rpm, self.requests + elapsed * self.rpm / 60)
+        self.tokens = min(self.tpm, self.tokens + elapsed * self.tpm / 60)
+
+    def _reserve(self, tokens):
+        """Take capacity if both buckets allow it; otherwise return seconds to wait."""
+        tokens = min(tokens, self.tpm)  # an oversized call must still fit eventually
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.requests >= 1 and self.tokens >= tokens:
+                self.requests -= 1
+                self.tokens -= tokens
+                return 0.0
+            wait_req = (1 - self.requests) * 60 / self.rpm if self.requests < 1 else 0.0
+            wait_tok = (tokens - self.tokens) * 60 / self.tpm if self.tokens < tokens else 0.0
+            return max(wait_req, wait_tok)
+
+    def acquire(self, tokens):
+        """Block the calling thread until the call fits in both budgets."""
+        while True:
+            wait = self._reserve(tokens)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens):
+        """Await until the call fits in both budgets."""
+        while True:
+            wait = self._reserve(tokens)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def record(self, estimated, actual):
+        """Settle a reservation against the tokens the API actually billed."""
+        with self._lock:
+            self.tokens = min(self.tpm, self.tokens + min(estimated, self.tpm) - actual)
+
+
+def parse_retry_after(headers):
+    """Seconds from a Retry-After header (numeric form only), or None."""
+    if not headers:
+        return None
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt, base=1.0, cap=60.0):
+    """Exponential backoff with full jitter: uniform(0, min(cap, base * 2^attempt))."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
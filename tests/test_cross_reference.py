@@ -19,6 +19,8 @@ from cross_reference import (
     _word_boundary_search,
     _search_single_name,
     search_black_book,
+    candidate_terms,
+    find_whole_words,
     generate_name_variations,
     assess_combined_verdict,
     detect_false_positive_indicators,
@@ -250,6 +252,50 @@ class TestSearchBlackBook:
         assert search_black_book("John Smith", "") is None
 
 
+# ── find_whole_words() ─────────────────────────────────────────────
+
+
+BATCH_NAMES = ["Jane & Max Gottschalk", "Mary O'Brien", "Candace Bushnell",
+               "George Bush", "Elon Musk", "Robert Sullivan", "Miranda Brooks",
+               "Peter Hoffmann", "Brandon Lee"]
+
+
+class TestFindWholeWords:
+    @pytest.fixture(params=["automaton", "regex"])
+    def matcher_mode(self, request, monkeypatch):
+        import cross_reference
+        if request.param == "automaton" and cross_reference.ahocorasick is None:
+            pytest.skip("pyahocorasick not installed")
+        if request.param == "regex":
+            monkeypatch.setattr(cross_reference, "ahocorasick", None)
+        return request.param
+
+    def test_agrees_with_word_boundary_search(self, sample_bb_text, matcher_mode):
+        terms = ["Bush", "Sultana", "Brooks, Miranda", "O'Brien", "Gottschalk", "Musk", "miranda"]
+        hits = find_whole_words(terms, sample_bb_text)
+        for t in terms:
+            assert (t.lower() in hits) == bool(_word_boundary_search(t, sample_bb_text))
+
+    def test_substring_not_a_hit(self, matcher_mode):
+        assert find_whole_words(["Bush"], "Candace Bushnell") == set()
+
+    def test_batched_search_matches_per_name(self, sample_bb_text, matcher_mode):
+        terms = {t for n in BATCH_NAMES for i in split_names(n) for t in candidate_terms(i)}
+        hits = find_whole_words(terms, sample_bb_text)
+        for name in BATCH_NAMES:
+            assert search_black_book(name, sample_bb_text, found=lambda t: t.lower() in hits) == \
+                search_black_book(name, sample_bb_text)
+
+    def test_overlapping_terms_all_found(self, matcher_mode):
+        text = "Miller, Jonathan and Sarah Miller"
+        assert find_whole_words(["Sarah Miller", "Miller", "Miller, Jonathan"], text) == \
+            {"sarah miller", "miller", "miller, jonathan"}
+
+    def test_empty_inputs(self, sample_bb_text):
+        assert find_whole_words([], sample_bb_text) == set()
+        assert find_whole_words(["John Smith"], "") == set()
+
+
 # ── generate_name_variations() ─────────────────────────────────────
 
 
@@ -0,0 +1,37 @@
+"""Tests for src/fast_json.py — orjson/stdlib JSON helpers."""
+
+import json
+
+import fast_json
+from fast_json import dumps, loads
+
+
+class TestDumps:
+    def test_compact(self):
+        assert dumps({"a": 1, "b": [1, 2]}) == '{"a":1,"b":[1,2]}'
+
+    def test_unicode_not_escaped(self):
+        assert dumps({"name": "Müller"}) == '{"name":"Müller"}'
+
+    def test_indent_round_trips(self):
+        text = dumps({"a": [1, 2]}, indent=True)
+        assert "\n" in text
+        assert json.loads(text) == {"a": [1, 2]}
+
+    def test_non_str_keys(self):
+        assert json.loads(dumps({1: "x"})) == {"1": "x"}
+
+    def test_stdlib_fallback_matches(self, monkeypatch):
+        obj = {"a": 1, "b": ["x", None, 2.5], "c": "Müller"}
+        fast = dumps(obj)
+        monkeypatch.setattr(fast_json, "orjson", None)
+        assert dumps(obj) == fast
+
+
+class TestLoads:
+    def test_str_and_bytes(self):
+        assert loads('{"a":1}') == {"a": 1}
+        assert loads(b'{"a":1}') == {"a": 1}
+
+    def test_nested_string_payload(self):
+        assert loads(loads('"{\\"a\\":1}"')) == {"a": 1}
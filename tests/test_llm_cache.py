@@ -0,0 +1,34 @@
+"""Tests for src/llm_cache.py — exact-match sqlite response cache."""
+
+from llm_cache import ResponseCache, make_key
+
+
+class TestMakeKey:
+    def test_stable(self):
+        assert make_key("m", "v1", "Ann") == make_key("m", "v1", "Ann")
+
+    def test_any_part_changes_key(self):
+        base = make_key("m", "v1", "Ann", 1999)
+        assert make_key("m", "v2", "Ann", 1999) != base
+        assert make_key("m", "v1", "Ann", 2000) != base
+
+    def test_parts_not_concatenated_ambiguously(self):
+        assert make_key("ab", "c") != make_key("a", "bc")
+
+
+class TestResponseCache:
+    def test_miss_then_hit(self, tmp_path):
+        cache = ResponseCache(str(tmp_path / "c.db"))
+        key = make_key("x")
+        assert cache.get(key) is None
+        cache.put(key, {"classification": "SELF_MADE", "notes": "Müller"})
+        assert cache.get(key) == {"classification": "SELF_MADE", "notes": "Müller"}
+        assert cache.hits == 1
+        cache.close()
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "sub" / "c.db")
+        cache = ResponseCache(path)
+        cache.put("k", {"a": 1})
+        cache.close()
+        assert ResponseCache(path).get("k") == {"a": 1}
@@ -0,0 +1,115 @@
+"""Tests for src/rate_limit.py — adaptive token bucket and backoff helpers.
+
+Pure logic: no network, no sleeping beyond a few milliseconds.
+"""
+
+import asyncio
+
+from rate_limit import AdaptiveLimiter, AnthropicLimiter, backoff_delay, parse_retry_after
+
+
+class TestAdaptiveLimiter:
+    def test_first_acquire_is_immediate(self):
+        limiter = AdaptiveLimiter(rate=1)
+        assert limiter._reserve() == 0.0
+
+    def test_empty_bucket_reports_wait(self):
+        limiter = AdaptiveLimiter(rate=2)
+        limiter._reserve()
+        assert 0 < limiter._reserve() <= 0.5
+
+    def test_throttle_halves_rate(self):
+        limiter = AdaptiveLimiter(rate=8)
+        limiter.on_throttle()
+        assert limiter.rate == 4
+        limiter.on_throttle()
+        assert limiter.rate == 2
+
+    def test_rate_never_below_floor(self):
+        limiter = AdaptiveLimiter(rate=1, min_rate=0.5)
+        for _ in range(10):
+            limiter.on_throttle()
+        assert limiter.rate == 0.5
+
+    def test_successes_restore_rate(self):
+        limiter = AdaptiveLimiter(rate=4, recover_after=2, step=1)
+        limiter.on_throttle()
+        for _ in range(4):
+            limiter.on_success()
+        assert limiter.rate == 4
+
+    def test_rate_never_above_ceiling(self):
+        limiter = AdaptiveLimiter(rate=4, recover_after=1)
+        for _ in range(10):
+            limiter.on_success()
+        assert limiter.rate == 4
+
+    def test_retry_after_pauses_bucket(self):
+        limiter = AdaptiveLimiter(rate=100)
+        limiter.on_throttle(retry_after=30)
+        assert limiter._reserve() > 29
+
+    def test_acquire_async(self):
+        limiter = AdaptiveLimiter(rate=1000)
+        asyncio.run(limiter.acquire_async())
+
+
+class TestAnthropicLimiter:
+    def test_fits_budget_immediately(self):
+        limiter = AnthropicLimiter(rpm=60, tpm=1000)
+        assert limiter._reserve(500) == 0.0
+
+    def test_token_budget_blocks(self):
+        limiter = AnthropicLimiter(rpm=60, tpm=1000)
+        limiter._reserve(900)
+        # 500 more tokens need ~400 to refill at 1000/min -> ~24s
+        assert 20 < limiter._reserve(500) <= 24
+
+    def test_request_budget_blocks(self):
+        limiter = AnthropicLimiter(rpm=2, tpm=100_000)
+        limiter._reserve(1)
+        limiter._reserve(1)
+        assert limiter._reserve(1) > 25
+
+    def test_record_refunds_overestimate(self):
+        limiter = AnthropicLimiter(rpm=60, tpm=1000)
+        limiter._reserve(900)
+        limiter.record(900, 100)
+        assert limiter._reserve(500) == 0.0
+
+    def test_oversized_request_is_clamped(self):
+        limiter = AnthropicLimiter(rpm=60, tpm=1000)
+        assert limiter._reserve(5000) == 0.0
+
+    def test_from_env(self, monkeypatch):
+        monkeypatch.setenv("ANTHROPIC_RPM", "10")
+        monkeypatch.delenv("ANTHROPIC_TPM", raising=False)
+        limiter = AnthropicLimiter.from_env(tpm=1234)
+        assert limiter.rpm == 10 and limiter.tpm == 1234
+
+    def test_estimate(self):
+        assert AnthropicLimiter.estimate("x" * 400, 200) == 300
+
+
+class TestParseRetryAfter:
+    def test_numeric(self):
+        assert parse_retry_after({"retry-after": "3"}) == 3.0
+
+    def test_capitalised_header(self):
+        assert parse_retry_after({"Retry-After": "1.5"}) == 1.5
+
+    def test_http_date_ignored(self):
+        assert parse_retry_after({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) is None
+
+    def test_missing(self):
+        assert parse_retry_after({}) is None
+        assert parse_retry_after(None) is None
+
+
+class TestBackoffDelay:
+    def test_within_cap(self):
+        for attempt in range(10):
+            assert 0 <= backoff_delay(attempt, base=1, cap=5) <= 5
+
+    def test_grows_with_attempt(self):
+        assert backoff_delay(0, base=1, cap=100) <= 1
@@ -48,22 +48,24 @@ class TestFindUninvestigatedLeads:
     def setup_agent(self, tmp_data_dir, monkeypatch):
         """Set up a ResearcherAgent with paths pointing to tmp_data_dir."""
         import agents.researcher as mod
+        import cross_reference
 
         self.xref_dir = tmp_data_dir / "cross_references"
         self.dossiers_dir = tmp_data_dir / "dossiers"
         self.log_path = tmp_data_dir / "researcher_log.json"
-        self.results_path = self.xref_dir / "results.json"
+        self.results_path = self.xref_dir / "results.jsonl"
 
         monkeypatch.setattr(mod, "XREF_DIR", str(self.xref_dir))
         monkeypatch.setattr(mod, "DOSSIERS_DIR", str(self.dossiers_dir))
         monkeypatch.setattr(mod, "LOG_PATH", str(self.log_path))
-        monkeypatch.setattr(mod, "RESULTS_PATH", str(self.results_path))
+        monkeypatch.setattr(cross_reference, "RESULTS_PATH", str(self.results_path))
+        monkeypatch.setattr(cross_reference, "LEGACY_RESULTS_PATH", str(self.xref_dir / "results.json"))
 
         self.agent = ResearcherAgent()
 
     def _write_results(self, results):
         with open(self.results_path, "w") as f:
-            json.dump(results, f)
+            f.writelines(json.dumps(r) + "\n" for r in results)
 
     def _write_investigated(self, ids):
         path = self.dossiers_dir / "investigated_ids.json"
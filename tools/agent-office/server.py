@@ -9,6 +9,7 @@ Usage:
     python3 tools/agent-office/server.py --port 8080
 """
 
+import fcntl
 import http.server
 import json
 import os
@@ -19,7 +20,7 @@ from urllib.parse import urlparse
 PORT = 3000
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "..", "..", "data")
-HUMAN_MESSAGES_PATH = os.path.join(DATA_DIR, "human_messages.json")
+HUMAN_MESSAGES_PATH = os.path.join(DATA_DIR, "human_messages.jsonl")
 COMMANDS_PATH = os.path.join(DATA_DIR, "agent_commands.json")
 
 
@@ -88,20 +89,13 @@ class DashboardHandler(http.server.SimpleHTTPRequestHandler):
                 "read": False,
             }
 
-            # Read existing messages
-            messages = []
+            # JSON Lines: append one line, never rewrite the log. The .lock
+            # file is the one the Editor holds while marking messages read.
             os.makedirs(DATA_DIR, exist_ok=True)
-            if os.path.exists(HUMAN_MESSAGES_PATH):
-                try:
-                    with open(HUMAN_MESSAGES_PATH) as f:
-                        messages = json.load(f)
-                except Exception:
-                    messages = []
-
-            messages.append(message)
-
-            with open(HUMAN_MESSAGES_PATH, "w") as f:
-                json.dump(messages, f)
+            with open(HUMAN_MESSAGES_PATH + ".lock", "w") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                with open(HUMAN_MESSAGES_PATH, "a") as f:
+                    f.write(json.dumps(message) + "\n")
 
             self._json_response({"ok": True})
 